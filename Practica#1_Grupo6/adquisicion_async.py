@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+ADQUISICIÓN ASÍNCRONA DE SENSORES
+Sondea muchas fuentes de sensores con asyncio: cola acotada con contrapresión,
+límite de lecturas concurrentes y un consumidor que entrega lotes al analizador
+"""
+
+import asyncio
+import random
+import time
+
+
+class FuenteSimulada:
+    """Sensor simulado con random.uniform (sustituto local de un sensor real)"""
+
+    def __init__(self, tipo: str, minimo: float, maximo: float, latencia: float = 0.0,
+                 decimales: int = 2):
+        """
+        Args:
+            tipo (str): Tipo de sensor (temperatura, humedad, ...)
+            minimo (float): Valor mínimo simulado
+            maximo (float): Valor máximo simulado
+            latencia (float): Segundos de espera simulada de E/S por lectura
+            decimales (int): Decimales del valor leído
+        """
+        self.tipo = tipo
+        self.minimo = minimo
+        self.maximo = maximo
+        self.latencia = latencia
+        self.decimales = decimales
+
+    async def leer(self):
+        """Devuelve una lectura (valor, tipo)"""
+        if self.latencia:
+            await asyncio.sleep(self.latencia)
+        return round(random.uniform(self.minimo, self.maximo), self.decimales), self.tipo
+
+
+class PipelineAdquisicion:
+    def __init__(self, analizador, fuentes, capacidad_cola: int = 1000, concurrencia: int = 100,
+                 tamano_lote: int = 500, periodo: float = 1.0, espera_lote: float = 0.1):
+        """
+        Inicializa el pipeline de adquisición
+
+        Args:
+            analizador (AnalizadorSensores): Destino de las lecturas
+            fuentes: Objetos con un método asíncrono leer() -> (valor, tipo)
+            capacidad_cola (int): Lecturas máximas en espera (los productores se bloquean al llenarse)
+            concurrencia (int): Lecturas de fuentes en curso al mismo tiempo
+            tamano_lote (int): Lecturas máximas por lote entregado al analizador
+            periodo (float): Segundos entre lecturas consecutivas de una misma fuente
+            espera_lote (float): Segundos máximos que se espera para completar un lote
+        """
+        self.analizador = analizador
+        self.fuentes = list(fuentes)
+        self.capacidad_cola = capacidad_cola
+        self.concurrencia = concurrencia
+        self.tamano_lote = tamano_lote
+        self.periodo = periodo
+        self.espera_lote = espera_lote
+        self.estadisticas = {"leidas": 0, "ingresadas": 0, "lotes": 0, "errores": 0, "lotes_fallidos": 0}
+        self._detener = None
+
+    def detener(self):
+        """Pide a los productores que terminen; el consumidor vacía la cola antes de salir"""
+        if self._detener is not None:
+            self._detener.set()
+
+    async def _producir(self, fuente, cola: asyncio.Queue, semaforo: asyncio.Semaphore, muestras):
+        """Lee una fuente periódicamente y encola (valor, tipo, nanosegundos epoch)"""
+        leidas = 0
+        while not self._detener.is_set() and (muestras is None or leidas < muestras):
+            try:
+                async with semaforo:
+                    valor, tipo = await fuente.leer()
+                valor = float(valor)  # Una lectura inválida cuenta como error de la fuente
+            except Exception:
+                self.estadisticas["errores"] += 1
+            else:
+                await cola.put((valor, tipo, time.time_ns()))  # Contrapresión si la cola está llena
+                self.estadisticas["leidas"] += 1
+            leidas += 1
+            if self.periodo:
+                await asyncio.sleep(self.periodo)
+
+    async def _consumir(self, cola: asyncio.Queue):
+        """
+        Agrupa lecturas en lotes y las entrega al analizador. Si el analizador rechaza
+        un lote se informa por su salida y se sigue vaciando la cola, para que los
+        productores no se queden bloqueados con la cola llena.
+        """
+        while True:
+            primera = await cola.get()
+            if primera is None:
+                return
+            lote = [primera]
+            limite = time.monotonic() + self.espera_lote
+            fin = False
+            while len(lote) < self.tamano_lote:
+                restante = limite - time.monotonic()
+                try:
+                    lectura = cola.get_nowait() if restante <= 0 else await asyncio.wait_for(cola.get(), restante)
+                except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                    break
+                if lectura is None:
+                    fin = True
+                    break
+                lote.append(lectura)
+            try:
+                self.analizador.agregar_lote(lote)
+            except Exception as error:
+                # Las lecturas anteriores a la inválida pueden haber quedado ingresadas
+                self.estadisticas["lotes_fallidos"] += 1
+                salida = self.analizador.salida
+                if salida.activo:
+                    salida.emitir('advertencia', "⚠️ Lote de %d lecturas rechazado: %s", len(lote), error)
+            else:
+                self.estadisticas["ingresadas"] += len(lote)
+                self.estadisticas["lotes"] += 1
+            if fin:
+                return
+
+    async def ejecutar(self, muestras: int = None, duracion: float = None):
+        """
+        Ejecuta la adquisición hasta completar las muestras, la duración o detener()
+
+        Args:
+            muestras (int): Lecturas por fuente (opcional)
+            duracion (float): Segundos máximos de adquisición (opcional)
+
+        Returns:
+            Diccionario con lecturas leídas, ingresadas, lotes, errores y lotes fallidos
+        """
+        self._detener = asyncio.Event()
+        cola = asyncio.Queue(maxsize=self.capacidad_cola)
+        semaforo = asyncio.Semaphore(self.concurrencia)
+        consumidor = asyncio.create_task(self._consumir(cola))
+        productores = [asyncio.create_task(self._producir(fuente, cola, semaforo, muestras))
+                       for fuente in self.fuentes]
+
+        if duracion is not None:
+            asyncio.get_running_loop().call_later(duracion, self._detener.set)
+
+        try:
+            # Si el consumidor termina antes (p. ej. con un error) no se espera a los productores
+            pendientes = {consumidor, *productores}
+            while consumidor in pendientes and len(pendientes) > 1:
+                _, pendientes = await asyncio.wait(pendientes, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for productor in productores:
+                productor.cancel()
+            resultados = await asyncio.gather(*productores, return_exceptions=True)
+            if not consumidor.done():
+                await cola.put(None)  # Marca de fin; el consumidor sigue vaciando la cola
+            await consumidor
+        for resultado in resultados:
+            if isinstance(resultado, Exception):
+                raise resultado
+        return self.estadisticas
+
+
+def ejecutar_adquisicion(cantidad_sensores: int = 5, muestras: int = 5):
+    """Ejemplo: sondea sensores simulados de temperatura y humedad como gestor_sensor.py"""
+    from programa5_analizador import AnalizadorSensores
+    from salida_eventos import SalidaSilenciosa
+
+    analizador = AnalizadorSensores(SalidaSilenciosa())
+    fuentes = []
+    for _ in range(cantidad_sensores):
+        fuentes.append(FuenteSimulada("temperatura", 18, 32, latencia=0.01))
+        fuentes.append(FuenteSimulada("humedad", 30, 60, latencia=0.01))
+
+    pipeline = PipelineAdquisicion(analizador, fuentes, periodo=0.05)
+    resultado = asyncio.run(pipeline.ejecutar(muestras=muestras))
+
+    print(f"{analizador.colores['titulo']}📡 ADQUISICIÓN COMPLETADA{analizador.colores['normal']}")
+    print(f"• Lecturas ingresadas: {resultado['ingresadas']} en {resultado['lotes']} lotes")
+    promedio = analizador.calcular_estadisticas("temperatura").get("promedio")
+    if promedio is not None:
+        print(f"• Promedio de temperatura: {promedio:.2f}°C")
+
+
+if __name__ == "__main__":
+    ejecutar_adquisicion()
@@ -0,0 +1,427 @@
+# -*- coding: utf-8 -*-
+"""
+MOTORES DE ALMACENAMIENTO DEL REGISTRO DE DISPOSITIVOS
+RegistroDispositivosIoT delega el guardado y las consultas en un motor:
+  AlmacenDispositivosMemoria  Lista de diccionarios con índices hash (comportamiento original)
+  AlmacenDispositivosSQLite   Base SQLite en disco (WAL, sentencias preparadas,
+                              transacciones por lotes en las altas masivas, escrituras
+                              individuales confirmadas al momento e índices por campo y fecha)
+Ambos devuelven los dispositivos como DispositivoCompacto, que se lee igual que un
+diccionario con las claves de CAMPOS_EXPORTACION. Las altas y los cambios de
+mantenimiento normalizan la fecha a ISO-8601 (o "N/A") y rechazan cualquier otro
+formato con ValueError, así las búsquedas por fecha pueden comparar texto.
+"""
+
+import sqlite3
+import sys
+from collections.abc import Mapping
+
+from lotes_dispositivos import CAMPOS_EXPORTACION, ESTADOS_VALIDOS, SIN_FECHA, normalizar_fecha
+
+# Las fechas ISO (AAAA-MM-DD) se comparan como texto; SIN_FECHA ("N/A") queda fuera de los rangos
+FECHA_MINIMA = "0000"
+
+BANDERA_ACTIVO = 1
+
+
+class DispositivoCompacto(Mapping):
+    """
+    Dispositivo con __slots__: sin diccionario por instancia, textos repetidos
+    (tipo, ubicación, fecha) internados y el estado guardado como bandera.
+    Los estados fuera de ESTADOS_VALIDOS (p. ej. "mantenimiento") se guardan
+    como texto aparte y cuentan como no activos.
+    Se lee como un diccionario de solo lectura con las claves originales
+    ("ID", "tipo", "ubicación", "estado", "último_mantenimiento"); los cambios
+    se hacen con los métodos actualizar_* del registro para mantener los índices.
+    """
+
+    __slots__ = ("id", "tipo", "ubicacion", "banderas", "estado_otro", "mantenimiento")
+
+    def __init__(self, id: str, tipo: str, ubicacion: str, estado: str = "activo",
+                 mantenimiento: str = SIN_FECHA):
+        self.id = id
+        self.tipo = sys.intern(tipo)
+        self.ubicacion = sys.intern(ubicacion)
+        self.banderas = 0
+        self.estado = estado
+        self.mantenimiento = sys.intern(mantenimiento)
+
+    @classmethod
+    def desde_mapeo(cls, dispositivo):
+        """Convierte un diccionario de dispositivo (o devuelve el mismo registro)"""
+        if isinstance(dispositivo, cls):
+            return dispositivo
+        return cls(dispositivo["ID"], dispositivo["tipo"], dispositivo["ubicación"],
+                   dispositivo["estado"], dispositivo["último_mantenimiento"])
+
+    @property
+    def activo(self):
+        return bool(self.banderas & BANDERA_ACTIVO)
+
+    @property
+    def estado(self):
+        if self.estado_otro is not None:
+            return self.estado_otro
+        return "activo" if self.banderas & BANDERA_ACTIVO else "inactivo"
+
+    @estado.setter
+    def estado(self, estado: str):
+        if estado == "activo":
+            self.banderas |= BANDERA_ACTIVO
+        else:
+            self.banderas &= ~BANDERA_ACTIVO
+        self.estado_otro = None if estado in ESTADOS_VALIDOS else sys.intern(estado)
+
+    def como_tupla(self):
+        """Valores en el orden de CAMPOS_EXPORTACION"""
+        return (self.id, self.tipo, self.ubicacion, self.estado, self.mantenimiento)
+
+    def __getitem__(self, campo: str):
+        try:
+            atributo = _ATRIBUTOS[campo]
+        except KeyError:
+            raise KeyError(campo) from None
+        return getattr(self, atributo)
+
+    def __iter__(self):
+        return iter(CAMPOS_EXPORTACION)
+
+    def __len__(self):
+        return len(CAMPOS_EXPORTACION)
+
+    def __setitem__(self, campo: str, valor):
+        # Asignar sobre el registro dejaría desactualizados los índices del almacén
+        # (y en SQLite no llegaría a la base), así que se rechaza con una indicación
+        raise TypeError(f"Los dispositivos son de solo lectura: usa actualizar_estado() o "
+                        f"actualizar_mantenimiento() del registro para cambiar '{campo}'")
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+# Clave del diccionario original -> atributo del registro compacto
+_ATRIBUTOS = {
+    "ID": "id",
+    "tipo": "tipo",
+    "ubicación": "ubicacion",
+    "estado": "estado",
+    "último_mantenimiento": "mantenimiento"
+}
+
+
+def compacto_validado(dispositivo):
+    """
+    Convierte un dispositivo en DispositivoCompacto con la fecha de mantenimiento
+    normalizada (ver normalizar_fecha); lanza ValueError si la fecha no es válida
+    """
+    dispositivo = DispositivoCompacto.desde_mapeo(dispositivo)
+    fecha = normalizar_fecha(dispositivo.mantenimiento)
+    if fecha != dispositivo.mantenimiento:
+        dispositivo.mantenimiento = sys.intern(fecha)
+    return dispositivo
+
+
+def tupla_dispositivo(dispositivo):
+    """Valores de un dispositivo (compacto o diccionario) en el orden de CAMPOS_EXPORTACION"""
+    if isinstance(dispositivo, DispositivoCompacto):
+        return dispositivo.como_tupla()
+    return tuple(dispositivo[campo] for campo in CAMPOS_EXPORTACION)
+
+
+class AlmacenDispositivosMemoria:
+    """
+    Dispositivos compactos en memoria con índices hash por ID, ubicación, tipo y estado.
+    El índice de estado mantiene al día los conteos de activos e inactivos.
+    """
+
+    def __init__(self):
+        self.dispositivos = []  # DispositivoCompacto en orden de alta
+        # Índices hash: ID -> dispositivo y clave secundaria -> {ID: dispositivo}
+        self._por_id = {}
+        self._por_ubicacion = {}  # Ubicación normalizada con casefold()
+        self._por_tipo = {}
+        self._por_estado = {}
+
+    def __len__(self):
+        return len(self.dispositivos)
+
+    def __iter__(self):
+        return iter(self.dispositivos)
+
+    def todos(self):
+        """Lista de todos los dispositivos (la lista interna, sin copia)"""
+        return self.dispositivos
+
+    def _indexar(self, dispositivo: DispositivoCompacto):
+        """Registra un dispositivo en todos los índices"""
+        id = dispositivo.id
+        self._por_id[id] = dispositivo
+        self._por_ubicacion.setdefault(dispositivo.ubicacion.casefold(), {})[id] = dispositivo
+        self._por_tipo.setdefault(dispositivo.tipo, {})[id] = dispositivo
+        self._por_estado.setdefault(dispositivo.estado, {})[id] = dispositivo
+
+    @staticmethod
+    def _quitar_de_indice(indice: dict, clave, id: str):
+        """Quita un ID de un índice secundario y elimina el grupo si queda vacío"""
+        grupo = indice.get(clave)
+        if grupo is not None:
+            grupo.pop(id, None)
+            if not grupo:
+                del indice[clave]
+
+    @classmethod
+    def _mover_en_indice(cls, indice: dict, clave_anterior, clave_nueva, dispositivo: DispositivoCompacto):
+        """Mueve un dispositivo de una clave a otra dentro de un índice secundario"""
+        cls._quitar_de_indice(indice, clave_anterior, dispositivo.id)
+        indice.setdefault(clave_nueva, {})[dispositivo.id] = dispositivo
+
+    def contiene(self, id_dispositivo: str):
+        return id_dispositivo in self._por_id
+
+    def obtener(self, id_dispositivo: str):
+        return self._por_id.get(id_dispositivo)
+
+    def existentes(self, ids):
+        """Conjunto de los IDs dados que ya están registrados"""
+        por_id = self._por_id
+        return {id for id in ids if id in por_id}
+
+    def agregar(self, dispositivo):
+        """Agrega un dispositivo (DispositivoCompacto o diccionario; el ID no debe existir)"""
+        dispositivo = compacto_validado(dispositivo)
+        self.dispositivos.append(dispositivo)
+        self._indexar(dispositivo)
+
+    def agregar_varios(self, dispositivos: list):
+        """Agrega una lista de dispositivos de IDs nuevos y distintos (todos o ninguno si hay una fecha inválida)"""
+        compactos = list(map(compacto_validado, dispositivos))
+        for dispositivo in compactos:
+            self._indexar(dispositivo)
+        self.dispositivos.extend(compactos)
+
+    def buscar_por_ubicacion(self, ubicacion: str):
+        return list(self._por_ubicacion.get(ubicacion.casefold(), {}).values())
+
+    def buscar_por_tipo(self, tipo: str):
+        return list(self._por_tipo.get(tipo, {}).values())
+
+    def buscar_por_estado(self, estado: str):
+        return list(self._por_estado.get(estado, {}).values())
+
+    def buscar_mantenimiento_anterior(self, fecha: str):
+        """Dispositivos con fecha de mantenimiento válida anterior a la fecha (recorrido completo)"""
+        fecha = normalizar_fecha(fecha)
+        return [d for d in self.dispositivos if FECHA_MINIMA <= d.mantenimiento < fecha]
+
+    def contar_por_estado(self):
+        """Dispositivos por estado a partir del tamaño de cada grupo del índice de estado"""
+        conteo = dict.fromkeys(ESTADOS_VALIDOS, 0)
+        conteo.update((estado, len(grupo)) for estado, grupo in self._por_estado.items())
+        return conteo
+
+    def actualizar_estado(self, id_dispositivo: str, estado: str):
+        """Cambia el estado; devuelve False si el dispositivo no existe"""
+        dispositivo = self._por_id.get(id_dispositivo)
+        if dispositivo is None:
+            return False
+        self._mover_en_indice(self._por_estado, dispositivo.estado, estado, dispositivo)
+        dispositivo.estado = estado
+        return True
+
+    def actualizar_mantenimiento(self, id_dispositivo: str, fecha: str):
+        """Cambia la fecha de mantenimiento; devuelve False si el dispositivo no existe"""
+        fecha = normalizar_fecha(fecha)
+        dispositivo = self._por_id.get(id_dispositivo)
+        if dispositivo is None:
+            return False
+        dispositivo.mantenimiento = sys.intern(fecha)
+        return True
+
+    def eliminar(self, id_dispositivo: str):
+        """Quita un dispositivo de la lista y de todos los índices; devuelve False si no existe"""
+        dispositivo = self._por_id.pop(id_dispositivo, None)
+        if dispositivo is None:
+            return False
+        self._quitar_de_indice(self._por_ubicacion, dispositivo.ubicacion.casefold(), id_dispositivo)
+        self._quitar_de_indice(self._por_tipo, dispositivo.tipo, id_dispositivo)
+        self._quitar_de_indice(self._por_estado, dispositivo.estado, id_dispositivo)
+        # Búsqueda por identidad: list.remove() compararía los registros campo a campo
+        posicion = next(i for i, otro in enumerate(self.dispositivos) if otro is dispositivo)
+        del self.dispositivos[posicion]
+        return True
+
+    def sincronizar(self):
+        pass
+
+    def cerrar(self):
+        pass
+
+
+class AlmacenDispositivosSQLite:
+    # Sentencias constantes: sqlite3 las prepara una vez y las reutiliza desde su caché
+    _ESQUEMA = (
+        """CREATE TABLE IF NOT EXISTS dispositivos (
+               orden INTEGER PRIMARY KEY,
+               id TEXT NOT NULL UNIQUE,
+               tipo TEXT NOT NULL,
+               ubicacion TEXT NOT NULL,
+               ubicacion_clave TEXT NOT NULL,
+               estado TEXT NOT NULL,
+               mantenimiento TEXT NOT NULL
+           )""",
+        "CREATE INDEX IF NOT EXISTS idx_dispositivos_ubicacion ON dispositivos (ubicacion_clave)",
+        "CREATE INDEX IF NOT EXISTS idx_dispositivos_tipo ON dispositivos (tipo)",
+        "CREATE INDEX IF NOT EXISTS idx_dispositivos_estado ON dispositivos (estado)",
+        "CREATE INDEX IF NOT EXISTS idx_dispositivos_mantenimiento ON dispositivos (mantenimiento)"
+    )
+    _COLUMNAS = "id, tipo, ubicacion, estado, mantenimiento"
+    _INSERTAR = ("INSERT INTO dispositivos (id, tipo, ubicacion, ubicacion_clave, estado, mantenimiento) "
+                 "VALUES (?, ?, ?, ?, ?, ?)")
+    _POR_ID = f"SELECT {_COLUMNAS} FROM dispositivos WHERE id = ?"
+    _EXISTE = "SELECT 1 FROM dispositivos WHERE id = ?"
+    _TODOS = f"SELECT {_COLUMNAS} FROM dispositivos ORDER BY orden"
+    _POR_UBICACION = f"SELECT {_COLUMNAS} FROM dispositivos WHERE ubicacion_clave = ? ORDER BY orden"
+    _POR_TIPO = f"SELECT {_COLUMNAS} FROM dispositivos WHERE tipo = ? ORDER BY orden"
+    _POR_ESTADO = f"SELECT {_COLUMNAS} FROM dispositivos WHERE estado = ? ORDER BY orden"
+    _MANTENIMIENTO_ANTERIOR = (f"SELECT {_COLUMNAS} FROM dispositivos "
+                               "WHERE mantenimiento >= ? AND mantenimiento < ? ORDER BY mantenimiento, orden")
+    _CAMBIAR_ESTADO = "UPDATE dispositivos SET estado = ? WHERE id = ?"
+    _CAMBIAR_MANTENIMIENTO = "UPDATE dispositivos SET mantenimiento = ? WHERE id = ?"
+    _ELIMINAR = "DELETE FROM dispositivos WHERE id = ?"
+    _CONTAR = "SELECT COUNT(*) FROM dispositivos"
+    _CONTAR_POR_ESTADO = "SELECT estado, COUNT(*) FROM dispositivos GROUP BY estado"
+    PARAMETROS_POR_CONSULTA = 500  # Por debajo del límite de variables de SQLite
+
+    def __init__(self, ruta: str, tamano_transaccion: int = 10000):
+        """
+        Abre (o crea) la base de datos del registro
+
+        Args:
+            ruta (str): Archivo SQLite (':memory:' para una base temporal)
+            tamano_transaccion (int): Altas masivas (agregar_varios) agrupadas por transacción;
+                                      las pendientes se confirman al llegar al límite, en
+                                      sincronizar(), en cerrar() y con cualquier escritura individual
+        """
+        self.ruta = ruta
+        self.tamano_transaccion = tamano_transaccion
+        self._pendientes = 0
+        # Transacciones controladas a mano (BEGIN/COMMIT) en lugar de las implícitas del módulo
+        self.conexion = sqlite3.connect(ruta, isolation_level=None, check_same_thread=False)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute("PRAGMA synchronous=NORMAL")
+        for sentencia in self._ESQUEMA:
+            self.conexion.execute(sentencia)
+
+    def _consultar(self, sentencia: str, parametros=()):
+        return [DispositivoCompacto(*fila) for fila in self.conexion.execute(sentencia, parametros)]
+
+    def _iniciar_escritura(self):
+        """Abre una transacción si no hay una en curso"""
+        if not self.conexion.in_transaction:
+            self.conexion.execute("BEGIN")
+
+    def _registrar_escritura(self, cantidad: int = 1):
+        """Cuenta escrituras pendientes y confirma al llegar al tamaño del lote"""
+        self._pendientes += cantidad
+        if self._pendientes >= self.tamano_transaccion:
+            self.sincronizar()
+
+    def _escribir(self, sentencia: str, parametros):
+        """
+        Escritura individual confirmada al momento (autocommit); si hay altas masivas
+        pendientes se confirman con ella. Devuelve las filas afectadas.
+        """
+        filas = self.conexion.execute(sentencia, parametros).rowcount
+        if self.conexion.in_transaction:
+            self.sincronizar()
+        return filas
+
+    def __len__(self):
+        return self.conexion.execute(self._CONTAR).fetchone()[0]
+
+    def __iter__(self):
+        """Recorre todos los dispositivos en orden de alta sin cargarlos todos en memoria"""
+        return (DispositivoCompacto(*fila) for fila in self.conexion.execute(self._TODOS))
+
+    def todos(self):
+        """Lista de todos los dispositivos (copias: modificarlas no cambia la base)"""
+        return list(self)
+
+    def contiene(self, id_dispositivo: str):
+        return self.conexion.execute(self._EXISTE, (id_dispositivo,)).fetchone() is not None
+
+    def obtener(self, id_dispositivo: str):
+        fila = self.conexion.execute(self._POR_ID, (id_dispositivo,)).fetchone()
+        return DispositivoCompacto(*fila) if fila is not None else None
+
+    def existentes(self, ids):
+        """Conjunto de los IDs dados que ya están registrados (consultas IN por bloques)"""
+        encontrados = set()
+        ids = list(ids)
+        for inicio in range(0, len(ids), self.PARAMETROS_POR_CONSULTA):
+            bloque = ids[inicio:inicio + self.PARAMETROS_POR_CONSULTA]
+            sentencia = f"SELECT id FROM dispositivos WHERE id IN ({', '.join('?' * len(bloque))})"
+            encontrados.update(id for id, in self.conexion.execute(sentencia, bloque))
+        return encontrados
+
+    @staticmethod
+    def _parametros(dispositivo):
+        id, tipo, ubicacion, estado, mantenimiento = tupla_dispositivo(dispositivo)
+        return (id, tipo, ubicacion, ubicacion.casefold(), estado, normalizar_fecha(mantenimiento))
+
+    def agregar(self, dispositivo: dict):
+        """Agrega un dispositivo (el ID no debe existir)"""
+        self._escribir(self._INSERTAR, self._parametros(dispositivo))
+
+    def agregar_varios(self, dispositivos: list):
+        """
+        Agrega una lista de dispositivos de IDs nuevos y distintos en una sola sentencia,
+        dentro de la transacción por lotes (ver tamano_transaccion); las fechas se
+        validan antes de escribir, así que una fecha inválida no deja el lote a medias
+        """
+        filas = list(map(self._parametros, dispositivos))
+        self._iniciar_escritura()
+        self.conexion.executemany(self._INSERTAR, filas)
+        self._registrar_escritura(len(dispositivos))
+
+    def buscar_por_ubicacion(self, ubicacion: str):
+        return self._consultar(self._POR_UBICACION, (ubicacion.casefold(),))
+
+    def buscar_por_tipo(self, tipo: str):
+        return self._consultar(self._POR_TIPO, (tipo,))
+
+    def buscar_por_estado(self, estado: str):
+        return self._consultar(self._POR_ESTADO, (estado,))
+
+    def buscar_mantenimiento_anterior(self, fecha: str):
+        """Dispositivos con fecha de mantenimiento válida anterior a la fecha (rango sobre el índice)"""
+        return self._consultar(self._MANTENIMIENTO_ANTERIOR, (FECHA_MINIMA, normalizar_fecha(fecha)))
+
+    def contar_por_estado(self):
+        """Dispositivos por estado (conteo sobre el índice de estado)"""
+        conteo = dict.fromkeys(ESTADOS_VALIDOS, 0)
+        conteo.update(self.conexion.execute(self._CONTAR_POR_ESTADO))
+        return conteo
+
+    def actualizar_estado(self, id_dispositivo: str, estado: str):
+        """Cambia el estado; devuelve False si el dispositivo no existe"""
+        return self._escribir(self._CAMBIAR_ESTADO, (estado, id_dispositivo)) > 0
+
+    def actualizar_mantenimiento(self, id_dispositivo: str, fecha: str):
+        """Cambia la fecha de mantenimiento; devuelve False si el dispositivo no existe"""
+        return self._escribir(self._CAMBIAR_MANTENIMIENTO, (normalizar_fecha(fecha), id_dispositivo)) > 0
+
+    def eliminar(self, id_dispositivo: str):
+        """Borra un dispositivo; devuelve False si no existe"""
+        return self._escribir(self._ELIMINAR, (id_dispositivo,)) > 0
+
+    def sincronizar(self):
+        """Confirma la transacción en curso"""
+        if self.conexion.in_transaction:
+            self.conexion.execute("COMMIT")
+        self._pendientes = 0
+
+    def cerrar(self):
+        """Confirma lo pendiente y cierra la base de datos"""
+        self.sincronizar()
+        self.conexion.close()
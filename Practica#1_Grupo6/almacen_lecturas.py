@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+ALMACÉN COLUMNAR DE LECTURAS
+Guarda las lecturas de sensores en columnas contiguas por tipo de sensor
+(array('d') para valores, array('q') para marcas de tiempo en nanosegundos epoch)
+"""
+
+import sys
+from array import array
+
+from estadisticas_flujo import EstadisticasIncrementales
+from tiempo_lecturas import formatear_timestamp
+
+
+def _copiar_en_array(codigo_tipo: str, vista):
+    """Copia una vista de solo lectura (memoryview) a un array ampliable"""
+    copia = array(codigo_tipo)
+    copia.frombytes(vista.cast('B'))
+    return copia
+
+
+class ColumnaSensor:
+    """Columnas contiguas de valores y tiempos de un único tipo de sensor"""
+
+    __slots__ = ("tipo", "codigo", "valores", "tiempos", "resumen", "version")
+
+    def __init__(self, tipo: str, codigo: int):
+        self.tipo = tipo
+        self.codigo = codigo
+        self.valores = array('d')  # Valores de las lecturas (float64)
+        self.tiempos = array('q')  # Nanosegundos epoch (int64)
+        self.resumen = EstadisticasIncrementales()  # Agregados en streaming de la columna
+        self.version = 0  # Aumenta con cada lectura (invalida resultados en caché)
+
+    def __len__(self):
+        return len(self.valores)
+
+    def agregar(self, valor: float, tiempo: int):
+        """Agrega una lectura al final de la columna"""
+        try:
+            self.valores.append(valor)
+        except AttributeError:
+            # Columna proyectada desde un registro en disco: se copia al primer anexado
+            self.valores = _copiar_en_array('d', self.valores)
+            self.tiempos = _copiar_en_array('q', self.tiempos)
+            self.valores.append(valor)
+        self.tiempos.append(tiempo)
+        self.resumen.agregar(valor)
+        self.version += 1
+
+    def lectura(self, indice: int):
+        """Devuelve la lectura en la posición dada como tupla (valor, tipo, timestamp)"""
+        return (self.valores[indice], self.tipo, formatear_timestamp(self.tiempos[indice]))
+
+    def lecturas(self):
+        """Devuelve todas las lecturas de la columna como tuplas (valor, tipo, timestamp)"""
+        tipo = self.tipo
+        return [(valor, tipo, formatear_timestamp(tiempo))
+                for valor, tiempo in zip(self.valores, self.tiempos)]
+
+
+class AlmacenColumnar:
+    def __init__(self):
+        """Inicializa el almacén vacío"""
+        self.columnas = {}          # tipo -> ColumnaSensor
+        self.tipos = []             # código -> tipo (textos internados)
+        self.secuencia = array('H') # Código de tipo de cada lectura en orden de llegada
+        self.resumen = EstadisticasIncrementales()  # Agregados de todas las lecturas
+
+    def __len__(self):
+        return len(self.secuencia)
+
+    def columna(self, tipo_sensor: str, crear: bool = False):
+        """
+        Obtiene la columna de un tipo de sensor
+
+        Args:
+            tipo_sensor (str): Tipo de sensor
+            crear (bool): Crear la columna si no existe
+        """
+        columna = self.columnas.get(tipo_sensor)
+        if columna is None and crear:
+            tipo_sensor = sys.intern(tipo_sensor)
+            columna = ColumnaSensor(tipo_sensor, len(self.tipos))
+            self.tipos.append(tipo_sensor)
+            self.columnas[tipo_sensor] = columna
+        return columna
+
+    def agregar(self, valor: float, tipo_sensor: str, tiempo: int):
+        """
+        Agrega una lectura al almacén
+
+        Args:
+            valor (float): Valor de la lectura
+            tipo_sensor (str): Tipo de sensor
+            tiempo (int): Nanosegundos epoch
+        """
+        columna = self.columna(tipo_sensor, crear=True)
+        columna.agregar(valor, tiempo)
+        try:
+            self.secuencia.append(columna.codigo)
+        except AttributeError:
+            self.secuencia = _copiar_en_array('H', self.secuencia)
+            self.secuencia.append(columna.codigo)
+        self.resumen.agregar(valor)
+        return columna
+
+    def tipos_registrados(self):
+        """Devuelve los tipos de sensor con al menos una lectura"""
+        return [tipo for tipo in self.tipos if len(self.columnas[tipo])]
+
+    def resumen_de(self, tipo_sensor: str = None):
+        """
+        Devuelve los agregados en streaming de un tipo o de todas las lecturas
+
+        Args:
+            tipo_sensor (str): Tipo de sensor específico (opcional)
+        """
+        if tipo_sensor is None:
+            return self.resumen
+        columna = self.columnas.get(tipo_sensor)
+        return columna.resumen if columna is not None else None
+
+    def version(self, tipo_sensor: str = None):
+        """
+        Versión de los datos de un tipo (o de todo el almacén): cambia con cada
+        lectura agregada a ese tipo y no con las de otros tipos
+
+        Args:
+            tipo_sensor (str): Tipo de sensor específico (opcional)
+        """
+        if tipo_sensor is None:
+            return len(self.secuencia)
+        columna = self.columnas.get(tipo_sensor)
+        return columna.version if columna is not None else 0
+
+    def valores(self, tipo_sensor: str = None):
+        """
+        Devuelve los valores de un tipo (sin copia) o de todos los tipos
+
+        Args:
+            tipo_sensor (str): Tipo de sensor específico (opcional)
+        """
+        if tipo_sensor is not None:
+            columna = self.columnas.get(tipo_sensor)
+            return columna.valores if columna is not None else array('d')
+
+        todos = array('d')
+        for tipo in self.tipos:
+            todos.extend(self.columnas[tipo].valores)
+        return todos
+
+    def lecturas_crudas(self):
+        """Recorre todas las lecturas en orden de llegada como tuplas (valor, tipo, nanosegundos epoch)"""
+        posiciones = [0] * len(self.tipos)
+        columnas = [self.columnas[tipo] for tipo in self.tipos]
+        for codigo in self.secuencia:
+            indice = posiciones[codigo]
+            posiciones[codigo] = indice + 1
+            columna = columnas[codigo]
+            yield columna.valores[indice], columna.tipo, columna.tiempos[indice]
+
+    def lecturas(self):
+        """Recorre todas las lecturas en orden de llegada como tuplas (valor, tipo, timestamp)"""
+        for valor, tipo, tiempo in self.lecturas_crudas():
+            yield (valor, tipo, formatear_timestamp(tiempo))
+
+    def memoria_bytes(self):
+        """Estima los bytes ocupados por los búferes de datos"""
+        total = self.secuencia.itemsize * len(self.secuencia)
+        for columna in self.columnas.values():
+            total += columna.valores.itemsize * len(columna.valores)
+            total += columna.tiempos.itemsize * len(columna.tiempos)
+        return total
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+ANÁLISIS PARALELO DE SENSORES
+Reparte las lecturas por tipo de sensor (y por rangos si un tipo es muy grande)
+entre un pool de procesos. Los fragmentos viajan por memoria compartida, no como
+listas serializadas, y los agregados parciales se combinan en un único reporte.
+"""
+
+import math
+import os
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from estadisticas_flujo import combinar_momentos
+from motor_atipicos import MINIMO_LECTURAS, UMBRALES_METODO, ResultadoAtipicos, cuartiles, mediana_ordenada
+from reporte_sensores import UMBRALES_SEGUROS, ReporteSensores, ReporteTipo
+
+
+def _adjuntar(nombre: str):
+    """
+    Se conecta a un bloque de memoria compartida creado por el proceso principal.
+    Los procesos del pool comparten su resource_tracker, así que el registro es
+    idempotente y solo el proceso principal libera (unlink) el bloque.
+    """
+    return shared_memory.SharedMemory(name=nombre)
+
+
+def _fase_momentos(nombre_valores, nombre_ordenados, inicio, fin, min_seguro, max_seguro):
+    """
+    Fase 1 (en un proceso del pool): momentos del fragmento, posiciones fuera de
+    umbral y copia ordenada del fragmento en la memoria compartida de ordenados
+    """
+    bloque_valores = _adjuntar(nombre_valores)
+    bloque_ordenados = _adjuntar(nombre_ordenados)
+    try:
+        valores = bloque_valores.buf.cast('d')
+        ordenados = bloque_ordenados.buf.cast('d')
+        fragmento = valores[inicio:fin]
+        cantidad = fin - inicio
+        media = math.fsum(fragmento) / cantidad
+        m2 = math.fsum((v - media) ** 2 for v in fragmento)
+        fuera_umbral = array('q', [inicio + i for i, v in enumerate(fragmento)
+                                   if v < min_seguro or v > max_seguro])
+        fragmento_ordenado = array('d', sorted(fragmento))
+        ordenados[inicio:fin] = fragmento_ordenado
+        momentos = (cantidad, media, m2, fragmento_ordenado[0], fragmento_ordenado[-1])
+        del fragmento, valores, ordenados
+        return momentos, fuera_umbral.tobytes()
+    finally:
+        bloque_valores.close()
+        bloque_ordenados.close()
+
+
+def _fase_atipicos(nombre_valores, inicio, fin, limite_inferior, limite_superior):
+    """Fase 2 (en un proceso del pool): posiciones de los atípicos del fragmento"""
+    bloque = _adjuntar(nombre_valores)
+    try:
+        valores = bloque.buf.cast('d')
+        fragmento = valores[inicio:fin]
+        indices = array('q', [inicio + i for i, v in enumerate(fragmento)
+                              if v < limite_inferior or v > limite_superior])
+        del fragmento, valores
+        return indices.tobytes()
+    finally:
+        bloque.close()
+
+
+class _OrdenGlobal:
+    """
+    Vista ordenada virtual sobre varios fragmentos ordenados: el elemento k se
+    obtiene por búsqueda binaria sin fusionar los fragmentos
+    """
+
+    def __init__(self, fragmentos):
+        self.fragmentos = [f for f in fragmentos if len(f)]
+        self.total = sum(len(f) for f in self.fragmentos)
+
+    def __len__(self):
+        return self.total
+
+    def __getitem__(self, k):
+        if k < 0:
+            k += self.total
+        fragmentos = self.fragmentos
+        for fragmento in fragmentos:
+            bajo, alto = 0, len(fragmento)
+            while bajo < alto:
+                medio = (bajo + alto) // 2
+                x = fragmento[medio]
+                menores_o_iguales = sum(bisect_right(f, x) for f in fragmentos)
+                if menores_o_iguales <= k:
+                    bajo = medio + 1
+                elif sum(bisect_left(f, x) for f in fragmentos) > k:
+                    alto = medio
+                else:
+                    return x
+        raise IndexError(k)
+
+
+def _rangos(cantidad: int, tamano_fragmento: int):
+    """Divide [0, cantidad) en rangos de hasta tamano_fragmento elementos"""
+    return [(inicio, min(inicio + tamano_fragmento, cantidad))
+            for inicio in range(0, cantidad, tamano_fragmento)]
+
+
+def analizar_en_paralelo(almacen, procesos: int = None, tamano_fragmento: int = None,
+                         umbrales: dict = None):
+    """
+    Construye el mismo ReporteSensores que construir_reporte usando varios procesos
+
+    Args:
+        almacen (AlmacenColumnar): Almacén con las lecturas
+        procesos (int): Procesos del pool (por defecto os.cpu_count())
+        tamano_fragmento (int): Lecturas máximas por fragmento (por defecto se
+                                reparte el total en partes iguales entre los procesos)
+        umbrales (dict): Umbrales seguros por tipo (por defecto UMBRALES_SEGUROS)
+    """
+    if umbrales is None:
+        umbrales = UMBRALES_SEGUROS
+    procesos = procesos or os.cpu_count() or 1
+    tipos = almacen.tipos_registrados()
+    if tamano_fragmento is None:
+        tamano_fragmento = max(1, math.ceil(len(almacen) / procesos))
+
+    bloques = []
+    try:
+        # Copiar cada columna a memoria compartida (más un bloque para los fragmentos ordenados)
+        compartidos = {}
+        for tipo in tipos:
+            valores = almacen.columna(tipo).valores
+            tamano = len(valores) * 8
+            bloque_valores = shared_memory.SharedMemory(create=True, size=tamano)
+            bloques.append(bloque_valores)
+            bloque_ordenados = shared_memory.SharedMemory(create=True, size=tamano)
+            bloques.append(bloque_ordenados)
+            bloque_valores.buf[:tamano] = memoryview(valores).cast('B')
+            compartidos[tipo] = (bloque_valores, bloque_ordenados, len(valores))
+
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            # Fase 1: momentos, umbrales y ordenación de cada fragmento
+            fase1 = {}
+            for tipo in tipos:
+                bloque_valores, bloque_ordenados, cantidad = compartidos[tipo]
+                umbral = umbrales.get(tipo)
+                min_seguro = umbral["min"] if umbral else -math.inf
+                max_seguro = umbral["max"] if umbral else math.inf
+                fase1[tipo] = [(rango, pool.submit(_fase_momentos, bloque_valores.name, bloque_ordenados.name,
+                                                   rango[0], rango[1], min_seguro, max_seguro))
+                               for rango in _rangos(cantidad, tamano_fragmento)]
+
+            # Combinar parciales y calcular límites con los fragmentos ordenados
+            parciales = {}
+            fase2 = {}
+            for tipo in tipos:
+                bloque_valores, bloque_ordenados, cantidad = compartidos[tipo]
+                momentos = (0, 0.0, 0.0, math.inf, -math.inf)
+                fuera_umbral = array('q')
+                for _, futuro in fase1[tipo]:
+                    momentos_fragmento, fuera_bytes = futuro.result()
+                    momentos = combinar_momentos(momentos, momentos_fragmento)
+                    fuera_umbral.frombytes(fuera_bytes)
+
+                ordenados = bloque_ordenados.buf.cast('d')
+                orden = _OrdenGlobal([ordenados[inicio:fin] for (inicio, fin), _ in fase1[tipo]])
+                mediana = mediana_ordenada(orden)
+                limites = None
+                if cantidad >= MINIMO_LECTURAS:
+                    q1, q3 = cuartiles(orden)
+                    iqr = q3 - q1
+                    limites = (q1 - UMBRALES_METODO["iqr"] * iqr, q3 + UMBRALES_METODO["iqr"] * iqr)
+                    fase2[tipo] = [pool.submit(_fase_atipicos, bloque_valores.name, inicio, fin, *limites)
+                                   for (inicio, fin), _ in fase1[tipo]]
+                for fragmento in orden.fragmentos:
+                    fragmento.release()
+                ordenados.release()
+                parciales[tipo] = (momentos, mediana, limites, fuera_umbral)
+
+            # Fase 2: atípicos con los límites globales de cada tipo
+            reportes = {}
+            for tipo in tipos:
+                (cantidad, media, m2, minimo, maximo), mediana, limites, fuera_umbral = parciales[tipo]
+                estadisticas = {
+                    "maximo": maximo,
+                    "minimo": minimo,
+                    "promedio": media,
+                    "mediana": mediana,
+                    "desviacion_estandar": math.sqrt(m2 / (cantidad - 1)) if cantidad > 1 else 0,
+                    "rango": maximo - minimo,
+                    "cantidad": cantidad
+                }
+                atipicos = None
+                if limites is not None:
+                    indices = array('q')
+                    for futuro in fase2[tipo]:
+                        indices.frombytes(futuro.result())
+                    atipicos = ResultadoAtipicos(tipo, "iqr", indices, limites[0], limites[1], media)
+                reportes[tipo] = ReporteTipo(tipo, estadisticas, atipicos, fuera_umbral, umbrales.get(tipo))
+    finally:
+        for bloque in bloques:
+            bloque.close()
+            bloque.unlink()
+
+    return ReporteSensores(reportes)
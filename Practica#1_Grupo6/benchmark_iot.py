@@ -0,0 +1,444 @@
+# -*- coding: utf-8 -*-
+"""
+BANCO DE PRUEBAS DE RENDIMIENTO
+Mide las rutas críticas de AnalizadorSensores y RegistroDispositivosIoT con datos
+sintéticos reproducibles (semilla fija) y guarda los resultados en JSON para
+compararlos con una ejecución base.
+
+Uso:
+    python benchmark_iot.py --escalas 1000 10000 100000 --salida resultados.json
+    python benchmark_iot.py --casos ingesta_lote reporte --base resultados.json
+"""
+
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from tiempo_lecturas import NS_POR_SEGUNDO, parsear_timestamp
+
+# Escalas de referencia (número de lecturas o de dispositivos por caso)
+ESCALAS = (10**3, 10**4, 10**5, 10**6, 10**7)
+ESCALAS_POR_DEFECTO = (10**3, 10**4, 10**5)
+SEMILLA = 42
+
+# Sensores del ejemplo de programa5: (tipo, centro, amplitud, atípico bajo, atípico alto)
+PERFILES_SENSORES = (
+    ("temperatura", 20.0, 3.0, 12.3, 35.5),
+    ("humedad", 50.0, 15.0, 25.2, 85.7),
+    ("presion", 1010.0, 5.0, 990.0, 1030.0)
+)
+PROPORCION_ATIPICOS = 0.01
+
+# Dispositivos del ejemplo de programa4
+TIPOS_DISPOSITIVO = ("sensor_temperatura", "sensor_humedad", "ventilador",
+                     "humidificador", "luz_inteligente", "sensor_presencia")
+UBICACIONES = ("sala", "cocina", "dormitorio", "entrada", "baño", "garaje", "oficina", "jardin")
+
+TAMANO_LOTE = 10000
+REPETICIONES_CONSULTA = 20
+
+
+def generar_lecturas(cantidad: int, semilla: int = SEMILLA):
+    """
+    Genera lecturas (valor, tipo, ns epoch) como ejecutar_analizador_sensores,
+    con un 1% de valores atípicos y una lectura por minuto
+
+    Args:
+        cantidad (int): Número de lecturas
+        semilla (int): Semilla del generador aleatorio
+    """
+    generador = random.Random(semilla)
+    inicio = parsear_timestamp("2023-10-15 10:00")
+    lecturas = []
+    for i in range(cantidad):
+        tipo, centro, amplitud, bajo, alto = PERFILES_SENSORES[i % len(PERFILES_SENSORES)]
+        if generador.random() < PROPORCION_ATIPICOS:
+            valor = bajo if generador.random() < 0.5 else alto
+        else:
+            valor = round(centro + generador.uniform(-amplitud, amplitud), 1)
+        lecturas.append((valor, tipo, inicio + i * 60 * NS_POR_SEGUNDO))
+    return lecturas
+
+
+def generar_dispositivos(cantidad: int, semilla: int = SEMILLA):
+    """
+    Genera dispositivos (id, tipo, ubicacion, estado, mantenimiento) como
+    ejecutar_registro_dispositivos
+
+    Args:
+        cantidad (int): Número de dispositivos
+        semilla (int): Semilla del generador aleatorio
+    """
+    generador = random.Random(semilla)
+    dispositivos = []
+    for i in range(cantidad):
+        tipo = generador.choice(TIPOS_DISPOSITIVO)
+        prefijo = "SEN" if tipo.startswith("sensor") else "ACT"
+        dispositivos.append((
+            f"{prefijo}-{i:08d}",
+            tipo,
+            generador.choice(UBICACIONES),
+            "activo" if generador.random() < 0.7 else "inactivo",
+            f"2023-{generador.randint(1, 12):02d}-{generador.randint(1, 28):02d}"
+        ))
+    return dispositivos
+
+
+def percentil(ordenados, p: float):
+    """Percentil p (0-100) por rango más cercano sobre una secuencia ordenada"""
+    if not ordenados:
+        return 0
+    k = max(0, min(len(ordenados) - 1, round(p / 100 * len(ordenados)) - 1))
+    return ordenados[k]
+
+
+def rss_pico_kb():
+    """Pico de memoria residente del proceso en KiB"""
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico // 1024 if sys.platform == "darwin" else pico  # macOS lo da en bytes
+
+
+class Medicion:
+    """Acumula latencias (ns) de operaciones medidas una a una o por lotes"""
+
+    def __init__(self):
+        self.latencias = array('q')
+        self.operaciones = 0
+        self.total_ns = 0
+
+    def registrar(self, duracion_ns: int, operaciones: int = 1):
+        """
+        Args:
+            duracion_ns (int): Duración de la llamada medida
+            operaciones (int): Operaciones que incluye la llamada (latencia = duración / operaciones)
+        """
+        self.latencias.append(duracion_ns // operaciones)
+        self.operaciones += operaciones
+        self.total_ns += duracion_ns
+
+    def resultado(self, caso: str, escala: int):
+        ordenadas = sorted(self.latencias)
+        segundos = self.total_ns / NS_POR_SEGUNDO
+        return {
+            "caso": caso,
+            "escala": escala,
+            "operaciones": self.operaciones,
+            "segundos": round(segundos, 6),
+            "ops_por_segundo": round(self.operaciones / segundos, 2) if segundos else None,
+            "p50_us": percentil(ordenadas, 50) / 1000,
+            "p99_us": percentil(ordenadas, 99) / 1000,
+            "rss_pico_kb": rss_pico_kb()
+        }
+
+
+def _analizador_con_datos(lecturas):
+    """Analizador silencioso ya cargado con las lecturas"""
+    from programa5_analizador import AnalizadorSensores
+    from salida_eventos import SalidaSilenciosa
+
+    analizador = AnalizadorSensores(SalidaSilenciosa())
+    analizador.agregar_lote(lecturas)
+    return analizador
+
+
+def _registro_con_datos(dispositivos):
+    """Registro silencioso ya cargado con los dispositivos"""
+    from programa4_registro import RegistroDispositivosIoT
+    from salida_eventos import SalidaSilenciosa
+
+    registro = RegistroDispositivosIoT(SalidaSilenciosa())
+    for dispositivo in dispositivos:
+        registro.agregar_dispositivo(*dispositivo)
+    return registro
+
+
+def caso_ingesta_lectura(escala, semilla, medicion):
+    """agregar_lectura, una llamada por lectura"""
+    from programa5_analizador import AnalizadorSensores
+    from salida_eventos import SalidaSilenciosa
+
+    lecturas = generar_lecturas(escala, semilla)
+    analizador = AnalizadorSensores(SalidaSilenciosa())
+    agregar = analizador.agregar_lectura
+    reloj = time.perf_counter_ns
+    for valor, tipo, tiempo in lecturas:
+        inicio = reloj()
+        agregar(valor, tipo, tiempo)
+        medicion.registrar(reloj() - inicio)
+
+
+def caso_ingesta_lote(escala, semilla, medicion):
+    """agregar_lote en lotes de TAMANO_LOTE lecturas"""
+    from programa5_analizador import AnalizadorSensores
+    from salida_eventos import SalidaSilenciosa
+
+    lecturas = generar_lecturas(escala, semilla)
+    analizador = AnalizadorSensores(SalidaSilenciosa())
+    for inicio_lote in range(0, escala, TAMANO_LOTE):
+        lote = lecturas[inicio_lote:inicio_lote + TAMANO_LOTE]
+        inicio = time.perf_counter_ns()
+        analizador.agregar_lote(lote)
+        medicion.registrar(time.perf_counter_ns() - inicio, len(lote))
+
+
+def caso_estadisticas(escala, semilla, medicion):
+    """calcular_estadisticas por tipo (agregados incrementales)"""
+    analizador = _analizador_con_datos(generar_lecturas(escala, semilla))
+    for _ in range(REPETICIONES_CONSULTA):
+        for tipo, *_ in PERFILES_SENSORES:
+            inicio = time.perf_counter_ns()
+            analizador.calcular_estadisticas(tipo)
+            medicion.registrar(time.perf_counter_ns() - inicio)
+
+
+def caso_estadisticas_exactas(escala, semilla, medicion):
+    """calcular_estadisticas por tipo con exacto=True (recorre las lecturas, sin caché)"""
+    analizador = _analizador_con_datos(generar_lecturas(escala, semilla))
+    analizador.cache = None
+    for _ in range(REPETICIONES_CONSULTA):
+        for tipo, *_ in PERFILES_SENSORES:
+            inicio = time.perf_counter_ns()
+            analizador.calcular_estadisticas(tipo, exacto=True)
+            medicion.registrar(time.perf_counter_ns() - inicio)
+
+
+def caso_atipicos(escala, semilla, medicion):
+    """detectar_valores_atipicos (IQR) por tipo, sin caché"""
+    analizador = _analizador_con_datos(generar_lecturas(escala, semilla))
+    analizador.cache = None
+    for _ in range(REPETICIONES_CONSULTA):
+        for tipo, *_ in PERFILES_SENSORES:
+            inicio = time.perf_counter_ns()
+            analizador.detectar_valores_atipicos(tipo)
+            medicion.registrar(time.perf_counter_ns() - inicio)
+
+
+def caso_umbrales(escala, semilla, medicion):
+    """verificar_umbrales_seguros de temperatura y humedad, sin caché"""
+    analizador = _analizador_con_datos(generar_lecturas(escala, semilla))
+    analizador.cache = None
+    for _ in range(REPETICIONES_CONSULTA):
+        for tipo in ("temperatura", "humedad"):
+            inicio = time.perf_counter_ns()
+            analizador.verificar_umbrales_seguros(tipo)
+            medicion.registrar(time.perf_counter_ns() - inicio)
+
+
+def caso_consultas_en_cache(escala, semilla, medicion):
+    """Estadísticas exactas, atípicos y umbrales repetidos sobre datos sin cambios (aciertos de caché)"""
+    analizador = _analizador_con_datos(generar_lecturas(escala, semilla))
+    consultas = [(analizador.calcular_estadisticas, (tipo, True)) for tipo, *_ in PERFILES_SENSORES]
+    consultas += [(analizador.detectar_valores_atipicos, (tipo,)) for tipo, *_ in PERFILES_SENSORES]
+    consultas += [(analizador.verificar_umbrales_seguros, (tipo,)) for tipo in ("temperatura", "humedad")]
+    for consulta, argumentos in consultas:
+        consulta(*argumentos)  # Llena la caché
+    for _ in range(REPETICIONES_CONSULTA):
+        for consulta, argumentos in consultas:
+            inicio = time.perf_counter_ns()
+            consulta(*argumentos)
+            medicion.registrar(time.perf_counter_ns() - inicio)
+
+
+def caso_reporte(escala, semilla, medicion):
+    """generar_reporte_completo con la salida descartada"""
+    analizador = _analizador_con_datos(generar_lecturas(escala, semilla))
+    with open(os.devnull, "w", encoding="utf-8") as nulo, contextlib.redirect_stdout(nulo):
+        for _ in range(max(1, REPETICIONES_CONSULTA // 4)):
+            inicio = time.perf_counter_ns()
+            analizador.generar_reporte_completo()
+            medicion.registrar(time.perf_counter_ns() - inicio)
+
+
+def caso_registro_agregar(escala, semilla, medicion):
+    """agregar_dispositivo, una llamada por dispositivo"""
+    from programa4_registro import RegistroDispositivosIoT
+    from salida_eventos import SalidaSilenciosa
+
+    dispositivos = generar_dispositivos(escala, semilla)
+    registro = RegistroDispositivosIoT(SalidaSilenciosa())
+    agregar = registro.agregar_dispositivo
+    reloj = time.perf_counter_ns
+    for dispositivo in dispositivos:
+        inicio = reloj()
+        agregar(*dispositivo)
+        medicion.registrar(reloj() - inicio)
+
+
+def caso_registro_buscar(escala, semilla, medicion):
+    """obtener_dispositivo por ID y buscar_por_ubicacion / buscar_por_tipo"""
+    dispositivos = generar_dispositivos(escala, semilla)
+    registro = _registro_con_datos(dispositivos)
+    generador = random.Random(semilla + 1)
+    reloj = time.perf_counter_ns
+    for _ in range(min(escala, 100000)):
+        id_dispositivo = generador.choice(dispositivos)[0]
+        inicio = reloj()
+        registro.obtener_dispositivo(id_dispositivo)
+        medicion.registrar(reloj() - inicio)
+    for _ in range(REPETICIONES_CONSULTA):
+        inicio = reloj()
+        registro.buscar_por_ubicacion(generador.choice(UBICACIONES))
+        registro.buscar_por_tipo(generador.choice(TIPOS_DISPOSITIVO))
+        medicion.registrar(reloj() - inicio, 2)
+
+
+def caso_registro_actualizar(escala, semilla, medicion):
+    """actualizar_estado y actualizar_mantenimiento sobre IDs aleatorios"""
+    dispositivos = generar_dispositivos(escala, semilla)
+    registro = _registro_con_datos(dispositivos)
+    generador = random.Random(semilla + 2)
+    reloj = time.perf_counter_ns
+    for i in range(min(escala, 100000)):
+        id_dispositivo = generador.choice(dispositivos)[0]
+        inicio = reloj()
+        if i % 2:
+            registro.actualizar_mantenimiento(id_dispositivo, "2023-10-15")
+        else:
+            registro.actualizar_estado(id_dispositivo, "activo" if generador.random() < 0.5 else "inactivo")
+        medicion.registrar(reloj() - inicio)
+
+
+CASOS = {
+    "ingesta_lectura": caso_ingesta_lectura,
+    "ingesta_lote": caso_ingesta_lote,
+    "estadisticas": caso_estadisticas,
+    "estadisticas_exactas": caso_estadisticas_exactas,
+    "atipicos": caso_atipicos,
+    "umbrales": caso_umbrales,
+    "consultas_en_cache": caso_consultas_en_cache,
+    "reporte": caso_reporte,
+    "registro_agregar": caso_registro_agregar,
+    "registro_buscar": caso_registro_buscar,
+    "registro_actualizar": caso_registro_actualizar
+}
+
+
+def ejecutar_caso(caso: str, escala: int, semilla: int = SEMILLA):
+    """
+    Ejecuta un caso en el proceso actual y devuelve su resultado
+
+    Args:
+        caso (str): Nombre del caso (ver CASOS)
+        escala (int): Número de lecturas o dispositivos
+        semilla (int): Semilla de los datos sintéticos
+    """
+    medicion = Medicion()
+    CASOS[caso](escala, semilla, medicion)
+    return medicion.resultado(caso, escala)
+
+
+def ejecutar_benchmark(casos=None, escalas=ESCALAS_POR_DEFECTO, semilla: int = SEMILLA,
+                       aislar: bool = True):
+    """
+    Ejecuta los casos en todas las escalas
+
+    Args:
+        casos: Nombres de casos (por defecto todos)
+        escalas: Escalas a medir
+        semilla (int): Semilla de los datos sintéticos
+        aislar (bool): Ejecuta cada caso en un proceso nuevo para que el pico de RSS sea solo suyo
+
+    Returns:
+        Diccionario con metadatos de la ejecución y la lista de resultados
+    """
+    casos = list(casos or CASOS)
+    resultados = []
+    for escala in escalas:
+        for caso in casos:
+            if aislar:
+                contexto = multiprocessing.get_context("spawn")
+                with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as pool:
+                    resultado = pool.submit(ejecutar_caso, caso, escala, semilla).result()
+            else:
+                resultado = ejecutar_caso(caso, escala, semilla)
+            print(f"  {caso:<22} {escala:>10}  {resultado['ops_por_segundo'] or 0:>14,.0f} ops/s  "
+                  f"p50 {resultado['p50_us']:>10.2f} µs  p99 {resultado['p99_us']:>10.2f} µs  "
+                  f"RSS {resultado['rss_pico_kb'] / 1024:>8.1f} MiB")
+            resultados.append(resultado)
+    return {
+        "meta": {
+            "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "cpus": os.cpu_count(),
+            "semilla": semilla,
+            "aislado": aislar
+        },
+        "resultados": resultados
+    }
+
+
+def comparar_con_base(actual: dict, base: dict, tolerancia: float = 0.10):
+    """
+    Compara ops/s con una ejecución base
+
+    Args:
+        actual (dict): Resultado de ejecutar_benchmark
+        base (dict): Resultado base cargado de JSON
+        tolerancia (float): Caída relativa de ops/s a partir de la cual se considera regresión
+
+    Returns:
+        Lista de (caso, escala, ops base, ops actual, cambio relativo, es_regresion)
+    """
+    anteriores = {(r["caso"], r["escala"]): r for r in base["resultados"]}
+    comparacion = []
+    for resultado in actual["resultados"]:
+        anterior = anteriores.get((resultado["caso"], resultado["escala"]))
+        if anterior is None or not anterior["ops_por_segundo"] or not resultado["ops_por_segundo"]:
+            continue
+        cambio = resultado["ops_por_segundo"] / anterior["ops_por_segundo"] - 1
+        comparacion.append((resultado["caso"], resultado["escala"], anterior["ops_por_segundo"],
+                            resultado["ops_por_segundo"], cambio, cambio < -tolerancia))
+    return comparacion
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banco de pruebas de rendimiento del analizador y del registro")
+    parser.add_argument("--casos", nargs="+", choices=sorted(CASOS), help="Casos a ejecutar (por defecto todos)")
+    parser.add_argument("--escalas", nargs="+", type=int, default=list(ESCALAS_POR_DEFECTO),
+                        help=f"Escalas a medir (referencia: {', '.join(str(e) for e in ESCALAS)})")
+    parser.add_argument("--semilla", type=int, default=SEMILLA)
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--base", help="Archivo JSON de una ejecución anterior para comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.10,
+                        help="Caída relativa de ops/s que cuenta como regresión (por defecto 0.10)")
+    parser.add_argument("--sin-aislar", action="store_true",
+                        help="Ejecuta todos los casos en este proceso (el pico de RSS se acumula)")
+    args = parser.parse_args(argv)
+
+    for escala in args.escalas:
+        if escala < 1:
+            parser.error(f"Escala no válida: {escala}")
+
+    print("⏱️  BANCO DE PRUEBAS IoT")
+    actual = ejecutar_benchmark(args.casos, args.escalas, args.semilla, not args.sin_aislar)
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(actual, archivo, indent=2, ensure_ascii=False)
+        print(f"💾 Resultados guardados en {args.salida}")
+
+    if args.base:
+        with open(args.base, "r", encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        print(f"\n📊 COMPARACIÓN CON {args.base} (tolerancia {args.tolerancia:.0%}):")
+        regresiones = 0
+        for caso, escala, ops_base, ops_actual, cambio, regresion in comparar_con_base(actual, base, args.tolerancia):
+            marca = "❌" if regresion else "✅"
+            regresiones += regresion
+            print(f"  {marca} {caso:<22} {escala:>10}  {ops_base:>14,.0f} → {ops_actual:>14,.0f} ops/s ({cambio:+.1%})")
+        return 1 if regresiones else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+CACHÉ DE RESULTADOS DE CONSULTAS
+Guarda los resultados de consultas costosas (estadísticas exactas, atípicos,
+umbrales) junto con la versión de los datos con la que se calcularon. Una entrada
+sirve mientras la versión del tipo de sensor no cambie; la expulsión es LRU con
+límite de entradas y de memoria estimada. Los resultados se congelan una vez al
+guardarlos (dict -> MappingProxyType, list -> tuple) y cada acierto devuelve el
+mismo objeto sin copiarlo: los resultados de la caché son de solo lectura.
+"""
+
+import sys
+from collections import OrderedDict
+from types import MappingProxyType
+
+_AUSENTE = object()
+
+
+def congelar_resultado(objeto):
+    """
+    Devuelve una versión de solo lectura de un resultado: los dict anidados pasan a
+    MappingProxyType y las list a tuple (los escalares se conservan)
+
+    Args:
+        objeto: Resultado a congelar
+    """
+    if isinstance(objeto, dict):
+        return MappingProxyType({clave: congelar_resultado(valor) for clave, valor in objeto.items()})
+    if isinstance(objeto, list):
+        return tuple(congelar_resultado(elemento) for elemento in objeto)
+    return objeto
+
+
+def estimar_bytes(objeto):
+    """
+    Estima la memoria de un resultado (dict, list, tuple y escalares anidados)
+
+    Args:
+        objeto: Resultado a medir
+    """
+    tamano = sys.getsizeof(objeto)
+    if isinstance(objeto, dict):
+        for clave, valor in objeto.items():
+            tamano += estimar_bytes(clave) + estimar_bytes(valor)
+    elif isinstance(objeto, (list, tuple)):
+        for elemento in objeto:
+            tamano += estimar_bytes(elemento)
+    return tamano
+
+
+class CacheResultados:
+    def __init__(self, max_entradas: int = 256, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Inicializa la caché vacía
+
+        Args:
+            max_entradas (int): Número máximo de resultados guardados
+            max_bytes (int): Memoria estimada máxima de los resultados guardados
+        """
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.entradas = OrderedDict()  # clave -> (versión, resultado, bytes)
+        self.bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __len__(self):
+        return len(self.entradas)
+
+    def obtener(self, clave, version):
+        """
+        Devuelve el resultado guardado si se calculó con la misma versión de los datos
+
+        Args:
+            clave: Clave hashable de la consulta
+            version: Versión actual de los datos de la consulta
+
+        Returns:
+            El resultado guardado (de solo lectura, sin copiar) o None si no hay uno válido
+        """
+        entrada = self.entradas.get(clave, _AUSENTE)
+        if entrada is _AUSENTE or entrada[0] != version:
+            self.fallos += 1
+            return None
+        self.entradas.move_to_end(clave)
+        self.aciertos += 1
+        return entrada[1]
+
+    def guardar(self, clave, version, resultado):
+        """
+        Guarda el resultado congelado y expulsa los menos usados si se superan los límites.
+        Los resultados más grandes que max_bytes no se guardan.
+
+        Args:
+            clave: Clave hashable de la consulta
+            version: Versión de los datos con la que se calculó
+            resultado: Resultado de la consulta (dict, list y escalares anidados)
+
+        Returns:
+            El resultado congelado, el mismo que devolverán los aciertos siguientes
+            (o el original si no se guarda por su tamaño)
+        """
+        tamano = estimar_bytes(resultado)
+        anterior = self.entradas.pop(clave, None)
+        if anterior is not None:
+            self.bytes -= anterior[2]
+        if tamano > self.max_bytes:
+            return resultado
+        resultado = congelar_resultado(resultado)
+        self.entradas[clave] = (version, resultado, tamano)
+        self.bytes += tamano
+        while len(self.entradas) > self.max_entradas or self.bytes > self.max_bytes:
+            _, (_, _, tamano_expulsado) = self.entradas.popitem(last=False)
+            self.bytes -= tamano_expulsado
+        return resultado
+
+    def limpiar(self):
+        """Vacía la caché"""
+        self.entradas.clear()
+        self.bytes = 0
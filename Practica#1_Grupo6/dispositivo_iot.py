@@ -1,27 +1,44 @@
 import random
 from datetime import datetime
 
-# Simular lecturas de sensores
-temperatura = round(random.uniform(20, 35), 2)   # grados °C
-humedad = round(random.uniform(20, 60), 2)       # porcentaje %
-hora_actual = datetime.now().hour                # hora del sistema
-
-print(f"Temperatura: {temperatura}°C")
-print(f"Humedad: {humedad}%")
-print(f"Hora actual: {hora_actual}:00")
-
-# Control de dispositivos con estructuras de control
-if temperatura > 28:
-    print("Activando ventilador...")
-else:
-    print("Ventilador apagado.")
-
-if humedad < 40:
-    print("Activando humidificador...")
-else:
-    print("Humidificador apagado.")
-
-if hora_actual >= 18:
-    print("Encendiendo luces...")
-else:
-    print("Luces apagadas.")
+from motor_reglas import REGLAS_CONTROL_HOGAR, MotorReglas
+
+
+def main():
+    """Simula una lectura del hogar y decide qué dispositivos activar"""
+    # Simular lecturas de sensores
+    temperatura = round(random.uniform(20, 35), 2)   # grados °C
+    humedad = round(random.uniform(20, 60), 2)       # porcentaje %
+    hora_actual = datetime.now().hour                # hora del sistema
+
+    print(f"Temperatura: {temperatura}°C")
+    print(f"Humedad: {humedad}%")
+    print(f"Hora actual: {hora_actual}:00")
+
+    # Control de dispositivos con el motor de reglas (lote de una sola lectura)
+    motor = MotorReglas(REGLAS_CONTROL_HOGAR)
+    decisiones = motor.evaluar({
+        "dispositivo": ["hogar"],
+        "temperatura": [temperatura],
+        "humedad": [humedad],
+        "hora": [hora_actual]
+    })
+
+    if decisiones["ventilador"][0]:
+        print("Activando ventilador...")
+    else:
+        print("Ventilador apagado.")
+
+    if decisiones["humidificador"][0]:
+        print("Activando humidificador...")
+    else:
+        print("Humidificador apagado.")
+
+    if decisiones["luz_inteligente"][0]:
+        print("Encendiendo luces...")
+    else:
+        print("Luces apagadas.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+ESTADÍSTICAS INCREMENTALES DE SENSORES
+Agregados en streaming actualizados en O(1) por lectura:
+cantidad, mínimo, máximo, media y varianza (Welford) y mediana (exacta hasta
+LIMITE_EXACTO lecturas, aproximada con P² a partir de ahí)
+"""
+
+import math
+from bisect import insort
+
+# Observaciones que se guardan ordenadas para dar el cuantil exacto antes de pasar a P²
+LIMITE_EXACTO = 256
+
+
+def combinar_momentos(a, b):
+    """
+    Combina dos agregados parciales (cantidad, media, m2, minimo, maximo)
+    con la fórmula de Chan et al. La operación es asociativa.
+
+    Args:
+        a (tuple): Primer agregado parcial
+        b (tuple): Segundo agregado parcial
+    """
+    cantidad_a, media_a, m2_a, minimo_a, maximo_a = a
+    cantidad_b, media_b, m2_b, minimo_b, maximo_b = b
+    if cantidad_a == 0:
+        return b
+    if cantidad_b == 0:
+        return a
+    total = cantidad_a + cantidad_b
+    delta = media_b - media_a
+    return (total,
+            media_a + delta * cantidad_b / total,
+            m2_a + m2_b + delta * delta * cantidad_a * cantidad_b / total,
+            min(minimo_a, minimo_b),
+            max(maximo_a, maximo_b))
+
+
+class CuantilP2:
+    """
+    Estimador P² (Jain & Chlamtac) de un cuantil en memoria constante.
+    Hasta LIMITE_EXACTO observaciones las guarda ordenadas y el cuantil es exacto;
+    al superarlo coloca los 5 marcadores sobre ellas y continúa con P² (aproximado).
+    """
+
+    __slots__ = ("p", "exactos", "alturas", "posiciones", "deseadas", "incrementos")
+
+    def __init__(self, p: float = 0.5):
+        self.p = p
+        self.exactos = []  # Observaciones ordenadas (None desde que se usa P²)
+        self.alturas = []  # Alturas de los 5 marcadores
+        self.posiciones = []
+        self.deseadas = []
+        self.incrementos = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    @property
+    def exacto(self):
+        """Indica si valor() es el cuantil exacto de las observaciones"""
+        return self.exactos is not None
+
+    def _iniciar_marcadores(self):
+        """Coloca los marcadores de P² en los cuantiles de las observaciones guardadas"""
+        ordenados = self.exactos
+        ultimo = len(ordenados) - 1
+        self.deseadas = [ultimo * incremento for incremento in self.incrementos]
+        posiciones = [round(deseada) for deseada in self.deseadas]
+        for i in (1, 2, 3):
+            # Posiciones estrictamente crecientes aunque p esté cerca de 0 o de 1
+            posiciones[i] = min(max(posiciones[i], posiciones[i - 1] + 1), ultimo - (4 - i))
+        self.posiciones = posiciones
+        self.alturas = [ordenados[posicion] for posicion in posiciones]
+        self.exactos = None
+
+    def agregar(self, x: float):
+        """Incorpora una observación"""
+        if self.exactos is not None:
+            insort(self.exactos, x)
+            if len(self.exactos) > LIMITE_EXACTO:
+                self._iniciar_marcadores()
+            return
+
+        q = self.alturas
+        # Localizar la celda de la observación y ajustar extremos
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        n = self.posiciones
+        for i in range(k + 1, 5):
+            n[i] += 1
+        deseadas = self.deseadas
+        for i in range(5):
+            deseadas[i] += self.incrementos[i]
+
+        # Ajustar los marcadores intermedios
+        for i in (1, 2, 3):
+            d = deseadas[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                s = 1 if d > 0 else -1
+                candidata = q[i] + s / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                if q[i - 1] < candidata < q[i + 1]:
+                    q[i] = candidata
+                else:
+                    q[i] = q[i] + s * (q[i + s] - q[i]) / (n[i + s] - n[i])
+                n[i] += s
+
+    def valor(self):
+        """Devuelve el cuantil (exacto, ver `exacto`) o su estimación P²; None si no hay datos"""
+        ordenados = self.exactos
+        if ordenados is not None:
+            if not ordenados:
+                return None
+            # Cuantil exacto con interpolación lineal (para p=0.5, como statistics.median)
+            posicion = self.p * (len(ordenados) - 1)
+            inferior = int(posicion)
+            fraccion = posicion - inferior
+            if fraccion == 0:
+                return ordenados[inferior]
+            return ordenados[inferior] + fraccion * (ordenados[inferior + 1] - ordenados[inferior])
+        return self.alturas[2]
+
+    def exportar_estado(self):
+        """Devuelve el estado interno como diccionario serializable"""
+        return {"p": self.p, "exactos": None if self.exactos is None else list(self.exactos),
+                "alturas": list(self.alturas), "posiciones": list(self.posiciones),
+                "deseadas": list(self.deseadas)}
+
+    @classmethod
+    def restaurar_estado(cls, estado: dict):
+        """Reconstruye un estimador a partir de exportar_estado()"""
+        cuantil = cls(estado["p"])
+        if "exactos" in estado:
+            exactos = estado["exactos"]
+        else:
+            # Estado anterior al búfer exacto: con menos de 5 alturas aún no había marcadores
+            exactos = sorted(estado["alturas"]) if len(estado["alturas"]) < 5 else None
+        if exactos is not None:
+            cuantil.exactos = list(exactos)
+            return cuantil
+        cuantil.exactos = None
+        cuantil.alturas = list(estado["alturas"])
+        cuantil.posiciones = list(estado["posiciones"])
+        cuantil.deseadas = list(estado["deseadas"])
+        return cuantil
+
+
+class EstadisticasIncrementales:
+    """Agregados en streaming de una serie de lecturas"""
+
+    __slots__ = ("cantidad", "media", "m2", "minimo", "maximo", "mediana")
+
+    def __init__(self):
+        self.cantidad = 0
+        self.media = 0.0
+        self.m2 = 0.0            # Suma de cuadrados de desviaciones (Welford)
+        self.minimo = math.inf
+        self.maximo = -math.inf
+        self.mediana = CuantilP2(0.5)
+
+    def agregar(self, valor: float):
+        """Actualiza los agregados con una nueva lectura en O(1)"""
+        self.cantidad += 1
+        delta = valor - self.media
+        self.media += delta / self.cantidad
+        self.m2 += delta * (valor - self.media)
+        if valor < self.minimo:
+            self.minimo = valor
+        if valor > self.maximo:
+            self.maximo = valor
+        self.mediana.agregar(valor)
+
+    def varianza(self):
+        """Varianza muestral (0 con menos de dos lecturas)"""
+        return self.m2 / (self.cantidad - 1) if self.cantidad > 1 else 0
+
+    def exportar_estado(self):
+        """Devuelve el estado interno como diccionario serializable"""
+        return {"cantidad": self.cantidad, "media": self.media, "m2": self.m2,
+                "minimo": self.minimo, "maximo": self.maximo,
+                "mediana": self.mediana.exportar_estado()}
+
+    @classmethod
+    def restaurar_estado(cls, estado: dict):
+        """Reconstruye los agregados a partir de exportar_estado()"""
+        resumen = cls()
+        resumen.cantidad = estado["cantidad"]
+        resumen.media = estado["media"]
+        resumen.m2 = estado["m2"]
+        resumen.minimo = estado["minimo"]
+        resumen.maximo = estado["maximo"]
+        resumen.mediana = CuantilP2.restaurar_estado(estado["mediana"])
+        return resumen
+
+    def como_diccionario(self):
+        """
+        Devuelve los agregados con las claves de calcular_estadisticas. Con más de
+        LIMITE_EXACTO lecturas la mediana es la estimación P² y va en 'mediana_aprox'
+        en lugar de 'mediana'
+        """
+        if self.cantidad == 0:
+            return {}
+        return {
+            "maximo": self.maximo,
+            "minimo": self.minimo,
+            "promedio": self.media,
+            "mediana" if self.mediana.exacto else "mediana_aprox": self.mediana.valor(),
+            "desviacion_estandar": math.sqrt(self.varianza()) if self.cantidad > 1 else 0,
+            "rango": self.maximo - self.minimo,
+            "cantidad": self.cantidad
+        }
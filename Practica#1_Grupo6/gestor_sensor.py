@@ -1,21 +1,31 @@
-from datetime import datetime
 import random
+from time import time_ns
 
-sensores = []
+from tiempo_lecturas import formatear_timestamp
 
-for i in range(5):
-    temp = round(random.uniform(18, 32), 2)   
-    humedad = round(random.uniform(30, 60), 2)  
 
-    
-    sensores.append((temp, datetime.now().strftime("%H:%M:%S"), "temperatura"))
-    sensores.append((humedad, datetime.now().strftime("%H:%M:%S"), "humedad"))
+def main():
+    """Simula cinco muestras de temperatura y humedad y muestra su promedio"""
+    sensores = []
 
-print("\nLecturas de sensores:")
-for lectura in sensores:
-    print(lectura)
+    for i in range(5):
+        temp = round(random.uniform(18, 32), 2)   
+        humedad = round(random.uniform(30, 60), 2)  
 
-temperaturas = [valor for (valor, _, tipo) in sensores if tipo == "temperatura"]
-promedio_temp = sum(temperaturas) / len(temperaturas)
+        # Una sola lectura del reloj por muestra; el texto se genera al mostrar
+        ahora = time_ns()
+        sensores.append((temp, ahora, "temperatura"))
+        sensores.append((humedad, ahora, "humedad"))
 
-print(f"\nPromedio de temperatura: {promedio_temp:.2f}°C")
+    print("\nLecturas de sensores:")
+    for valor, tiempo, tipo in sensores:
+        print((valor, formatear_timestamp(tiempo, "%H:%M:%S"), tipo))
+
+    temperaturas = [valor for (valor, _, tipo) in sensores if tipo == "temperatura"]
+    promedio_temp = sum(temperaturas) / len(temperaturas)
+
+    print(f"\nPromedio de temperatura: {promedio_temp:.2f}°C")
+
+
+if __name__ == "__main__":
+    main()
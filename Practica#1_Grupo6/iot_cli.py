@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+LÍNEA DE COMANDOS DE LOS PROGRAMAS IoT
+Punto de entrada único con un subcomando por programa. Cada subcomando importa
+su módulo solo cuando se ejecuta, así que arrancar la línea de comandos no carga
+statistics, multiprocessing, http.server ni sqlite3 si no hacen falta. El
+subcomando 'daemon' deja el analizador y el registro cargados en un proceso y
+'cliente' le envía llamadas sin volver a pagar el arranque.
+
+Uso:
+    python iot_cli.py analizador
+    python iot_cli.py daemon --puerto 9109 --registro-sqlite dispositivos.db
+    python iot_cli.py cliente agregar_lectura 25.3 temperatura
+    python iot_cli.py cliente calcular_estadisticas temperatura
+"""
+
+import argparse
+import sys
+
+PUERTO_SERVICIO = 9109  # Igual que servicio_iot.PUERTO_SERVICIO, sin importar el módulo
+
+
+def _dispositivo(argumentos):
+    from dispositivo_iot import main
+    main()
+
+
+def _sensores(argumentos):
+    from gestor_sensor import main
+    main()
+
+
+def _temperatura(argumentos):
+    from sistema_temperatura import main
+    main()
+
+
+def _registro(argumentos):
+    from programa4_registro import ejecutar_registro_dispositivos
+    ejecutar_registro_dispositivos()
+
+
+def _analizador(argumentos):
+    from programa5_analizador import ejecutar_analizador_sensores
+    ejecutar_analizador_sensores()
+
+
+def _adquisicion(argumentos):
+    from adquisicion_async import ejecutar_adquisicion
+    ejecutar_adquisicion(argumentos.sensores, argumentos.muestras)
+
+
+def _distribuido(argumentos):
+    from resumen_distribuido import ejecutar_demo_distribuido
+    ejecutar_demo_distribuido(argumentos.nodos, argumentos.lecturas)
+
+
+def _benchmark(argumentos):
+    from benchmark_iot import main
+    return main(argumentos.opciones)
+
+
+def _daemon(argumentos):
+    from servicio_iot import ejecutar_servicio
+    ejecutar_servicio(argumentos.host, argumentos.puerto, argumentos.registro_sqlite, argumentos.registro_lecturas)
+
+
+def _valor_argumento(texto: str):
+    """Interpreta un argumento como JSON (números, listas, null...) o lo deja como texto"""
+    import json
+
+    try:
+        return json.loads(texto)
+    except ValueError:
+        return texto
+
+
+def _cliente(argumentos):
+    import json
+
+    from servicio_iot import ClienteIoT
+
+    args = [_valor_argumento(texto) for texto in argumentos.args]
+    kwargs = {}
+    for par in argumentos.kwarg:
+        nombre, _, texto = par.partition("=")
+        kwargs[nombre] = _valor_argumento(texto)
+    try:
+        with ClienteIoT(argumentos.host, argumentos.puerto) as cliente:
+            if argumentos.metodo == "detener":
+                cliente.detener_servicio()
+                return 0
+            resultado = cliente.llamar(argumentos.metodo, *args, **kwargs)
+    except OSError as error:
+        print(f"❌ Error: No se pudo conectar con el servicio: {error}", file=sys.stderr)
+        return 1
+    except RuntimeError as error:
+        print(f"❌ Error: {error}", file=sys.stderr)
+        return 1
+    print(json.dumps(resultado, ensure_ascii=False, indent=2))
+    return 0
+
+
+def crear_parser():
+    """Construye el parser con todos los subcomandos"""
+    parser = argparse.ArgumentParser(prog="iot_cli", description="Programas IoT de la práctica")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+
+    subcomandos.add_parser("dispositivo", help="Control de dispositivos del hogar").set_defaults(funcion=_dispositivo)
+    subcomandos.add_parser("sensores", help="Lecturas simuladas de temperatura y humedad").set_defaults(
+        funcion=_sensores)
+    subcomandos.add_parser("temperatura", help="Comprobación de rango seguro de temperatura").set_defaults(
+        funcion=_temperatura)
+    subcomandos.add_parser("registro", help="Registro de dispositivos IoT (programa 4)").set_defaults(
+        funcion=_registro)
+    subcomandos.add_parser("analizador", help="Analizador de datos de sensores (programa 5)").set_defaults(
+        funcion=_analizador)
+
+    adquisicion = subcomandos.add_parser("adquisicion", help="Adquisición asíncrona de sensores simulados")
+    adquisicion.add_argument("--sensores", type=int, default=5)
+    adquisicion.add_argument("--muestras", type=int, default=5)
+    adquisicion.set_defaults(funcion=_adquisicion)
+
+    distribuido = subcomandos.add_parser("distribuido", help="Demostración de resúmenes de varios nodos")
+    distribuido.add_argument("--nodos", type=int, default=4)
+    distribuido.add_argument("--lecturas", type=int, default=50000, help="Lecturas por nodo")
+    distribuido.set_defaults(funcion=_distribuido)
+
+    # Las opciones del benchmark se pasan tal cual a benchmark_iot.main (ver main)
+    subcomandos.add_parser("benchmark", help="Benchmark de rendimiento (opciones de benchmark_iot)",
+                           add_help=False).set_defaults(funcion=_benchmark)
+
+    daemon = subcomandos.add_parser("daemon", help="Mantiene el analizador y el registro cargados")
+    daemon.add_argument("--host", default="127.0.0.1")
+    daemon.add_argument("--puerto", type=int, default=PUERTO_SERVICIO)
+    daemon.add_argument("--registro-sqlite", help="Base SQLite del registro de dispositivos")
+    daemon.add_argument("--registro-lecturas", help="Registro binario de lecturas del analizador")
+    daemon.set_defaults(funcion=_daemon)
+
+    cliente = subcomandos.add_parser("cliente", help="Llama a un método del servicio en ejecución")
+    cliente.add_argument("metodo", help="Método del analizador o del registro, 'ping' o 'detener'")
+    cliente.add_argument("args", nargs="*", help="Argumentos (JSON o texto)")
+    cliente.add_argument("--kwarg", action="append", default=[], metavar="NOMBRE=VALOR",
+                         help="Argumento por nombre (se puede repetir)")
+    cliente.add_argument("--host", default="127.0.0.1")
+    cliente.add_argument("--puerto", type=int, default=PUERTO_SERVICIO)
+    cliente.set_defaults(funcion=_cliente)
+    return parser
+
+
+def main(argv=None):
+    parser = crear_parser()
+    argumentos, resto = parser.parse_known_args(argv)
+    if argumentos.comando == "benchmark":
+        argumentos.opciones = resto
+    elif resto:
+        parser.error(f"argumentos no reconocidos: {' '.join(resto)}")
+    return argumentos.funcion(argumentos) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
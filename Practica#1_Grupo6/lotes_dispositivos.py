@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+IMPORTACIÓN Y EXPORTACIÓN POR LOTES DE DISPOSITIVOS IoT
+Lectura y escritura en streaming de inventarios en CSV o JSON Lines
+"""
+
+import csv
+import json
+from datetime import date, datetime
+from itertools import islice
+
+CAMPOS_EXPORTACION = ["ID", "tipo", "ubicación", "estado", "último_mantenimiento"]
+ESTADOS_VALIDOS = ("activo", "inactivo")  # Estados conocidos; se aceptan otros textos (p. ej. "mantenimiento")
+SIN_FECHA = "N/A"  # Mantenimiento desconocido
+
+# Nombres de columna aceptados al importar -> campo del registro
+ALIAS_CAMPOS = {
+    "id": "ID", "ID": "ID",
+    "tipo": "tipo",
+    "ubicacion": "ubicación", "ubicación": "ubicación",
+    "estado": "estado",
+    "mantenimiento": "último_mantenimiento",
+    "ultimo_mantenimiento": "último_mantenimiento",
+    "último_mantenimiento": "último_mantenimiento"
+}
+
+
+class FilaInvalida(ValueError):
+    """Línea que no se pudo decodificar; conserva su número de línea en el origen"""
+
+    def __init__(self, motivo: str, linea: int = None):
+        super().__init__(motivo)
+        self.linea = linea
+
+
+def detectar_formato(ruta, formato: str = None):
+    """
+    Determina el formato ('csv' o 'jsonl') a partir del argumento o de la extensión
+
+    Args:
+        ruta: Ruta del archivo u otro origen/destino
+        formato (str): Formato explícito (opcional)
+    """
+    if formato is None:
+        formato = "jsonl" if isinstance(ruta, str) and ruta.lower().endswith((".jsonl", ".json")) else "csv"
+    if formato not in ("csv", "jsonl"):
+        raise ValueError(f"Formato no soportado: {formato}")
+    return formato
+
+
+def leer_filas(origen, formato: str = None):
+    """
+    Recorre las filas de un origen sin cargarlo completo en memoria
+
+    Args:
+        origen: Ruta de archivo, objeto archivo, iterable de líneas de texto
+                o iterable de diccionarios ya decodificados
+        formato (str): 'csv' o 'jsonl' (opcional, se deduce de la extensión)
+
+    Yields:
+        Diccionarios con las columnas de cada fila, o un FilaInvalida si la
+        línea no se pudo decodificar (para reportarlo sin detener la carga)
+    """
+    formato = detectar_formato(origen, formato)
+
+    if isinstance(origen, str):
+        with open(origen, "r", encoding="utf-8", newline="") as archivo:
+            yield from leer_filas(archivo, formato)
+        return
+
+    if formato == "csv":
+        lineas = iter(origen)
+        primera = next(lineas, None)
+        if primera is None:
+            return
+        if isinstance(primera, dict):
+            yield primera
+            yield from lineas
+            return
+        yield from _filas_csv(_encadenar(primera, lineas))
+        return
+
+    for numero_linea, linea in enumerate(origen, 1):
+        if isinstance(linea, dict):
+            yield linea
+            continue
+        linea = linea.strip()
+        if not linea:
+            continue
+        try:
+            yield json.loads(linea)
+        except ValueError:
+            yield FilaInvalida("JSON inválido", numero_linea)
+
+
+def _filas_csv(lineas):
+    """
+    Como csv.DictReader, pero una fila que el módulo csv no puede leer (campo
+    demasiado largo, salto de línea suelto, NUL en versiones antiguas de Python)
+    se entrega como FilaInvalida y la lectura continúa con la siguiente
+    """
+    lector = csv.reader(lineas)
+    campos = None
+    while True:
+        try:
+            valores = next(lector)
+        except StopIteration:
+            return
+        except csv.Error:
+            yield FilaInvalida("CSV inválido", lector.line_num)
+            continue
+        if not valores:
+            continue  # Filas vacías, igual que DictReader
+        if campos is None:
+            campos = valores
+            continue
+        yield dict(zip(campos, valores))
+
+
+def _encadenar(primera, resto):
+    """Vuelve a anteponer la primera línea ya consumida"""
+    yield primera
+    yield from resto
+
+
+def normalizar_estado(estado: str):
+    """
+    Pasa a minúsculas los estados conocidos ("ACTIVO" -> "activo") y deja
+    cualquier otro estado tal cual
+
+    Args:
+        estado (str): Estado indicado por el usuario o el archivo
+    """
+    minusculas = estado.lower()
+    return minusculas if minusculas in ESTADOS_VALIDOS else estado
+
+
+def normalizar_fecha(fecha):
+    """
+    Convierte una fecha de mantenimiento a ISO-8601 (AAAA-MM-DD), el único formato
+    que se puede comparar como texto; SIN_FECHA se deja tal cual
+
+    Args:
+        fecha: Texto ISO ("2024-03-05" o "20240305"), date/datetime o SIN_FECHA
+
+    Raises:
+        ValueError: Si la fecha no es ISO-8601 (p. ej. "5/3/2024", que es ambigua, o "")
+    """
+    if fecha == SIN_FECHA:
+        return SIN_FECHA
+    if isinstance(fecha, datetime):
+        return fecha.date().isoformat()
+    if isinstance(fecha, date):
+        return fecha.isoformat()
+    try:
+        return date.fromisoformat(fecha).isoformat()
+    except (TypeError, ValueError):
+        raise ValueError(f"Fecha de mantenimiento inválida: {fecha!r} "
+                         f"(se espera AAAA-MM-DD o '{SIN_FECHA}')") from None
+
+
+def normalizar_fila(fila: dict):
+    """
+    Valida una fila y la convierte en diccionario de dispositivo
+
+    Args:
+        fila (dict): Columnas de la fila (se aceptan los alias de ALIAS_CAMPOS)
+
+    Raises:
+        ValueError: Si falta un campo obligatorio o la fecha no es ISO-8601
+    """
+    if not isinstance(fila, dict):
+        raise ValueError("Fila con formato inválido")
+
+    dispositivo = {"estado": "activo", "último_mantenimiento": SIN_FECHA}
+    for clave, valor in fila.items():
+        campo = ALIAS_CAMPOS.get(clave)
+        if campo is not None and valor not in (None, ""):
+            dispositivo[campo] = str(valor).strip()
+
+    for campo in ("ID", "tipo", "ubicación"):
+        if not dispositivo.get(campo):
+            raise ValueError(f"Falta el campo obligatorio '{campo}'")
+
+    dispositivo["estado"] = normalizar_estado(dispositivo["estado"])
+    try:
+        dispositivo["último_mantenimiento"] = normalizar_fecha(dispositivo["último_mantenimiento"])
+    except ValueError:
+        raise ValueError("Fecha de mantenimiento inválida") from None  # Motivo común para el resumen
+    return {campo: dispositivo[campo] for campo in CAMPOS_EXPORTACION}
+
+
+def en_lotes(iterable, tamano_lote: int):
+    """Agrupa un iterable en listas de hasta tamano_lote elementos"""
+    iterador = iter(iterable)
+    while True:
+        lote = list(islice(iterador, tamano_lote))
+        if not lote:
+            return
+        yield lote
+
+
+def escribir_dispositivos(dispositivos, destino, formato: str = None):
+    """
+    Escribe dispositivos en streaming como CSV o JSON Lines
+
+    Args:
+        dispositivos: Iterable de diccionarios de dispositivo
+        destino: Ruta de archivo u objeto archivo de texto
+        formato (str): 'csv' o 'jsonl' (opcional, se deduce de la extensión)
+
+    Returns:
+        Cantidad de dispositivos escritos
+    """
+    formato = detectar_formato(destino, formato)
+
+    if isinstance(destino, str):
+        with open(destino, "w", encoding="utf-8", newline="") as archivo:
+            return escribir_dispositivos(dispositivos, archivo, formato)
+
+    escritos = 0
+    if formato == "csv":
+        escritor = csv.DictWriter(destino, fieldnames=CAMPOS_EXPORTACION, extrasaction="ignore")
+        escritor.writeheader()
+        for lote in en_lotes(dispositivos, 10000):
+            escritor.writerows(lote)
+            escritos += len(lote)
+        return escritos
+
+    for lote in en_lotes(dispositivos, 10000):
+        destino.write("".join(json.dumps({campo: d[campo] for campo in CAMPOS_EXPORTACION},
+                                         ensure_ascii=False) + "\n" for d in lote))
+        escritos += len(lote)
+    return escritos
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+MÉTRICAS DEL ANALIZADOR
+Instrumentación opcional de AnalizadorSensores: contadores y histogramas de latencia
+por método, tasa de ingesta y lecturas por tipo de sensor. Se consultan con una
+instantánea (diccionario) o en formato de texto Prometheus por HTTP local.
+Solo se envuelven los métodos de la instancia al activar las métricas, así que un
+analizador sin métricas ejecuta exactamente el mismo código que antes.
+"""
+
+import functools
+import json
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from tiempo_lecturas import NS_POR_SEGUNDO
+
+# Métodos públicos que se miden
+METODOS_INSTRUMENTADOS = (
+    "agregar_lectura",
+    "agregar_lote",
+    "calcular_estadisticas",
+    "detectar_valores_atipicos",
+    "verificar_umbrales_seguros",
+    "generar_reporte_completo"
+)
+
+# Límites superiores (segundos) de las cubetas de latencia
+CUBETAS_LATENCIA = (0.000001, 0.000005, 0.00001, 0.00005, 0.0001, 0.0005,
+                    0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+PUERTO_METRICAS = 9108
+
+
+class HistogramaLatencia:
+    """Contador de llamadas, errores y latencias agrupadas en cubetas fijas"""
+
+    __slots__ = ("limites_ns", "cubetas", "cantidad", "suma_ns", "errores")
+
+    def __init__(self, limites=CUBETAS_LATENCIA):
+        self.limites_ns = [int(limite * NS_POR_SEGUNDO) for limite in limites]
+        self.cubetas = [0] * (len(self.limites_ns) + 1)  # La última es +Inf
+        self.cantidad = 0
+        self.suma_ns = 0
+        self.errores = 0
+
+    def observar(self, duracion_ns: int):
+        self.cubetas[bisect_left(self.limites_ns, duracion_ns)] += 1
+        self.cantidad += 1
+        self.suma_ns += duracion_ns
+
+    def percentil(self, p: float):
+        """Límite superior (segundos) de la cubeta que contiene el percentil p (0-100)"""
+        if not self.cantidad:
+            return None
+        objetivo = p / 100 * self.cantidad
+        acumulado = 0
+        for i, cuenta in enumerate(self.cubetas):
+            acumulado += cuenta
+            if acumulado >= objetivo:
+                return self.limites_ns[i] / NS_POR_SEGUNDO if i < len(self.limites_ns) else float("inf")
+        return float("inf")
+
+
+class MetricasAnalizador:
+    def __init__(self, limites=CUBETAS_LATENCIA):
+        """
+        Métricas de un AnalizadorSensores (ver instrumentar)
+
+        Args:
+            limites: Límites superiores en segundos de las cubetas de latencia
+        """
+        self.limites = tuple(limites)
+        self.metodos = {metodo: HistogramaLatencia(self.limites) for metodo in METODOS_INSTRUMENTADOS}
+        self.lecturas_ingresadas = 0
+        self.analizador = None
+        self.inicio = time.monotonic()
+        self._referencia_tasa = (self.inicio, 0)
+        self._tasa = 0.0
+        self._cerrojo = threading.Lock()
+
+    def tasa_ingesta(self, intervalo_minimo: float = 1.0):
+        """
+        Lecturas por segundo desde la medición anterior (se actualiza como mucho
+        una vez por intervalo_minimo segundos)
+        """
+        with self._cerrojo:
+            ahora = time.monotonic()
+            instante, lecturas = self._referencia_tasa
+            if ahora - instante >= intervalo_minimo:
+                self._tasa = (self.lecturas_ingresadas - lecturas) / (ahora - instante)
+                self._referencia_tasa = (ahora, self.lecturas_ingresadas)
+            return self._tasa
+
+    def lecturas_por_tipo(self):
+        """Cardinalidad por tipo de sensor (lecturas almacenadas de cada tipo)"""
+        if self.analizador is None:
+            return {}
+        almacen = self.analizador.almacen
+        return {tipo: len(almacen.columna(tipo)) for tipo in almacen.tipos_registrados()}
+
+    def instantanea(self):
+        """
+        Devuelve el estado actual de las métricas
+
+        Returns:
+            Diccionario con 'metodos' (llamadas, errores, latencias), 'lecturas_ingresadas',
+            'tasa_ingesta', 'lecturas_por_tipo' y 'segundos_activo'
+        """
+        metodos = {}
+        for metodo, histograma in self.metodos.items():
+            metodos[metodo] = {
+                "llamadas": histograma.cantidad,
+                "errores": histograma.errores,
+                "latencia_total_s": histograma.suma_ns / NS_POR_SEGUNDO,
+                "latencia_media_s": (histograma.suma_ns / histograma.cantidad / NS_POR_SEGUNDO
+                                     if histograma.cantidad else None),
+                "latencia_p50_s": histograma.percentil(50),
+                "latencia_p99_s": histograma.percentil(99),
+                "cubetas": dict(zip([*map(str, self.limites), "+Inf"], histograma.cubetas))
+            }
+        return {
+            "metodos": metodos,
+            "lecturas_ingresadas": self.lecturas_ingresadas,
+            "tasa_ingesta": self.tasa_ingesta(),
+            "lecturas_por_tipo": self.lecturas_por_tipo(),
+            "segundos_activo": time.monotonic() - self.inicio
+        }
+
+    def exportar_prometheus(self):
+        """Devuelve las métricas en el formato de texto de Prometheus"""
+        lineas = [
+            "# HELP analizador_llamadas_total Llamadas a cada método del analizador",
+            "# TYPE analizador_llamadas_total counter"
+        ]
+        for metodo, histograma in self.metodos.items():
+            lineas.append(f'analizador_llamadas_total{{metodo="{metodo}"}} {histograma.cantidad}')
+        lineas += [
+            "# HELP analizador_errores_total Llamadas que terminaron con excepción",
+            "# TYPE analizador_errores_total counter"
+        ]
+        for metodo, histograma in self.metodos.items():
+            lineas.append(f'analizador_errores_total{{metodo="{metodo}"}} {histograma.errores}')
+        lineas += [
+            "# HELP analizador_latencia_segundos Latencia de cada método del analizador",
+            "# TYPE analizador_latencia_segundos histogram"
+        ]
+        for metodo, histograma in self.metodos.items():
+            acumulado = 0
+            for limite, cuenta in zip([*map(repr, self.limites), "+Inf"], histograma.cubetas):
+                acumulado += cuenta
+                lineas.append(f'analizador_latencia_segundos_bucket{{metodo="{metodo}",le="{limite}"}} {acumulado}')
+            lineas.append(f'analizador_latencia_segundos_sum{{metodo="{metodo}"}} '
+                          f'{histograma.suma_ns / NS_POR_SEGUNDO!r}')
+            lineas.append(f'analizador_latencia_segundos_count{{metodo="{metodo}"}} {histograma.cantidad}')
+        lineas += [
+            "# HELP analizador_lecturas_ingresadas_total Lecturas ingresadas desde que se activaron las métricas",
+            "# TYPE analizador_lecturas_ingresadas_total counter",
+            f"analizador_lecturas_ingresadas_total {self.lecturas_ingresadas}",
+            "# HELP analizador_tasa_ingesta Lecturas por segundo desde la medición anterior",
+            "# TYPE analizador_tasa_ingesta gauge",
+            f"analizador_tasa_ingesta {self.tasa_ingesta()!r}",
+            "# HELP analizador_lecturas_por_tipo Lecturas almacenadas por tipo de sensor",
+            "# TYPE analizador_lecturas_por_tipo gauge"
+        ]
+        for tipo, cantidad in self.lecturas_por_tipo().items():
+            tipo = tipo.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            lineas.append(f'analizador_lecturas_por_tipo{{tipo="{tipo}"}} {cantidad}')
+        return "\n".join(lineas) + "\n"
+
+
+def _envolver(metodo, histograma: HistogramaLatencia, contar_lecturas=None):
+    """Devuelve el método medido; contar_lecturas(args, resultado) suma lecturas ingresadas"""
+    reloj = time.perf_counter_ns
+
+    @functools.wraps(metodo)
+    def medido(*args, **kwargs):
+        inicio = reloj()
+        try:
+            resultado = metodo(*args, **kwargs)
+        except Exception:
+            histograma.errores += 1
+            raise
+        finally:
+            histograma.observar(reloj() - inicio)
+        if contar_lecturas is not None:
+            contar_lecturas(resultado)
+        return resultado
+    return medido
+
+
+def instrumentar(analizador, metricas: MetricasAnalizador = None):
+    """
+    Envuelve los métodos públicos de un analizador para medirlos
+
+    Args:
+        analizador (AnalizadorSensores): Analizador a instrumentar
+        metricas (MetricasAnalizador): Métricas donde acumular (por defecto unas nuevas)
+
+    Returns:
+        MetricasAnalizador con las mediciones
+    """
+    desinstrumentar(analizador)
+    metricas = metricas or MetricasAnalizador()
+    metricas.analizador = analizador
+
+    def contar_una(_):
+        metricas.lecturas_ingresadas += 1
+
+    def contar_lote(cantidad):
+        metricas.lecturas_ingresadas += cantidad
+
+    contadores = {"agregar_lectura": contar_una, "agregar_lote": contar_lote}
+    for nombre in METODOS_INSTRUMENTADOS:
+        metodo = getattr(analizador, nombre)
+        # El atributo de instancia oculta el método de la clase
+        setattr(analizador, nombre, _envolver(metodo, metricas.metodos[nombre], contadores.get(nombre)))
+    return metricas
+
+
+def desinstrumentar(analizador):
+    """Quita los métodos medidos de la instancia y vuelve a los de la clase"""
+    for nombre in METODOS_INSTRUMENTADOS:
+        analizador.__dict__.pop(nombre, None)
+
+
+class ServidorMetricas:
+    def __init__(self, metricas: MetricasAnalizador, host: str = "127.0.0.1", puerto: int = PUERTO_METRICAS):
+        """
+        Servidor HTTP local que publica las métricas en /metrics (texto Prometheus)
+        y /instantanea (JSON) desde un hilo en segundo plano
+
+        Args:
+            metricas (MetricasAnalizador): Métricas a publicar
+            host (str): Dirección de escucha (por defecto solo local)
+            puerto (int): Puerto TCP (0 elige uno libre)
+        """
+        self.metricas = metricas
+        servidor_metricas = self
+
+        class Manejador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                ruta = self.path.split("?", 1)[0]
+                if ruta == "/metrics":
+                    cuerpo = servidor_metricas.metricas.exportar_prometheus().encode("utf-8")
+                    tipo = "text/plain; version=0.0.4; charset=utf-8"
+                elif ruta == "/instantanea":
+                    cuerpo = json.dumps(servidor_metricas.metricas.instantanea()).encode("utf-8")
+                    tipo = "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", tipo)
+                self.send_header("Content-Length", str(len(cuerpo)))
+                self.end_headers()
+                self.wfile.write(cuerpo)
+
+            def log_message(self, formato, *args):
+                pass  # Sin mensajes por cada consulta
+
+        self._servidor = ThreadingHTTPServer((host, puerto), Manejador)
+        self._servidor.daemon_threads = True
+        self._hilo = None
+
+    @property
+    def direccion(self):
+        """(host, puerto) en el que escucha el servidor"""
+        return self._servidor.server_address[:2]
+
+    def iniciar(self):
+        """Empieza a atender consultas en un hilo demonio"""
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=self._servidor.serve_forever, name="servidor-metricas", daemon=True)
+            self._hilo.start()
+        return self
+
+    def detener(self):
+        """Detiene el servidor y libera el puerto"""
+        if self._hilo is not None:
+            self._servidor.shutdown()
+            self._hilo.join()
+            self._hilo = None
+        self._servidor.server_close()
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+MOTOR DE DETECCIÓN DE VALORES ATÍPICOS
+Calcula los límites una sola vez por tipo de sensor y devuelve los
+atípicos como arreglos compactos de índices sobre las columnas del almacén
+Métodos: rango intercuartílico (iqr), puntuación z (zscore) y desviación absoluta mediana (mad)
+"""
+
+import math
+from array import array
+
+# Umbral por defecto de cada método
+UMBRALES_METODO = {
+    "iqr": 1.5,     # Múltiplos del rango intercuartílico
+    "zscore": 3.0,  # Desviaciones estándar desde la media
+    "mad": 3.5      # Puntuación z modificada (Iglewicz y Hoaglin)
+}
+
+MINIMO_LECTURAS = 3  # No se pueden detectar atípicos con pocos datos
+
+
+def cuartiles(ordenados):
+    """
+    Primer y tercer cuartil de datos ya ordenados.
+    Equivale a statistics.quantiles(valores, n=4) con el método 'exclusive'.
+
+    Args:
+        ordenados: Secuencia ordenada con al menos dos valores
+    """
+    n = len(ordenados)
+    m = n + 1
+    resultado = []
+    for i in (1, 3):
+        j = min(max(i * m // 4, 1), n - 1)  # Acotar como statistics.quantiles en los extremos
+        delta = i * m - j * 4
+        resultado.append((ordenados[j - 1] * (4 - delta) + ordenados[j] * delta) / 4)
+    return resultado[0], resultado[1]
+
+
+def mediana_ordenada(ordenados):
+    """Mediana de datos ya ordenados"""
+    n = len(ordenados)
+    mitad = n // 2
+    if n % 2:
+        return ordenados[mitad]
+    return (ordenados[mitad - 1] + ordenados[mitad]) / 2
+
+
+class ResultadoAtipicos:
+    """Resultado compacto de la detección para un tipo de sensor"""
+
+    __slots__ = ("tipo", "metodo", "indices", "limite_inferior", "limite_superior", "media")
+
+    def __init__(self, tipo, metodo, indices, limite_inferior, limite_superior, media):
+        self.tipo = tipo
+        self.metodo = metodo
+        self.indices = indices                  # array('q') de posiciones en la columna
+        self.limite_inferior = limite_inferior
+        self.limite_superior = limite_superior
+        self.media = media                      # Para calcular la desviación de cada atípico
+
+    def __len__(self):
+        return len(self.indices)
+
+
+def calcular_limites(valores, metodo: str = "iqr", umbral: float = None):
+    """
+    Calcula los límites inferior y superior fuera de los cuales un valor es atípico
+
+    Args:
+        valores: Secuencia de valores (lista, array o memoryview)
+        metodo (str): 'iqr', 'zscore' o 'mad'
+        umbral (float): Umbral del método (opcional, ver UMBRALES_METODO)
+
+    Returns:
+        Tupla (limite_inferior, limite_superior, media) o None si hay pocos datos
+    """
+    if metodo not in UMBRALES_METODO:
+        raise ValueError(f"Método de detección desconocido: {metodo}")
+    if umbral is None:
+        umbral = UMBRALES_METODO[metodo]
+
+    n = len(valores)
+    if n < MINIMO_LECTURAS:
+        return None
+
+    media = math.fsum(valores) / n
+
+    if metodo == "zscore":
+        desviacion = math.sqrt(math.fsum((v - media) ** 2 for v in valores) / (n - 1))
+        return media - umbral * desviacion, media + umbral * desviacion, media
+
+    ordenados = sorted(valores)  # Única ordenación de la columna
+
+    if metodo == "iqr":
+        q1, q3 = cuartiles(ordenados)
+        iqr = q3 - q1
+        return q1 - umbral * iqr, q3 + umbral * iqr, media
+
+    # Método MAD: |v - mediana| / (1.4826 * MAD) > umbral
+    mediana = mediana_ordenada(ordenados)
+    desviaciones = sorted(abs(v - mediana) for v in ordenados)
+    mad = mediana_ordenada(desviaciones)
+    if mad > 0:
+        margen = umbral * 1.4826 * mad
+    else:
+        # Más de la mitad de los valores son iguales a la mediana: con MAD = 0 se
+        # marcaría cualquier otro valor, así que se usa la desviación absoluta media
+        # (1.2533 * DAM, Iglewicz y Hoaglin); si también es 0 no hay atípicos
+        margen = umbral * 1.2533 * math.fsum(desviaciones) / n
+    return mediana - margen, mediana + margen, media
+
+
+def indices_fuera_de_limites(valores, limite_inferior: float, limite_superior: float):
+    """
+    Devuelve las posiciones de los valores fuera de [limite_inferior, limite_superior]
+
+    Args:
+        valores: Secuencia de valores
+        limite_inferior (float): Límite inferior
+        limite_superior (float): Límite superior
+    """
+    return array('q', [i for i, v in enumerate(valores)
+                       if v < limite_inferior or v > limite_superior])
+
+
+def detectar_atipicos_lote(almacen, metodo: str = "iqr", umbral: float = None, tipos=None):
+    """
+    Detecta atípicos de todos los tipos de sensor (o de los indicados) de una vez
+
+    Args:
+        almacen (AlmacenColumnar): Almacén con las columnas de lecturas
+        metodo (str): 'iqr', 'zscore' o 'mad'
+        umbral (float): Umbral del método (opcional)
+        tipos: Tipos de sensor a analizar (opcional, por defecto todos)
+
+    Returns:
+        Diccionario tipo -> ResultadoAtipicos (solo tipos con datos suficientes)
+    """
+    if tipos is None:
+        tipos = almacen.tipos_registrados()
+
+    resultados = {}
+    for tipo in tipos:
+        columna = almacen.columna(tipo)
+        if columna is None:
+            continue
+        limites = calcular_limites(columna.valores, metodo, umbral)
+        if limites is None:
+            continue
+        inferior, superior, media = limites
+        indices = indices_fuera_de_limites(columna.valores, inferior, superior)
+        resultados[tipo] = ResultadoAtipicos(tipo, metodo, indices, inferior, superior, media)
+    return resultados
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+MOTOR DE REGLAS PARA CONTROL DE DISPOSITIVOS
+Reglas declarativas (umbrales, rangos, horarios e histéresis) que se compilan una
+vez y se evalúan sobre lotes columnares de lecturas de muchos dispositivos,
+generando comandos para los actuadores del RegistroDispositivosIoT.
+Una lectura ausente (None) nunca cumple una condición; las histéresis mantienen
+el último estado del dispositivo.
+"""
+
+import operator
+
+_COMPARACIONES = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le
+}
+
+
+class Umbral:
+    """Condición `campo <operador> valor` (operador: >, >=, <, <=)"""
+
+    def __init__(self, campo: str, operador: str, valor: float):
+        if operador not in _COMPARACIONES:
+            raise ValueError(f"Operador no soportado: {operador}")
+        self.campo = campo
+        self.operador = operador
+        self.valor = float(valor)
+
+    def compilar(self):
+        comparar, campo, valor = _COMPARACIONES[self.operador], self.campo, self.valor
+        return lambda lote: [v is not None and comparar(v, valor) for v in lote[campo]]
+
+
+class Rango:
+    """Condición `minimo <= campo <= maximo`"""
+
+    def __init__(self, campo: str, minimo: float, maximo: float):
+        self.campo = campo
+        self.minimo = float(minimo)
+        self.maximo = float(maximo)
+
+    def compilar(self):
+        campo, minimo, maximo = self.campo, self.minimo, self.maximo
+        return lambda lote: [v is not None and minimo <= v <= maximo for v in lote[campo]]
+
+
+class Horario:
+    """Condición sobre la hora del día: desde <= hora < hasta (admite cruzar medianoche)"""
+
+    def __init__(self, desde: int, hasta: int, campo: str = "hora"):
+        self.desde = desde
+        self.hasta = hasta
+        self.campo = campo
+
+    def compilar(self):
+        # Tabla precalculada de las 24 horas
+        if self.desde <= self.hasta:
+            tabla = [self.desde <= h < self.hasta for h in range(24)]
+        else:
+            tabla = [h >= self.desde or h < self.hasta for h in range(24)]
+        campo = self.campo
+        return lambda lote: [h is not None and tabla[int(h) % 24] for h in lote[campo]]
+
+
+class Histeresis:
+    """
+    Condición con memoria por dispositivo: se activa al cruzar `activar` y solo se
+    desactiva al cruzar `desactivar`. Si activar > desactivar actúa sobre valores altos
+    (p. ej. ventilador); si activar < desactivar, sobre valores bajos (humidificador).
+    """
+
+    def __init__(self, campo: str, activar: float, desactivar: float):
+        self.campo = campo
+        self.activar = float(activar)
+        self.desactivar = float(desactivar)
+
+    def compilar(self):
+        campo, activar, desactivar = self.campo, self.activar, self.desactivar
+        estados = {}  # clave de dispositivo -> último estado
+        alto = activar > desactivar
+
+        def evaluar(lote):
+            resultado = []
+            for clave, v in zip(lote["dispositivo"], lote[campo]):
+                if v is None:
+                    estado = estados.get(clave, False)
+                elif (v > activar) if alto else (v < activar):
+                    estado = True
+                elif (v < desactivar) if alto else (v > desactivar):
+                    estado = False
+                else:
+                    estado = estados.get(clave, False)
+                estados[clave] = estado
+                resultado.append(estado)
+            return resultado
+        return evaluar
+
+
+class Y:
+    """Conjunción de condiciones"""
+
+    def __init__(self, *condiciones):
+        self.condiciones = condiciones
+
+    def compilar(self):
+        compiladas = [c.compilar() for c in self.condiciones]
+
+        def evaluar(lote):
+            mascara = compiladas[0](lote)
+            for condicion in compiladas[1:]:
+                mascara = list(map(operator.and_, mascara, condicion(lote)))
+            return mascara
+        return evaluar
+
+
+class No:
+    """Negación de una condición"""
+
+    def __init__(self, condicion):
+        self.condicion = condicion
+
+    def compilar(self):
+        condicion = self.condicion.compilar()
+        return lambda lote: list(map(operator.not_, condicion(lote)))
+
+
+class Regla:
+    def __init__(self, actuador: str, condicion, nombre: str = None):
+        """
+        Regla que enciende un tipo de actuador cuando se cumple la condición y lo apaga si no
+
+        Args:
+            actuador (str): Tipo de dispositivo actuador (ventilador, humidificador, ...)
+            condicion: Umbral, Rango, Horario, Histeresis, Y o No
+            nombre (str): Nombre descriptivo (opcional)
+        """
+        self.actuador = actuador
+        self.condicion = condicion
+        self.nombre = nombre or actuador
+
+
+class MotorReglas:
+    def __init__(self, reglas):
+        """
+        Compila las reglas una sola vez
+
+        Args:
+            reglas: Lista de Regla
+        """
+        self.reglas = list(reglas)
+        self._compiladas = [(regla, regla.condicion.compilar()) for regla in self.reglas]
+
+    def evaluar(self, lote: dict):
+        """
+        Evalúa todas las reglas sobre un lote columnar
+
+        Args:
+            lote (dict): Columnas de igual longitud: 'dispositivo' (clave de cada fila)
+                         y los campos que usen las reglas (temperatura, humedad, hora, ...)
+
+        Returns:
+            Diccionario nombre de regla -> lista de bool (una por fila)
+        """
+        return {regla.nombre: condicion(lote) for regla, condicion in self._compiladas}
+
+    def comandos(self, registro, lote: dict):
+        """
+        Traduce el lote en comandos de estado para los actuadores del registro.
+        Cada fila debe indicar su 'ubicacion'; se controlan los actuadores de ese
+        tipo en esa ubicación. Si varias filas afectan al mismo actuador, gana la última.
+
+        Args:
+            registro (RegistroDispositivosIoT): Registro con los actuadores
+            lote (dict): Lote columnar con la columna 'ubicacion'
+
+        Returns:
+            Diccionario ID de actuador -> 'activo' / 'inactivo'
+        """
+        ordenes = {}
+        actuadores_por_ubicacion = {}
+        ubicaciones = lote["ubicacion"]
+        for regla, condicion in self._compiladas:
+            for ubicacion, encender in zip(ubicaciones, condicion(lote)):
+                actuadores = actuadores_por_ubicacion.get(ubicacion)
+                if actuadores is None:
+                    actuadores = {}
+                    for dispositivo in registro.buscar_por_ubicacion(ubicacion):
+                        actuadores.setdefault(dispositivo["tipo"], []).append(dispositivo["ID"])
+                    actuadores_por_ubicacion[ubicacion] = actuadores
+                estado = "activo" if encender else "inactivo"
+                for id_actuador in actuadores.get(regla.actuador, ()):
+                    ordenes[id_actuador] = estado
+        return ordenes
+
+    def aplicar(self, registro, lote: dict):
+        """
+        Evalúa el lote y actualiza en el registro solo los actuadores que cambian de estado
+
+        Returns:
+            Diccionario ID de actuador -> nuevo estado (solo los cambios)
+        """
+        cambios = {}
+        for id_actuador, estado in self.comandos(registro, lote).items():
+            dispositivo = registro.obtener_dispositivo(id_actuador)
+            if dispositivo is not None and dispositivo["estado"] != estado:
+                registro.actualizar_estado(id_actuador, estado)
+                cambios[id_actuador] = estado
+        return cambios
+
+
+# Reglas de control del programa dispositivo_iot.py
+REGLAS_CONTROL_HOGAR = [
+    Regla("ventilador", Umbral("temperatura", ">", 28)),
+    Regla("humidificador", Umbral("humedad", "<", 40)),
+    Regla("luz_inteligente", Horario(18, 24))
+]
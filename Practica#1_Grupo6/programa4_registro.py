@@ -1,193 +1,370 @@
-# -*- coding: utf-8 -*-
-"""
-SISTEMA DE REGISTRO DE DISPOSITIVOS IoT - PROGRAMA 4
-Registra y gestiona dispositivos IoT usando diccionarios
-Paleta de colores morada: #4B0082, #800080, #9370DB, #D8BFD8
-"""
-
-class RegistroDispositivosIoT:
-    def __init__(self):
-        """Inicializa el sistema de registro de dispositivos"""
-        self.dispositivos = []  # Lista de diccionarios con dispositivos
-        self.colores = {
-            'titulo': '\033[95m',      # Morado claro
-            'normal': '\033[0m',       # Reset color
-            'activo': '\033[92m',      # Verde para activos
-            'inactivo': '\033[91m',    # Rojo para inactivos
-            'dato': '\033[94m',        # Azul morado
-            'busqueda': '\033[93m',    # Amarillo
-            'exito': '\033[96m'        # Cian
-        }
-    
-    def agregar_dispositivo(self, id: str, tipo: str, ubicacion: str, 
-                           estado: str = "activo", ultimo_mantenimiento: str = "N/A"):
-        """
-        Agrega un nuevo dispositivo al registro
-        
-        Args:
-            id (str): ID único del dispositivo
-            tipo (str): Tipo de dispositivo
-            ubicacion (str): Ubicación del dispositivo
-            estado (str): Estado (activo/inactivo)
-            ultimo_mantenimiento (str): Fecha último mantenimiento
-        """
-        # Verificar que el ID no exista ya
-        for dispositivo in self.dispositivos:
-            if dispositivo["ID"] == id:
-                print(f"{self.colores['inactivo']}❌ Error: El ID {id} ya existe{self.colores['normal']}")
-                return False
-        
-        # Crear diccionario con los datos del dispositivo
-        dispositivo = {
-            "ID": id,
-            "tipo": tipo,
-            "ubicación": ubicacion,
-            "estado": estado,
-            "último_mantenimiento": ultimo_mantenimiento
-        }
-        
-        # Agregar a la lista
-        self.dispositivos.append(dispositivo)
-        print(f"{self.colores['exito']}✅ Dispositivo {id} agregado correctamente{self.colores['normal']}")
-        return True
-    
-    def buscar_por_ubicacion(self, ubicacion: str):
-        """
-        Busca dispositivos por ubicación
-        
-        Args:
-            ubicacion (str): Ubicación a buscar
-        """
-        dispositivos_encontrados = []
-        
-        for dispositivo in self.dispositivos:
-            # Buscar coincidencia exacta (case insensitive)
-            if dispositivo["ubicación"].lower() == ubicacion.lower():
-                dispositivos_encontrados.append(dispositivo)
-        
-        return dispositivos_encontrados
-    
-    def actualizar_estado(self, id_dispositivo: str, nuevo_estado: str):
-        """
-        Actualiza el estado de un dispositivo
-        
-        Args:
-            id_dispositivo (str): ID del dispositivo
-            nuevo_estado (str): Nuevo estado (activo/inactivo)
-        """
-        for dispositivo in self.dispositivos:
-            if dispositivo["ID"] == id_dispositivo:
-                # Verificar que el nuevo estado sea válido
-                if nuevo_estado.lower() in ["activo", "inactivo"]:
-                    dispositivo["estado"] = nuevo_estado.lower()
-                    print(f"{self.colores['exito']}✅ Estado de {id_dispositivo} actualizado a {nuevo_estado}{self.colores['normal']}")
-                    return True
-                else:
-                    print(f"{self.colores['inactivo']}❌ Error: Estado debe ser 'activo' o 'inactivo'{self.colores['normal']}")
-                    return False
-        
-        print(f"{self.colores['inactivo']}❌ Error: Dispositivo {id_dispositivo} no encontrado{self.colores['normal']}")
-        return False
-    
-    def actualizar_mantenimiento(self, id_dispositivo: str, fecha_mantenimiento: str):
-        """
-        Actualiza la fecha de último mantenimiento
-        
-        Args:
-            id_dispositivo (str): ID del dispositivo
-            fecha_mantenimiento (str): Fecha del mantenimiento
-        """
-        for dispositivo in self.dispositivos:
-            if dispositivo["ID"] == id_dispositivo:
-                dispositivo["último_mantenimiento"] = fecha_mantenimiento
-                print(f"{self.colores['exito']}✅ Mantenimiento de {id_dispositivo} actualizado{self.colores['normal']}")
-                return True
-        
-        print(f"{self.colores['inactivo']}❌ Error: Dispositivo {id_dispositivo} no encontrado{self.colores['normal']}")
-        return False
-    
-    def mostrar_dispositivos(self, lista_dispositivos=None):
-        """
-        Muestra dispositivos en formato tabla
-        
-        Args:
-            lista_dispositivos: Lista específica de dispositivos (opcional)
-        """
-        if lista_dispositivos is None:
-            lista_dispositivos = self.dispositivos
-        
-        if not lista_dispositivos:
-            print(f"{self.colores['dato']}📭 No hay dispositivos para mostrar{self.colores['normal']}")
-            return
-        
-        print(f"\n{self.colores['titulo']}{'='*80}")
-        print("                          DISPOSITIVOS REGISTRADOS")
-        print(f"{'='*80}{self.colores['normal']}")
-        
-        print(f"{self.colores['dato']}{'ID':<10} {'TIPO':<20} {'UBICACIÓN':<15} {'ESTADO':<10} {'MANTENIMIENTO':<15}{self.colores['normal']}")
-        print("-" * 80)
-        
-        for dispositivo in lista_dispositivos:
-            estado_color = self.colores['activo'] if dispositivo["estado"] == "activo" else self.colores['inactivo']
-            print(f"{dispositivo['ID']:<10} {dispositivo['tipo']:<20} {dispositivo['ubicación']:<15} "
-                  f"{estado_color}{dispositivo['estado']:<10}{self.colores['normal']} {dispositivo['último_mantenimiento']:<15}")
-
-# Función principal del programa 4
-def ejecutar_registro_dispositivos():
-    """Ejecuta el sistema de registro de dispositivos IoT"""
-    sistema = RegistroDispositivosIoT()
-    
-    print(f"{sistema.colores['titulo']}🏢 INICIANDO SISTEMA DE REGISTRO DE DISPOSITIVOS IoT{sistema.colores['normal']}")
-    
-    # Agregar dispositivos de ejemplo
-    dispositivos_ejemplo = [
-        {"id": "SEN-001", "tipo": "sensor_temperatura", "ubicacion": "sala", "estado": "activo", "mantenimiento": "2023-10-01"},
-        {"id": "SEN-002", "tipo": "sensor_humedad", "ubicacion": "cocina", "estado": "activo", "mantenimiento": "2023-09-15"},
-        {"id": "ACT-001", "tipo": "ventilador", "ubicacion": "sala", "estado": "inactivo", "mantenimiento": "2023-08-20"},
-        {"id": "ACT-002", "tipo": "humidificador", "ubicacion": "dormitorio", "estado": "inactivo", "mantenimiento": "2023-07-10"},
-        {"id": "ACT-003", "tipo": "luz_inteligente", "ubicacion": "sala", "estado": "activo", "mantenimiento": "2023-06-05"},
-        {"id": "SEN-003", "tipo": "sensor_presencia", "ubicacion": "entrada", "estado": "activo", "mantenimiento": "2023-05-12"}
-    ]
-    
-    print(f"\n{sistema.colores['dato']}📦 AGREGANDO DISPOSITIVOS DE EJEMPLO...{sistema.colores['normal']}")
-    for dispositivo in dispositivos_ejemplo:
-        sistema.agregar_dispositivo(
-            dispositivo["id"],
-            dispositivo["tipo"],
-            dispositivo["ubicacion"],
-            dispositivo["estado"],
-            dispositivo["mantenimiento"]
-        )
-    
-    # Mostrar todos los dispositivos
-    sistema.mostrar_dispositivos()
-    
-    # Buscar dispositivos por ubicación
-    print(f"\n{sistema.colores['busqueda']}🔍 BUSCANDO DISPOSITIVOS EN 'SALA':{sistema.colores['normal']}")
-    dispositivos_sala = sistema.buscar_por_ubicacion("sala")
-    sistema.mostrar_dispositivos(dispositivos_sala)
-    
-    # Actualizar estados de dispositivos
-    print(f"\n{sistema.colores['busqueda']}🔄 ACTUALIZANDO ESTADOS DE DISPOSITIVOS:{sistema.colores['normal']}")
-    sistema.actualizar_estado("ACT-001", "activo")  # Activar ventilador
-    sistema.actualizar_estado("SEN-002", "inactivo")  # Desactivar sensor
-    
-    # Actualizar mantenimiento
-    sistema.actualizar_mantenimiento("ACT-003", "2023-10-15")
-    
-    # Intentar actualizar dispositivo inexistente
-    sistema.actualizar_estado("DIS-999", "activo")
-    
-    # Mostrar estado final
-    print(f"\n{sistema.colores['titulo']}📊 ESTADO FINAL DE DISPOSITIVOS:{sistema.colores['normal']}")
-    sistema.mostrar_dispositivos()
-    
-    # Estadísticas finales
-    print(f"\n{sistema.colores['exito']}📈 ESTADÍSTICAS DEL SISTEMA:{sistema.colores['normal']}")
-    print(f"• Total dispositivos: {len(sistema.dispositivos)}")
-    activos = sum(1 for d in sistema.dispositivos if d["estado"] == "activo")
-    print(f"• Dispositivos activos: {activos}")
-    print(f"• Dispositivos inactivos: {len(sistema.dispositivos) - activos}")
-
-if __name__ == "__main__":
+# -*- coding: utf-8 -*-
+"""
+SISTEMA DE REGISTRO DE DISPOSITIVOS IoT - PROGRAMA 4
+Registra y gestiona dispositivos IoT usando diccionarios
+Paleta de colores morada: #4B0082, #800080, #9370DB, #D8BFD8
+"""
+
+from almacen_dispositivos import (AlmacenDispositivosMemoria, AlmacenDispositivosSQLite, DispositivoCompacto,
+                                  tupla_dispositivo)
+from lotes_dispositivos import (ESTADOS_VALIDOS, FilaInvalida, en_lotes, escribir_dispositivos, leer_filas,
+                                normalizar_estado, normalizar_fila)
+from salida_eventos import SalidaConsola
+
+class RegistroDispositivosIoT:
+    def __init__(self, salida=None, almacen=None):
+        """
+        Inicializa el sistema de registro de dispositivos
+        
+        Args:
+            salida: Destino de los mensajes (SalidaConsola, SalidaSilenciosa,
+                    SalidaBuffer o SalidaLogging). Por defecto consola con colores.
+            almacen: Motor de almacenamiento (AlmacenDispositivosMemoria o
+                     AlmacenDispositivosSQLite). Por defecto en memoria.
+        """
+        self.almacen = almacen if almacen is not None else AlmacenDispositivosMemoria()
+        self.colores = {
+            'titulo': '\033[95m',      # Morado claro
+            'normal': '\033[0m',       # Reset color
+            'activo': '\033[92m',      # Verde para activos
+            'inactivo': '\033[91m',    # Rojo para inactivos
+            'dato': '\033[94m',        # Azul morado
+            'busqueda': '\033[93m',    # Amarillo
+            'exito': '\033[96m'        # Cian
+        }
+        self.salida = salida if salida is not None else SalidaConsola(self.colores)
+    
+    @classmethod
+    def abrir_sqlite(cls, ruta: str, salida=None, tamano_transaccion: int = 10000):
+        """
+        Abre (o crea) un registro persistente en una base SQLite
+        
+        Args:
+            ruta (str): Archivo de la base de datos
+            salida: Destino de los mensajes (opcional)
+            tamano_transaccion (int): Altas de importar_lote agrupadas por transacción
+                                      (las escrituras individuales se confirman al momento)
+        """
+        return cls(salida, AlmacenDispositivosSQLite(ruta, tamano_transaccion))
+    
+    @property
+    def dispositivos(self):
+        """Lista de dispositivos (DispositivoCompacto, se leen como diccionarios) en orden de alta"""
+        return self.almacen.todos()
+    
+    def contar_por_estado(self):
+        """
+        Devuelve el número de dispositivos por estado sin recorrer el registro
+        
+        Returns:
+            Diccionario {'activo': n, 'inactivo': m} más una clave por cada otro estado registrado
+        """
+        return self.almacen.contar_por_estado()
+    
+    def cerrar(self):
+        """Confirma las escrituras pendientes y cierra el motor de almacenamiento"""
+        self.almacen.cerrar()
+    
+    def obtener_dispositivo(self, id_dispositivo: str):
+        """
+        Obtiene un dispositivo por su ID mediante el índice de IDs
+        
+        Args:
+            id_dispositivo (str): ID del dispositivo
+        """
+        return self.almacen.obtener(id_dispositivo)
+    
+    def agregar_dispositivo(self, id: str, tipo: str, ubicacion: str, 
+                           estado: str = "activo", ultimo_mantenimiento: str = "N/A"):
+        """
+        Agrega un nuevo dispositivo al registro
+        
+        Args:
+            id (str): ID único del dispositivo
+            tipo (str): Tipo de dispositivo
+            ubicacion (str): Ubicación del dispositivo
+            estado (str): Estado (activo/inactivo, sin distinguir mayúsculas; otros
+                          estados como "mantenimiento" se guardan tal cual)
+            ultimo_mantenimiento (str): Fecha último mantenimiento (AAAA-MM-DD o "N/A")
+        """
+        # Verificar que el ID no exista ya
+        if self.almacen.contiene(id):
+            if self.salida.activo:
+                self.salida.emitir('inactivo', "❌ Error: El ID %s ya existe", id)
+            return False
+        
+        # Crear el registro compacto con los datos del dispositivo
+        dispositivo = DispositivoCompacto(id, tipo, ubicacion, normalizar_estado(estado), ultimo_mantenimiento)
+        
+        # Agregar al almacenamiento (valida y normaliza la fecha de mantenimiento)
+        try:
+            self.almacen.agregar(dispositivo)
+        except ValueError as error:
+            if self.salida.activo:
+                self.salida.emitir('inactivo', "❌ Error: %s", error)
+            return False
+        if self.salida.activo:
+            self.salida.emitir('exito', "✅ Dispositivo %s agregado correctamente", id)
+        return True
+    
+    def importar_lote(self, origen, formato: str = None, tamano_lote: int = 10000,
+                      max_errores: int = 20):
+        """
+        Importa dispositivos en streaming desde CSV o JSON Lines sin imprimir por fila
+        
+        Args:
+            origen: Ruta de archivo, objeto archivo, iterable de líneas o de diccionarios
+            formato (str): 'csv' o 'jsonl' (opcional, se deduce de la extensión)
+            tamano_lote (int): Filas validadas e indexadas por lote
+            max_errores (int): Errores individuales que se conservan como muestra
+        
+        Returns:
+            Diccionario con importados, rechazados, conteo por motivo y muestra de errores
+        """
+        resumen = {"importados": 0, "rechazados": 0, "motivos": {}, "errores": []}
+        numero_fila = 0
+        
+        def rechazar(fila: int, motivo: str, linea: int = None):
+            resumen["rechazados"] += 1
+            resumen["motivos"][motivo] = resumen["motivos"].get(motivo, 0) + 1
+            if len(resumen["errores"]) < max_errores:
+                error = {"fila": fila, "motivo": motivo}
+                if linea is not None:
+                    error["linea"] = linea  # Línea del archivo que no se pudo decodificar
+                resumen["errores"].append(error)
+        
+        for lote in en_lotes(leer_filas(origen, formato), tamano_lote):
+            validos = []  # (número de fila, dispositivo)
+            for fila in lote:
+                numero_fila += 1
+                if isinstance(fila, FilaInvalida):
+                    rechazar(numero_fila, str(fila), fila.linea)
+                    continue
+                try:
+                    validos.append((numero_fila, normalizar_fila(fila)))
+                except ValueError as error:
+                    rechazar(numero_fila, str(error))
+            
+            # Una consulta de IDs existentes por lote en lugar de una por fila
+            existentes = self.almacen.existentes([dispositivo["ID"] for _, dispositivo in validos])
+            nuevos = []
+            for fila, dispositivo in validos:
+                if dispositivo["ID"] in existentes:
+                    rechazar(fila, "ID duplicado")
+                    continue
+                existentes.add(dispositivo["ID"])
+                nuevos.append(dispositivo)
+            self.almacen.agregar_varios(nuevos)
+            resumen["importados"] += len(nuevos)
+        # Las altas del último lote no quedan pendientes al terminar la importación
+        self.almacen.sincronizar()
+        
+        resumen["errores"].sort(key=lambda error: error["fila"])
+        if self.salida.activo:
+            self.salida.emitir('exito', "📦 Importación: %d dispositivos agregados, %d rechazados",
+                               resumen["importados"], resumen["rechazados"])
+        return resumen
+    
+    def exportar(self, destino, formato: str = None, lista_dispositivos=None):
+        """
+        Exporta dispositivos en streaming a CSV o JSON Lines
+        
+        Args:
+            destino: Ruta de archivo u objeto archivo de texto
+            formato (str): 'csv' o 'jsonl' (opcional, se deduce de la extensión)
+            lista_dispositivos: Lista específica de dispositivos (opcional)
+        
+        Returns:
+            Cantidad de dispositivos exportados
+        """
+        if lista_dispositivos is None:
+            lista_dispositivos = self.almacen  # Recorrido en streaming
+        return escribir_dispositivos(lista_dispositivos, destino, formato)
+    
+    def buscar_por_ubicacion(self, ubicacion: str):
+        """
+        Busca dispositivos por ubicación
+        
+        Args:
+            ubicacion (str): Ubicación a buscar
+        """
+        # Coincidencia exacta (case insensitive) mediante el índice de ubicación
+        return self.almacen.buscar_por_ubicacion(ubicacion)
+    
+    def buscar_por_tipo(self, tipo: str):
+        """
+        Busca dispositivos por tipo
+        
+        Args:
+            tipo (str): Tipo de dispositivo
+        """
+        return self.almacen.buscar_por_tipo(tipo)
+    
+    def buscar_por_estado(self, estado: str):
+        """
+        Busca dispositivos por estado
+        
+        Args:
+            estado (str): Estado (activo/inactivo sin distinguir mayúsculas, u otro estado exacto)
+        """
+        return self.almacen.buscar_por_estado(normalizar_estado(estado))
+    
+    def buscar_mantenimiento_anterior(self, fecha: str):
+        """
+        Busca dispositivos cuyo último mantenimiento es anterior a una fecha
+        (los que no tienen fecha, como "N/A", no se incluyen)
+        
+        Args:
+            fecha (str): Fecha límite en formato AAAA-MM-DD (excluida; otro formato lanza ValueError)
+        """
+        return self.almacen.buscar_mantenimiento_anterior(fecha)
+    
+    def actualizar_estado(self, id_dispositivo: str, nuevo_estado: str):
+        """
+        Actualiza el estado de un dispositivo
+        
+        Args:
+            id_dispositivo (str): ID del dispositivo
+            nuevo_estado (str): Nuevo estado (activo/inactivo)
+        """
+        # Verificar que el nuevo estado sea válido
+        if nuevo_estado.lower() in ESTADOS_VALIDOS:
+            if self.almacen.actualizar_estado(id_dispositivo, nuevo_estado.lower()):
+                if self.salida.activo:
+                    self.salida.emitir('exito', "✅ Estado de %s actualizado a %s", id_dispositivo, nuevo_estado)
+                return True
+        elif self.almacen.contiene(id_dispositivo):
+            if self.salida.activo:
+                self.salida.emitir('inactivo', "❌ Error: Estado debe ser 'activo' o 'inactivo'")
+            return False
+        
+        if self.salida.activo:
+            self.salida.emitir('inactivo', "❌ Error: Dispositivo %s no encontrado", id_dispositivo)
+        return False
+    
+    def actualizar_mantenimiento(self, id_dispositivo: str, fecha_mantenimiento: str):
+        """
+        Actualiza la fecha de último mantenimiento
+        
+        Args:
+            id_dispositivo (str): ID del dispositivo
+            fecha_mantenimiento (str): Fecha del mantenimiento (AAAA-MM-DD o "N/A")
+        """
+        try:
+            actualizado = self.almacen.actualizar_mantenimiento(id_dispositivo, fecha_mantenimiento)
+        except ValueError as error:
+            if self.salida.activo:
+                self.salida.emitir('inactivo', "❌ Error: %s", error)
+            return False
+        if actualizado:
+            if self.salida.activo:
+                self.salida.emitir('exito', "✅ Mantenimiento de %s actualizado", id_dispositivo)
+            return True
+        
+        if self.salida.activo:
+            self.salida.emitir('inactivo', "❌ Error: Dispositivo %s no encontrado", id_dispositivo)
+        return False
+    
+    def eliminar_dispositivo(self, id_dispositivo: str):
+        """
+        Elimina un dispositivo del registro y de todos sus índices
+        
+        Args:
+            id_dispositivo (str): ID del dispositivo
+        """
+        if self.almacen.eliminar(id_dispositivo):
+            if self.salida.activo:
+                self.salida.emitir('exito', "🗑️ Dispositivo %s eliminado", id_dispositivo)
+            return True
+        
+        if self.salida.activo:
+            self.salida.emitir('inactivo', "❌ Error: Dispositivo %s no encontrado", id_dispositivo)
+        return False
+    
+    def mostrar_dispositivos(self, lista_dispositivos=None):
+        """
+        Muestra dispositivos en formato tabla
+        
+        Args:
+            lista_dispositivos: Lista específica de dispositivos (opcional)
+        """
+        if lista_dispositivos is None:
+            lista_dispositivos = self.dispositivos
+        
+        if not lista_dispositivos:
+            print(f"{self.colores['dato']}📭 No hay dispositivos para mostrar{self.colores['normal']}")
+            return
+        
+        print(f"\n{self.colores['titulo']}{'='*80}")
+        print("                          DISPOSITIVOS REGISTRADOS")
+        print(f"{'='*80}{self.colores['normal']}")
+        
+        print(f"{self.colores['dato']}{'ID':<10} {'TIPO':<20} {'UBICACIÓN':<15} {'ESTADO':<10} {'MANTENIMIENTO':<15}{self.colores['normal']}")
+        print("-" * 80)
+        
+        color_activo, color_inactivo, normal = self.colores['activo'], self.colores['inactivo'], self.colores['normal']
+        for dispositivo in lista_dispositivos:
+            id, tipo, ubicacion, estado, mantenimiento = tupla_dispositivo(dispositivo)
+            estado_color = color_activo if estado == "activo" else color_inactivo
+            print(f"{id:<10} {tipo:<20} {ubicacion:<15} "
+                  f"{estado_color}{estado:<10}{normal} {mantenimiento:<15}")
+
+# Función principal del programa 4
+def ejecutar_registro_dispositivos():
+    """Ejecuta el sistema de registro de dispositivos IoT"""
+    sistema = RegistroDispositivosIoT()
+    
+    print(f"{sistema.colores['titulo']}🏢 INICIANDO SISTEMA DE REGISTRO DE DISPOSITIVOS IoT{sistema.colores['normal']}")
+    
+    # Agregar dispositivos de ejemplo
+    dispositivos_ejemplo = [
+        {"id": "SEN-001", "tipo": "sensor_temperatura", "ubicacion": "sala", "estado": "activo", "mantenimiento": "2023-10-01"},
+        {"id": "SEN-002", "tipo": "sensor_humedad", "ubicacion": "cocina", "estado": "activo", "mantenimiento": "2023-09-15"},
+        {"id": "ACT-001", "tipo": "ventilador", "ubicacion": "sala", "estado": "inactivo", "mantenimiento": "2023-08-20"},
+        {"id": "ACT-002", "tipo": "humidificador", "ubicacion": "dormitorio", "estado": "inactivo", "mantenimiento": "2023-07-10"},
+        {"id": "ACT-003", "tipo": "luz_inteligente", "ubicacion": "sala", "estado": "activo", "mantenimiento": "2023-06-05"},
+        {"id": "SEN-003", "tipo": "sensor_presencia", "ubicacion": "entrada", "estado": "activo", "mantenimiento": "2023-05-12"}
+    ]
+    
+    print(f"\n{sistema.colores['dato']}📦 AGREGANDO DISPOSITIVOS DE EJEMPLO...{sistema.colores['normal']}")
+    for dispositivo in dispositivos_ejemplo:
+        sistema.agregar_dispositivo(
+            dispositivo["id"],
+            dispositivo["tipo"],
+            dispositivo["ubicacion"],
+            dispositivo["estado"],
+            dispositivo["mantenimiento"]
+        )
+    
+    # Mostrar todos los dispositivos
+    sistema.mostrar_dispositivos()
+    
+    # Buscar dispositivos por ubicación
+    print(f"\n{sistema.colores['busqueda']}🔍 BUSCANDO DISPOSITIVOS EN 'SALA':{sistema.colores['normal']}")
+    dispositivos_sala = sistema.buscar_por_ubicacion("sala")
+    sistema.mostrar_dispositivos(dispositivos_sala)
+    
+    # Actualizar estados de dispositivos
+    print(f"\n{sistema.colores['busqueda']}🔄 ACTUALIZANDO ESTADOS DE DISPOSITIVOS:{sistema.colores['normal']}")
+    sistema.actualizar_estado("ACT-001", "activo")  # Activar ventilador
+    sistema.actualizar_estado("SEN-002", "inactivo")  # Desactivar sensor
+    
+    # Actualizar mantenimiento
+    sistema.actualizar_mantenimiento("ACT-003", "2023-10-15")
+    
+    # Intentar actualizar dispositivo inexistente
+    sistema.actualizar_estado("DIS-999", "activo")
+    
+    # Mostrar estado final
+    print(f"\n{sistema.colores['titulo']}📊 ESTADO FINAL DE DISPOSITIVOS:{sistema.colores['normal']}")
+    sistema.mostrar_dispositivos()
+    
+    # Estadísticas finales
+    print(f"\n{sistema.colores['exito']}📈 ESTADÍSTICAS DEL SISTEMA:{sistema.colores['normal']}")
+    conteo = sistema.contar_por_estado()
+    print(f"• Total dispositivos: {sum(conteo.values())}")
+    print(f"• Dispositivos activos: {conteo['activo']}")
+    print(f"• Dispositivos inactivos: {conteo['inactivo']}")
+
+if __name__ == "__main__":
     ejecutar_registro_dispositivos()
\ No newline at end of file
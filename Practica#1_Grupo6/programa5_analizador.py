@@ -1,253 +1,483 @@
-# -*- coding: utf-8 -*-
-"""
-ANALIZADOR DE DATOS DE SENSORES - PROGRAMA 5
-Procesa lecturas de sensores y detecta valores atípicos
-Paleta de colores morada: #4B0082, #800080, #9370DB, #D8BFD8
-"""
-
-import math
-import statistics
-from datetime import datetime
-
-class AnalizadorSensores:
-    def __init__(self):
-        """Inicializa el analizador de datos de sensores"""
-        self.datos_sensores = []  # Lista de tuplas (valor, tipo, timestamp)
-        self.colores = {
-            'titulo': '\033[95m',      # Morado claro
-            'normal': '\033[0m',       # Reset color
-            'estadistica': '\033[94m', # Azul morado
-            'atipico': '\033[91m',     # Rojo para atípicos
-            'normal_val': '\033[92m',  # Verde para normales
-            'advertencia': '\033[93m', # Amarillo
-            'dato': '\033[96m'         # Cian
-        }
-    
-    def agregar_lectura(self, valor: float, tipo_sensor: str, timestamp: str = None):
-        """
-        Agrega una lectura de sensor al analizador
-        
-        Args:
-            valor (float): Valor de la lectura
-            tipo_sensor (str): Tipo de sensor
-            timestamp (str): Marca de tiempo (opcional)
-        """
-        if timestamp is None:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        lectura = (valor, tipo_sensor, timestamp)
-        self.datos_sensores.append(lectura)
-        
-        print(f"{self.colores['dato']}✓ Lectura agregada: {valor} ({tipo_sensor}){self.colores['normal']}")
-    
-    def filtrar_por_tipo(self, tipo_sensor: str):
-        """
-        Filtra lecturas por tipo de sensor
-        
-        Args:
-            tipo_sensor (str): Tipo de sensor a filtrar
-        """
-        return [d for d in self.datos_sensores if d[1] == tipo_sensor]
-    
-    def calcular_estadisticas(self, tipo_sensor: str = None):
-        """
-        Calcula estadísticas básicas para los datos
-        
-        Args:
-            tipo_sensor (str): Tipo de sensor específico (opcional)
-        """
-        datos = self.datos_sensores if tipo_sensor is None else self.filtrar_por_tipo(tipo_sensor)
-        
-        if not datos:
-            return {}
-        
-        valores = [d[0] for d in datos]
-        
-        # Cálculo de estadísticas básicas
-        estadisticas = {
-            "maximo": max(valores),
-            "minimo": min(valores),
-            "promedio": statistics.mean(valores),
-            "mediana": statistics.median(valores),
-            "desviacion_estandar": statistics.stdev(valores) if len(valores) > 1 else 0,
-            "rango": max(valores) - min(valores),
-            "cantidad": len(valores)
-        }
-        
-        return estadisticas
-    
-    def detectar_valores_atipicos(self, tipo_sensor: str = None):
-        """
-        Detecta valores atípicos usando el método del rango intercuartílico
-        
-        Args:
-            tipo_sensor (str): Tipo de sensor específico (opcional)
-        """
-        datos = self.datos_sensores if tipo_sensor is None else self.filtrar_por_tipo(tipo_sensor)
-        
-        if len(datos) < 3:
-            return []  # No se pueden detectar atípicos con pocos datos
-        
-        valores = [d[0] for d in datos]
-        
-        # Calcular cuartiles
-        q1 = statistics.quantiles(valores, n=4)[0]  # Primer cuartil (25%)
-        q3 = statistics.quantiles(valores, n=4)[2]  # Tercer cuartil (75%)
-        iqr = q3 - q1  # Rango intercuartílico
-        
-        # Definir límites para valores atípicos
-        limite_inferior = q1 - 1.5 * iqr
-        limite_superior = q3 + 1.5 * iqr
-        
-        # Identificar valores atípicos
-        atipicos = []
-        for dato in datos:
-            valor = dato[0]
-            if valor < limite_inferior or valor > limite_superior:
-                atipicos.append({
-                    "valor": valor,
-                    "tipo_sensor": dato[1],
-                    "timestamp": dato[2],
-                    "desviacion": abs(valor - statistics.mean(valores))
-                })
-        
-        return atipicos
-    
-    def verificar_umbrales_seguros(self, tipo_sensor: str):
-        """
-        Verifica si las lecturas están dentro de umbrales seguros
-        
-        Args:
-            tipo_sensor (str): Tipo de sensor a verificar
-        """
-        datos = self.filtrar_por_tipo(tipo_sensor)
-        
-        if not datos:
-            return []
-        
-        valores = [d[0] for d in datos]
-        
-        # Definir umbrales seguros según el tipo de sensor
-        umbrales = {
-            "temperatura": {"min": 18.0, "max": 30.0},
-            "humedad": {"min": 30.0, "max": 80.0},
-            "presion": {"min": 1000.0, "max": 1020.0},
-            "calidad_aire": {"min": 0.0, "max": 100.0}
-        }
-        
-        if tipo_sensor not in umbrales:
-            return []
-        
-        min_seguro = umbrales[tipo_sensor]["min"]
-        max_seguro = umbrales[tipo_sensor]["max"]
-        
-        # Encontrar valores fuera de umbral seguro
-        fuera_umbral = []
-        for dato in datos:
-            valor = dato[0]
-            if valor < min_seguro or valor > max_seguro:
-                fuera_umbral.append({
-                    "valor": valor,
-                    "timestamp": dato[2],
-                    "estado": "BAJO" if valor < min_seguro else "ALTO"
-                })
-        
-        return fuera_umbral
-    
-    def generar_reporte_completo(self):
-        """
-        Genera un reporte completo con todas las estadísticas
-        """
-        print(f"\n{self.colores['titulo']}{'='*80}")
-        print("                     REPORTE COMPLETO DE SENSORES")
-        print(f"{'='*80}{self.colores['normal']}")
-        
-        # Obtener todos los tipos de sensores únicos
-        tipos_sensores = list(set(d[1] for d in self.datos_sensores))
-        
-        for tipo in tipos_sensores:
-            datos_tipo = self.filtrar_por_tipo(tipo)
-            
-            if not datos_tipo:
-                continue
-            
-            print(f"\n{self.colores['estadistica']}📊 {tipo.upper()}:{self.colores['normal']}")
-            
-            # Calcular estadísticas
-            stats = self.calcular_estadisticas(tipo)
-            print(f"   • Lecturas: {stats['cantidad']}")
-            print(f"   • Rango: {stats['minimo']:.2f} - {stats['maximo']:.2f}")
-            print(f"   • Promedio: {stats['promedio']:.2f}")
-            print(f"   • Desviación estándar: {stats['desviacion_estandar']:.2f}")
-            
-            # Detectar valores atípicos
-            atipicos = self.detectar_valores_atipicos(tipo)
-            if atipicos:
-                print(f"   {self.colores['atipico']}• Valores atípicos: {len(atipicos)}{self.colores['normal']}")
-                for atipico in atipicos[:3]:  # Mostrar solo los 3 primeros
-                    print(f"     ◦ {atipico['valor']:.2f} (desviación: {atipico['desviacion']:.2f})")
-            
-            # Verificar umbrales seguros
-            if tipo in ["temperatura", "humedad"]:
-                fuera_umbral = self.verificar_umbrales_seguros(tipo)
-                if fuera_umbral:
-                    print(f"   {self.colores['advertencia']}• Valores fuera de umbral seguro: {len(fuera_umbral)}{self.colores['normal']}")
-
-# Función principal del programa 5
-def ejecutar_analizador_sensores():
-    """Ejecuta el analizador de datos de sensores"""
-    analizador = AnalizadorSensores()
-    
-    print(f"{analizador.colores['titulo']}📊 INICIANDO ANALIZADOR DE DATOS DE SENSORES{analizador.colores['normal']}")
-    
-    # Generar datos de ejemplo más realistas con algunos valores atípicos
-    print(f"\n{analizador.colores['dato']}📝 GENERANDO DATOS DE EJEMPLO...{analizador.colores['normal']}")
-    
-    # Datos normales de temperatura (20°C ± 3°C)
-    for i in range(20):
-        valor = 20.0 + (random.uniform(-3, 3))
-        analizador.agregar_lectura(round(valor, 1), "temperatura", f"2023-10-15 {10+i//2}:{i%2*30:02d}")
-    
-    # Algunos valores atípicos de temperatura
-    analizador.agregar_lectura(35.5, "temperatura", "2023-10-15 11:45")  # Muy alto
-    analizador.agregar_lectura(12.3, "temperatura", "2023-10-15 12:15")  # Muy bajo
-    
-    # Datos de humedad (50% ± 15%)
-    for i in range(15):
-        valor = 50.0 + (random.uniform(-15, 15))
-        analizador.agregar_lectura(round(valor, 1), "humedad", f"2023-10-15 {11+i//3}:{i%3*20:02d}")
-    
-    # Algunos valores atípicos de humedad
-    analizador.agregar_lectura(85.7, "humedad", "2023-10-15 12:30")  # Muy alto
-    analizador.agregar_lectura(25.2, "humedad", "2023-10-15 13:10")  # Muy bajo
-    
-    # Datos de presión (1010 ± 5)
-    for i in range(10):
-        valor = 1010.0 + (random.uniform(-5, 5))
-        analizador.agregar_lectura(round(valor, 1), "presion", f"2023-10-15 {12+i//2}:{i%2*30:02d}")
-    
-    # Generar reporte completo
-    analizador.generar_reporte_completo()
-    
-    # Análisis específico por tipo de sensor
-    print(f"\n{analizador.colores['titulo']}🔍 ANÁLISIS DETALLADO POR SENSOR:{analizador.colores['normal']}")
-    
-    for tipo in ["temperatura", "humedad", "presion"]:
-        datos = analizador.filtrar_por_tipo(tipo)
-        if datos:
-            print(f"\n{analizador.colores['estadistica']}📈 {tipo.upper()}:{analizador.colores['normal']}")
-            stats = analizador.calcular_estadisticas(tipo)
-            print(f"   • Mínimo: {stats['minimo']:.2f}")
-            print(f"   • Máximo: {stats['maximo']:.2f}")
-            print(f"   • Promedio: {stats['promedio']:.2f}")
-            
-            atipicos = analizador.detectar_valores_atipicos(tipo)
-            print(f"   • Valores atípicos: {len(atipicos)}")
-            
-            if tipo in ["temperatura", "humedad"]:
-                fuera_umbral = analizador.verificar_umbrales_seguros(tipo)
-                print(f"   • Fuera de umbral seguro: {len(fuera_umbral)}")
-
-if __name__ == "__main__":
-    import random  # Importar aquí para no afectar el resto del código
+# -*- coding: utf-8 -*-
+"""
+ANALIZADOR DE DATOS DE SENSORES - PROGRAMA 5
+Procesa lecturas de sensores y detecta valores atípicos
+Paleta de colores morada: #4B0082, #800080, #9370DB, #D8BFD8
+"""
+
+import math
+from time import time_ns
+
+# Los módulos de uso ocasional (statistics, análisis paralelo, registro en disco,
+# métricas HTTP y resúmenes distribuidos) se importan dentro de los métodos que
+# los usan para que importar el analizador sea rápido
+from almacen_lecturas import AlmacenColumnar
+from cache_resultados import CacheResultados
+from motor_atipicos import calcular_limites, detectar_atipicos_lote, indices_fuera_de_limites
+from reporte_sensores import UMBRALES_SEGUROS, construir_reporte, renderizar_reporte
+from salida_eventos import SalidaConsola
+from tiempo_lecturas import NS_POR_SEGUNDO, convertir_timestamp
+from ventanas_tiempo import AgregadorVentanas
+
+class AnalizadorSensores:
+    def __init__(self, salida=None):
+        """
+        Inicializa el analizador de datos de sensores
+        
+        Args:
+            salida: Destino de los mensajes (SalidaConsola, SalidaSilenciosa,
+                    SalidaBuffer o SalidaLogging). Por defecto consola con colores.
+        """
+        self.almacen = AlmacenColumnar()  # Columnas de valores/tiempos por tipo de sensor
+        self.ventanas = None  # AgregadorVentanas (ver configurar_ventanas)
+        self.registro = None  # EscritorRegistro en disco (ver persistir_en / desde_registro)
+        self._lector = None
+        self.metricas = None  # MetricasAnalizador (ver habilitar_metricas)
+        self._servidor_metricas = None
+        self.cache = CacheResultados()  # Resultados de consultas por versión de tipo (None = sin caché)
+        self._resumenes = {}  # tipo -> (ResumenTipo, lecturas ya incorporadas) para exportar_resumen
+        self._epoca_resumen = None  # Época de los resúmenes exportados (ns epoch de la primera exportación)
+        self._exportaciones = 0
+        self.colores = {
+            'titulo': '\033[95m',      # Morado claro
+            'normal': '\033[0m',       # Reset color
+            'estadistica': '\033[94m', # Azul morado
+            'atipico': '\033[91m',     # Rojo para atípicos
+            'normal_val': '\033[92m',  # Verde para normales
+            'advertencia': '\033[93m', # Amarillo
+            'dato': '\033[96m'         # Cian
+        }
+        self.salida = salida if salida is not None else SalidaConsola(self.colores)
+    
+    @property
+    def datos_sensores(self):
+        """
+        Tupla de lecturas (valor, tipo, timestamp) en orden de llegada, de solo lectura:
+        se construye desde el almacén columnar en cada acceso, así que modificarla
+        no cambiaría los datos (para agregar lecturas usar agregar_lectura/agregar_lote).
+        Las marcas se guardan en nanosegundos y se muestran con FORMATO_SALIDA
+        ("%Y-%m-%d %H:%M:%S"): "2023-10-01 10:00" se lee como "2023-10-01 10:00:00".
+        """
+        return tuple(self.almacen.lecturas())
+    
+    def agregar_lectura(self, valor: float, tipo_sensor: str, timestamp: str = None):
+        """
+        Agrega una lectura de sensor al analizador
+        
+        Args:
+            valor (float): Valor de la lectura
+            tipo_sensor (str): Tipo de sensor
+            timestamp (str): Marca de tiempo (opcional). También acepta float con
+                             segundos epoch o int con nanosegundos epoch
+        """
+        tiempo = time_ns() if timestamp is None else convertir_timestamp(timestamp)
+        self.almacen.agregar(float(valor), tipo_sensor, tiempo)
+        if self.ventanas is not None:
+            self.ventanas.agregar(tipo_sensor, tiempo / NS_POR_SEGUNDO, valor)
+        if self.registro is not None:
+            self.registro.agregar(valor, tipo_sensor, tiempo)
+        
+        if self.salida.activo:
+            self.salida.emitir('dato', "✓ Lectura agregada: %s (%s)", valor, tipo_sensor)
+    
+    def agregar_lote(self, lecturas):
+        """
+        Agrega varias lecturas emitiendo un único mensaje para todo el lote
+        
+        Args:
+            lecturas: Iterable de tuplas (valor, tipo_sensor, timestamp); el timestamp
+                      puede ser None, texto, float con segundos epoch o int con nanosegundos epoch
+        """
+        almacen = self.almacen
+        ventanas = self.ventanas
+        registro = self.registro
+        cantidad = 0
+        for valor, tipo_sensor, timestamp in lecturas:
+            if timestamp is None:
+                tiempo = time_ns()
+            elif timestamp.__class__ is int:
+                tiempo = timestamp
+            else:
+                tiempo = convertir_timestamp(timestamp)
+            valor = float(valor)
+            almacen.agregar(valor, tipo_sensor, tiempo)
+            if ventanas is not None:
+                ventanas.agregar(tipo_sensor, tiempo / NS_POR_SEGUNDO, valor)
+            if registro is not None:
+                registro.agregar(valor, tipo_sensor, tiempo)
+            cantidad += 1
+        
+        if self.salida.activo:
+            self.salida.emitir('dato', "✓ Lote agregado: %d lecturas", cantidad)
+        return cantidad
+    
+    @classmethod
+    def desde_registro(cls, ruta: str, salida=None, persistir: bool = True):
+        """
+        Crea un analizador sobre un registro binario en disco sin volver a procesarlo.
+        Las columnas son vistas mmap sin copia y los agregados se restauran del punto de control.
+        Con persistir, el registro se repara en disco antes de proyectarlo si una caída lo dejó incompleto;
+        tras un cierre limpio el punto de control evita leer la secuencia.
+        
+        Args:
+            ruta (str): Directorio del registro
+            salida: Destino de los mensajes (opcional)
+            persistir (bool): Anexar al registro las lecturas nuevas
+        """
+        from registro_binario import EscritorRegistro, LectorRegistro, cargar_almacen
+        
+        analizador = cls(salida)
+        cantidades = None
+        if persistir:
+            # El escritor repara el registro, así que se abre antes de proyectarlo
+            analizador.registro = EscritorRegistro(ruta)
+            cantidades = list(analizador.registro.cantidades)
+        analizador._lector = LectorRegistro(ruta)
+        analizador.almacen = cargar_almacen(analizador._lector, cantidades)
+        return analizador
+    
+    def persistir_en(self, ruta: str):
+        """
+        Empieza a guardar las lecturas en un registro binario nuevo, incluyendo las ya cargadas
+        
+        Args:
+            ruta (str): Directorio del registro (no debe contener un registro previo)
+        """
+        from registro_binario import EscritorRegistro, existe_registro
+        
+        if existe_registro(ruta):
+            raise ValueError(f"Ya existe un registro en {ruta}; use AnalizadorSensores.desde_registro")
+        self.registro = EscritorRegistro(ruta)
+        for valor, tipo, tiempo in self.almacen.lecturas_crudas():
+            self.registro.agregar(valor, tipo, tiempo)
+        self.registro.guardar_resumen(self.almacen)
+        return self.registro
+    
+    def cerrar_registro(self):
+        """Guarda el punto de control de agregados y cierra el registro en disco"""
+        if self.registro is not None:
+            self.registro.guardar_resumen(self.almacen)
+            self.registro.cerrar()
+            self.registro = None
+    
+    def configurar_ventanas(self, deslizantes=(60, 300, 3600), fijas=(), historial: int = 60):
+        """
+        Activa la agregación por ventanas de tiempo para las lecturas siguientes
+        
+        Args:
+            deslizantes: Duraciones en segundos de las ventanas deslizantes
+            fijas: Duraciones en segundos de las ventanas fijas (tumbling)
+            historial (int): Ventanas fijas cerradas que se conservan
+        """
+        self.ventanas = AgregadorVentanas(deslizantes, fijas, historial)
+        return self.ventanas
+    
+    def estadisticas_ventana(self, tipo_sensor: str, ahora: float = None):
+        """
+        Devuelve las estadísticas de las ventanas de tiempo de un tipo de sensor
+        
+        Args:
+            tipo_sensor (str): Tipo de sensor
+            ahora (float): Tiempo actual en segundos epoch para expulsar lecturas vencidas (opcional)
+        """
+        if self.ventanas is None:
+            return {"deslizantes": {}, "fijas": {}}
+        return self.ventanas.estadisticas(tipo_sensor, ahora)
+    
+    def habilitar_metricas(self, puerto: int = None, host: str = "127.0.0.1"):
+        """
+        Activa contadores y latencias de los métodos públicos y, opcionalmente,
+        un endpoint HTTP local con las métricas en formato Prometheus
+        
+        Args:
+            puerto (int): Puerto del endpoint /metrics (None = sin servidor, 0 = puerto libre)
+            host (str): Dirección de escucha del endpoint
+        
+        Returns:
+            MetricasAnalizador (usar .instantanea() o .exportar_prometheus())
+        """
+        from metricas import ServidorMetricas, instrumentar
+        
+        if self.metricas is None:
+            self.metricas = instrumentar(self)
+        if puerto is not None and self._servidor_metricas is None:
+            self._servidor_metricas = ServidorMetricas(self.metricas, host, puerto).iniciar()
+        return self.metricas
+    
+    def deshabilitar_metricas(self):
+        """Detiene el endpoint de métricas y restaura los métodos sin medir"""
+        if self._servidor_metricas is not None:
+            self._servidor_metricas.detener()
+            self._servidor_metricas = None
+        from metricas import desinstrumentar
+        
+        desinstrumentar(self)
+        self.metricas = None
+    
+    def filtrar_por_tipo(self, tipo_sensor: str):
+        """
+        Filtra lecturas por tipo de sensor
+        
+        Args:
+            tipo_sensor (str): Tipo de sensor a filtrar
+        """
+        columna = self.almacen.columna(tipo_sensor)
+        return columna.lecturas() if columna is not None else []
+    
+    def calcular_estadisticas(self, tipo_sensor: str = None, exacto: bool = False):
+        """
+        Calcula estadísticas básicas para los datos
+        
+        Args:
+            tipo_sensor (str): Tipo de sensor específico (opcional)
+            exacto (bool): Recalcular sobre todas las lecturas en lugar de usar los
+                           agregados incrementales. Los incrementales dan la mediana exacta
+                           hasta LIMITE_EXACTO lecturas; después dan la estimación P² en la
+                           clave 'mediana_aprox' en lugar de 'mediana'
+        
+        Con la caché activa, el resultado exacto es de solo lectura (MappingProxyType)
+        """
+        if not exacto:
+            resumen = self.almacen.resumen_de(tipo_sensor)
+            return resumen.como_diccionario() if resumen is not None else {}
+        
+        clave = ("estadisticas", tipo_sensor)
+        version = self.almacen.version(tipo_sensor)
+        if self.cache is not None:
+            estadisticas = self.cache.obtener(clave, version)
+            if estadisticas is not None:
+                return estadisticas
+        
+        import statistics
+        
+        valores = self.almacen.valores(tipo_sensor)
+        
+        if not valores:
+            return {}
+        
+        # Cálculo de estadísticas básicas
+        estadisticas = {
+            "maximo": max(valores),
+            "minimo": min(valores),
+            "promedio": statistics.mean(valores),
+            "mediana": statistics.median(valores),
+            "desviacion_estandar": statistics.stdev(valores) if len(valores) > 1 else 0,
+            "rango": max(valores) - min(valores),
+            "cantidad": len(valores)
+        }
+        
+        if self.cache is not None:
+            return self.cache.guardar(clave, version, estadisticas)
+        return estadisticas
+    
+    def detectar_valores_atipicos(self, tipo_sensor: str = None, metodo: str = "iqr"):
+        """
+        Detecta valores atípicos usando el método del rango intercuartílico
+        
+        Args:
+            tipo_sensor (str): Tipo de sensor específico (opcional)
+            metodo (str): Método de detección: 'iqr' (por defecto), 'zscore' o 'mad'
+        
+        Con la caché activa, devuelve una tupla de solo lectura compartida entre llamadas
+        """
+        clave = ("atipicos", tipo_sensor, metodo)
+        version = self.almacen.version(tipo_sensor)
+        if self.cache is not None:
+            atipicos = self.cache.obtener(clave, version)
+            if atipicos is not None:
+                return atipicos
+        
+        valores = self.almacen.valores(tipo_sensor)
+        
+        # Límites calculados una sola vez (None si hay muy pocos datos)
+        limites = calcular_limites(valores, metodo)
+        if limites is None:
+            return []
+        limite_inferior, limite_superior, media = limites
+        
+        # Identificar valores atípicos columna por columna
+        columnas = [self.almacen.columna(tipo_sensor)] if tipo_sensor is not None else self.almacen.columnas.values()
+        atipicos = []
+        for columna in columnas:
+            for indice in indices_fuera_de_limites(columna.valores, limite_inferior, limite_superior):
+                valor, tipo, timestamp = columna.lectura(indice)
+                atipicos.append({
+                    "valor": valor,
+                    "tipo_sensor": tipo,
+                    "timestamp": timestamp,
+                    "desviacion": abs(valor - media)
+                })
+        
+        if self.cache is not None:
+            return self.cache.guardar(clave, version, atipicos)
+        return atipicos
+    
+    def detectar_atipicos_lote(self, metodo: str = "iqr", umbral: float = None):
+        """
+        Detecta atípicos de todos los tipos de sensor en una sola pasada
+        
+        Args:
+            metodo (str): 'iqr', 'zscore' o 'mad'
+            umbral (float): Umbral del método (opcional)
+        
+        Returns:
+            Diccionario tipo -> ResultadoAtipicos con los índices de los atípicos
+        """
+        return detectar_atipicos_lote(self.almacen, metodo, umbral)
+    
+    def verificar_umbrales_seguros(self, tipo_sensor: str):
+        """
+        Verifica si las lecturas están dentro de umbrales seguros
+        
+        Args:
+            tipo_sensor (str): Tipo de sensor a verificar
+        
+        Con la caché activa, devuelve una tupla de solo lectura compartida entre llamadas
+        """
+        columna = self.almacen.columna(tipo_sensor)
+        
+        if columna is None or tipo_sensor not in UMBRALES_SEGUROS:
+            return []
+        
+        clave = ("umbrales", tipo_sensor)
+        version = columna.version
+        if self.cache is not None:
+            fuera_umbral = self.cache.obtener(clave, version)
+            if fuera_umbral is not None:
+                return fuera_umbral
+        
+        min_seguro = UMBRALES_SEGUROS[tipo_sensor]["min"]
+        max_seguro = UMBRALES_SEGUROS[tipo_sensor]["max"]
+        
+        # Encontrar valores fuera de umbral seguro
+        fuera_umbral = []
+        for indice in indices_fuera_de_limites(columna.valores, min_seguro, max_seguro):
+            valor, _, timestamp = columna.lectura(indice)
+            fuera_umbral.append({
+                "valor": valor,
+                "timestamp": timestamp,
+                "estado": "BAJO" if valor < min_seguro else "ALTO"
+            })
+        
+        if self.cache is not None:
+            return self.cache.guardar(clave, version, fuera_umbral)
+        return fuera_umbral
+    
+    def exportar_resumen(self, nodo: str):
+        """
+        Exporta un resumen combinable de todas las lecturas (sin las lecturas).
+        Solo se procesan las lecturas llegadas desde la exportación anterior.
+        
+        Args:
+            nodo (str): Id estable del nodo (el mismo tras reiniciarlo, para que el
+                        agregador reemplace su resumen en lugar de contarlo dos veces)
+        
+        Returns:
+            ResumenAnalizador (serializable con .a_json() y combinable con .combinar())
+        """
+        from resumen_distribuido import ResumenAnalizador, ResumenTipo
+        
+        if not nodo:
+            raise ValueError("exportar_resumen necesita el id estable del nodo")
+        
+        tipos = {}
+        for tipo in self.almacen.tipos_registrados():
+            valores = self.almacen.columna(tipo).valores
+            resumen, incorporadas = self._resumenes.get(tipo, (None, 0))
+            if resumen is None or incorporadas > len(valores):
+                resumen, incorporadas = ResumenTipo(), 0
+            resumen.agregar_valores(valores[incorporadas:])
+            self._resumenes[tipo] = (resumen, len(valores))
+            tipos[tipo] = resumen.copia()
+        # Marca (época, número): la época cambia al reiniciar el proceso y el
+        # número ordena las exportaciones de una misma época
+        if self._epoca_resumen is None:
+            self._epoca_resumen = time_ns()
+        self._exportaciones += 1
+        return ResumenAnalizador(tipos, [nodo], {nodo: (self._epoca_resumen, self._exportaciones)})
+    
+    def construir_reporte(self, procesos: int = None):
+        """
+        Construye el reporte completo recorriendo las lecturas de cada tipo una sola vez
+        
+        Args:
+            procesos (int): Si es mayor que 1, reparte el análisis en un pool de procesos
+        
+        Returns:
+            ReporteSensores con estadísticas, atípicos y valores fuera de umbral por tipo
+        """
+        if procesos is not None and procesos > 1:
+            from analisis_paralelo import analizar_en_paralelo
+            return analizar_en_paralelo(self.almacen, procesos)
+        return construir_reporte(self.almacen)
+    
+    def generar_reporte_completo(self, procesos: int = None):
+        """
+        Genera un reporte completo con todas las estadísticas
+        
+        Args:
+            procesos (int): Procesos para el análisis paralelo (opcional)
+        """
+        reporte = self.construir_reporte(procesos)
+        renderizar_reporte(reporte, self.almacen, self.colores)
+        return reporte
+
+# Función principal del programa 5
+def ejecutar_analizador_sensores():
+    """Ejecuta el analizador de datos de sensores"""
+    import random
+    
+    analizador = AnalizadorSensores()
+    
+    print(f"{analizador.colores['titulo']}📊 INICIANDO ANALIZADOR DE DATOS DE SENSORES{analizador.colores['normal']}")
+    
+    # Generar datos de ejemplo más realistas con algunos valores atípicos
+    print(f"\n{analizador.colores['dato']}📝 GENERANDO DATOS DE EJEMPLO...{analizador.colores['normal']}")
+    
+    # Datos normales de temperatura (20°C ± 3°C)
+    for i in range(20):
+        valor = 20.0 + (random.uniform(-3, 3))
+        analizador.agregar_lectura(round(valor, 1), "temperatura", f"2023-10-15 {10+i//2}:{i%2*30:02d}")
+    
+    # Algunos valores atípicos de temperatura
+    analizador.agregar_lectura(35.5, "temperatura", "2023-10-15 11:45")  # Muy alto
+    analizador.agregar_lectura(12.3, "temperatura", "2023-10-15 12:15")  # Muy bajo
+    
+    # Datos de humedad (50% ± 15%)
+    for i in range(15):
+        valor = 50.0 + (random.uniform(-15, 15))
+        analizador.agregar_lectura(round(valor, 1), "humedad", f"2023-10-15 {11+i//3}:{i%3*20:02d}")
+    
+    # Algunos valores atípicos de humedad
+    analizador.agregar_lectura(85.7, "humedad", "2023-10-15 12:30")  # Muy alto
+    analizador.agregar_lectura(25.2, "humedad", "2023-10-15 13:10")  # Muy bajo
+    
+    # Datos de presión (1010 ± 5)
+    for i in range(10):
+        valor = 1010.0 + (random.uniform(-5, 5))
+        analizador.agregar_lectura(round(valor, 1), "presion", f"2023-10-15 {12+i//2}:{i%2*30:02d}")
+    
+    # Generar reporte completo
+    analizador.generar_reporte_completo()
+    
+    # Análisis específico por tipo de sensor
+    print(f"\n{analizador.colores['titulo']}🔍 ANÁLISIS DETALLADO POR SENSOR:{analizador.colores['normal']}")
+    
+    for tipo in ["temperatura", "humedad", "presion"]:
+        datos = analizador.filtrar_por_tipo(tipo)
+        if datos:
+            print(f"\n{analizador.colores['estadistica']}📈 {tipo.upper()}:{analizador.colores['normal']}")
+            stats = analizador.calcular_estadisticas(tipo)
+            print(f"   • Mínimo: {stats['minimo']:.2f}")
+            print(f"   • Máximo: {stats['maximo']:.2f}")
+            print(f"   • Promedio: {stats['promedio']:.2f}")
+            
+            atipicos = analizador.detectar_valores_atipicos(tipo)
+            print(f"   • Valores atípicos: {len(atipicos)}")
+            
+            if tipo in ["temperatura", "humedad"]:
+                fuera_umbral = analizador.verificar_umbrales_seguros(tipo)
+                print(f"   • Fuera de umbral seguro: {len(fuera_umbral)}")
+
+if __name__ == "__main__":
     ejecutar_analizador_sensores()
\ No newline at end of file
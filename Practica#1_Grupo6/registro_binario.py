@@ -0,0 +1,388 @@
+# -*- coding: utf-8 -*-
+"""
+REGISTRO BINARIO PERSISTENTE DE LECTURAS
+Segmentos de solo anexado y ancho fijo en un directorio:
+  tipos.txt       Diccionario de tipos (el código es el número de línea)
+  secuencia.seg   uint16 con el código de tipo de cada lectura en orden de llegada
+  cN.val / cN.ts  float64 con los valores e int64 con los tiempos (ns epoch) del tipo de código N
+  resumen.json    Punto de control de los agregados incrementales
+Cada segmento empieza con una cabecera de 16 bytes y guarda los datos en el orden
+de bytes nativo; el lector los proyecta en memoria (mmap) y expone memoryviews
+sin copia sobre los datos.
+Los segmentos se vuelcan por separado, así que tras una caída la secuencia y las
+columnas pueden no coincidir. El punto de control guarda la longitud de la
+secuencia y las lecturas de cada columna: si coinciden con el tamaño de los
+segmentos, la apertura no lee los datos; si no, se concilian por código de tipo
+y se descartan las lecturas incompletas.
+"""
+
+import json
+import mmap
+import os
+import struct
+from array import array
+
+from almacen_lecturas import AlmacenColumnar
+from estadisticas_flujo import EstadisticasIncrementales
+
+MAGICO = b"IOTSEG02"  # Versión 2: tiempos en nanosegundos epoch
+TAMANO_CABECERA = 16
+ARCHIVO_TIPOS = "tipos.txt"
+ARCHIVO_SECUENCIA = "secuencia.seg"
+ARCHIVO_RESUMEN = "resumen.json"
+
+
+def _cabecera(codigo_tipo: str):
+    """Cabecera de 16 bytes: número mágico + código de tipo de array"""
+    return MAGICO + codigo_tipo.encode("ascii").ljust(TAMANO_CABECERA - len(MAGICO), b"\0")
+
+
+def _rutas_columna(ruta: str, codigo: int):
+    """Rutas de los segmentos de valores y tiempos de un código de tipo"""
+    return os.path.join(ruta, f"c{codigo}.val"), os.path.join(ruta, f"c{codigo}.ts")
+
+
+def _leer_tipos(ruta: str):
+    """Lee el diccionario de tipos del registro"""
+    ruta_tipos = os.path.join(ruta, ARCHIVO_TIPOS)
+    if not os.path.exists(ruta_tipos):
+        return []
+    with open(ruta_tipos, "r", encoding="utf-8") as archivo:
+        return [linea.rstrip("\n") for linea in archivo if linea.strip()]
+
+
+def _tamano_segmento(ruta_segmento: str):
+    """Tamaño en bytes de un segmento; uno inexistente o sin cabecera cuenta como vacío"""
+    if not os.path.exists(ruta_segmento):
+        return TAMANO_CABECERA
+    return max(os.path.getsize(ruta_segmento), TAMANO_CABECERA)
+
+
+def _cantidades_verificadas(ruta: str, tipos, punto_control):
+    """
+    Devuelve las lecturas por código de tipo guardadas en el punto de control si
+    coinciden con el tamaño de todos los segmentos (sin leer los datos), o None
+
+    Args:
+        ruta (str): Directorio del registro
+        tipos (list): Tipos del registro en orden de código
+        punto_control (dict): Punto de control leído de resumen.json (o None)
+    """
+    if not punto_control or "cantidades" not in punto_control:
+        return None
+    cantidades = punto_control["cantidades"]
+    total = punto_control["secuencia"]
+    if len(cantidades) != len(tipos) or sum(cantidades) != total:
+        return None
+    if _tamano_segmento(os.path.join(ruta, ARCHIVO_SECUENCIA)) != TAMANO_CABECERA + total * struct.calcsize("H"):
+        return None
+    for codigo, cantidad in enumerate(cantidades):
+        ruta_val, ruta_ts = _rutas_columna(ruta, codigo)
+        if (_tamano_segmento(ruta_val) != TAMANO_CABECERA + cantidad * struct.calcsize("d")
+                or _tamano_segmento(ruta_ts) != TAMANO_CABECERA + cantidad * struct.calcsize("q")):
+            return None
+    return cantidades
+
+
+def _leer_punto_control(ruta: str):
+    """Devuelve el punto de control de agregados o None si no existe"""
+    ruta_resumen = os.path.join(ruta, ARCHIVO_RESUMEN)
+    if not os.path.exists(ruta_resumen):
+        return None
+    with open(ruta_resumen, "r", encoding="utf-8") as archivo:
+        return json.load(archivo)
+
+
+def _conciliar(secuencia, longitudes):
+    """
+    Concilia la secuencia con las longitudes de las columnas por código de tipo
+
+    Args:
+        secuencia: Códigos de tipo en orden de llegada (memoryview 'H' o array)
+        longitudes (list): Lecturas completas (valor y tiempo) de cada columna
+
+    Returns:
+        (secuencia, cantidades): la secuencia conciliada (None si no cambia) y las
+        lecturas de cada columna que referencia; las columnas deben recortarse a ellas
+    """
+    codigos = array('H')
+    codigos.frombytes(memoryview(secuencia).cast('B'))
+    cantidades = [codigos.count(codigo) for codigo in range(len(longitudes))]
+    if sum(cantidades) == len(codigos) and all(map(int.__le__, cantidades, longitudes)):
+        return None, cantidades
+
+    # Se quitan las entradas cuyo índice dentro de su columna no llegó a escribirse
+    conservados = array('H')
+    cantidades = [0] * len(longitudes)
+    for codigo in codigos:
+        if codigo < len(longitudes) and cantidades[codigo] < longitudes[codigo]:
+            cantidades[codigo] += 1
+            conservados.append(codigo)
+    return conservados, cantidades
+
+
+def _recortar(ruta_segmento: str, codigo_tipo: str, cantidad: int):
+    """Trunca un segmento a la cabecera más `cantidad` elementos si es más largo"""
+    if not os.path.exists(ruta_segmento):
+        return
+    tamano = TAMANO_CABECERA + cantidad * struct.calcsize(codigo_tipo)
+    if os.path.getsize(ruta_segmento) > tamano:
+        os.truncate(ruta_segmento, tamano)
+
+
+def reparar_registro(ruta: str):
+    """
+    Deja en disco un registro coherente tras una escritura interrumpida: quita de la
+    secuencia las lecturas cuyas columnas no llegaron a escribirse y recorta las
+    columnas (y los bytes sueltos) a las lecturas que la secuencia referencia.
+    Si el punto de control coincide con el tamaño de los segmentos no lee nada.
+
+    Args:
+        ruta (str): Directorio del registro
+
+    Returns:
+        list: Lecturas de cada columna por código de tipo tras la reparación
+    """
+    cantidades = _cantidades_verificadas(ruta, _leer_tipos(ruta), _leer_punto_control(ruta))
+    if cantidades is not None:
+        return list(cantidades)
+
+    lector = LectorRegistro(ruta)
+    try:
+        longitudes = [len(lector.valores[tipo]) for tipo in lector.tipos]
+        total = len(lector.secuencia)
+        secuencia, cantidades = _conciliar(lector.secuencia, longitudes)
+    finally:
+        lector.cerrar()
+
+    ruta_secuencia = os.path.join(ruta, ARCHIVO_SECUENCIA)
+    if secuencia is None:
+        _recortar(ruta_secuencia, "H", total)
+    else:
+        ruta_temporal = ruta_secuencia + ".tmp"
+        with open(ruta_temporal, "wb") as archivo:
+            archivo.write(_cabecera("H"))
+            archivo.write(secuencia.tobytes())
+        os.replace(ruta_temporal, ruta_secuencia)
+    for codigo, cantidad in enumerate(cantidades):
+        ruta_val, ruta_ts = _rutas_columna(ruta, codigo)
+        _recortar(ruta_val, "d", cantidad)
+        _recortar(ruta_ts, "q", cantidad)
+    return cantidades
+
+
+def existe_registro(ruta: str):
+    """Indica si el directorio ya contiene un registro con al menos un tipo"""
+    return bool(_leer_tipos(ruta))
+
+
+class EscritorRegistro:
+    def __init__(self, ruta: str):
+        """
+        Abre (o crea) un registro en modo de solo anexado; un registro existente se
+        repara antes (ver reparar_registro) para que lo anexado quede alineado
+
+        Args:
+            ruta (str): Directorio del registro
+        """
+        os.makedirs(ruta, exist_ok=True)
+        self.ruta = ruta
+        self.codigos = {tipo: codigo for codigo, tipo in enumerate(_leer_tipos(ruta))}
+        # Lecturas de cada columna por código de tipo (van al punto de control)
+        self.cantidades = reparar_registro(ruta) if self.codigos else []
+        self.archivo_tipos = open(os.path.join(ruta, ARCHIVO_TIPOS), "a", encoding="utf-8")
+        self.secuencia = self._abrir(os.path.join(ruta, ARCHIVO_SECUENCIA), "H")
+        self.columnas = {}  # código -> (archivo de valores, archivo de tiempos)
+
+    @staticmethod
+    def _abrir(ruta_segmento: str, codigo_tipo: str):
+        """Abre un segmento para anexar y escribe la cabecera si es nuevo"""
+        archivo = open(ruta_segmento, "ab")
+        if archivo.tell() == 0:
+            archivo.write(_cabecera(codigo_tipo))
+        return archivo
+
+    def _columna(self, tipo_sensor: str):
+        """Obtiene los archivos de la columna de un tipo, registrándolo si es nuevo"""
+        codigo = self.codigos.get(tipo_sensor)
+        if codigo is None:
+            codigo = len(self.codigos)
+            self.codigos[tipo_sensor] = codigo
+            self.cantidades.append(0)
+            self.archivo_tipos.write(tipo_sensor + "\n")
+            self.archivo_tipos.flush()
+        archivos = self.columnas.get(codigo)
+        if archivos is None:
+            ruta_val, ruta_ts = _rutas_columna(self.ruta, codigo)
+            archivos = (self._abrir(ruta_val, "d"), self._abrir(ruta_ts, "q"))
+            self.columnas[codigo] = archivos
+        return codigo, archivos
+
+    def agregar(self, valor: float, tipo_sensor: str, tiempo: int):
+        """
+        Anexa una lectura al registro
+
+        Args:
+            valor (float): Valor de la lectura
+            tipo_sensor (str): Tipo de sensor
+            tiempo (int): Marca de tiempo entera (la misma unidad que usa el almacén)
+        """
+        codigo, (archivo_val, archivo_ts) = self._columna(tipo_sensor)
+        archivo_val.write(struct.pack("=d", valor))
+        archivo_ts.write(struct.pack("=q", tiempo))
+        self.secuencia.write(struct.pack("=H", codigo))
+        self.cantidades[codigo] += 1
+
+    def sincronizar(self):
+        """Vuelca los búferes de escritura al sistema operativo (columnas antes que la secuencia)"""
+        for archivo_val, archivo_ts in self.columnas.values():
+            archivo_val.flush()
+            archivo_ts.flush()
+        self.secuencia.flush()
+
+    def guardar_resumen(self, almacen: AlmacenColumnar):
+        """
+        Escribe el punto de control de agregados para que la reapertura no recorra los datos
+
+        Args:
+            almacen (AlmacenColumnar): Almacén cuyos agregados se guardan
+        """
+        self.sincronizar()
+        resumen = {
+            "secuencia": sum(self.cantidades),
+            "cantidades": self.cantidades,
+            "total": len(almacen),
+            "global": almacen.resumen.exportar_estado(),
+            "tipos": {tipo: columna.resumen.exportar_estado()
+                      for tipo, columna in almacen.columnas.items()}
+        }
+        ruta_temporal = os.path.join(self.ruta, ARCHIVO_RESUMEN + ".tmp")
+        with open(ruta_temporal, "w", encoding="utf-8") as archivo:
+            json.dump(resumen, archivo)
+        os.replace(ruta_temporal, os.path.join(self.ruta, ARCHIVO_RESUMEN))
+
+    def cerrar(self):
+        """Vuelca y cierra todos los segmentos"""
+        self.sincronizar()
+        self.archivo_tipos.close()
+        self.secuencia.close()
+        for archivo_val, archivo_ts in self.columnas.values():
+            archivo_val.close()
+            archivo_ts.close()
+        self.columnas = {}
+
+
+class LectorRegistro:
+    def __init__(self, ruta: str):
+        """
+        Proyecta en memoria los segmentos de un registro
+
+        Args:
+            ruta (str): Directorio del registro
+        """
+        self.ruta = ruta
+        self.tipos = _leer_tipos(ruta)
+        self._mapas = []   # mmaps abiertos
+        self._vistas = []  # memoryviews exportadas (hay que liberarlas antes de cerrar)
+        self.secuencia = self._proyectar(os.path.join(ruta, ARCHIVO_SECUENCIA), "H")
+        self.valores = {}  # tipo -> memoryview('d')
+        self.tiempos = {}  # tipo -> memoryview('q')
+        for codigo, tipo in enumerate(self.tipos):
+            ruta_val, ruta_ts = _rutas_columna(ruta, codigo)
+            valores = self._proyectar(ruta_val, "d")
+            tiempos = self._proyectar(ruta_ts, "q")
+            # Una escritura interrumpida puede dejar columnas desparejas
+            cantidad = min(len(valores), len(tiempos))
+            self.valores[tipo] = valores[:cantidad]
+            self.tiempos[tipo] = tiempos[:cantidad]
+            self._vistas.extend((self.valores[tipo], self.tiempos[tipo]))
+
+    def _proyectar(self, ruta_segmento: str, codigo_tipo: str):
+        """Devuelve una memoryview de solo lectura sobre los datos del segmento"""
+        if not os.path.exists(ruta_segmento) or os.path.getsize(ruta_segmento) <= TAMANO_CABECERA:
+            return memoryview(array(codigo_tipo))
+        with open(ruta_segmento, "rb") as archivo:
+            mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapa[:TAMANO_CABECERA] != _cabecera(codigo_tipo):
+            mapa.close()
+            raise ValueError(f"Segmento inválido: {ruta_segmento}")
+        self._mapas.append(mapa)
+        bruto = memoryview(mapa)
+        tamano = struct.calcsize(codigo_tipo)
+        fin = TAMANO_CABECERA + (len(mapa) - TAMANO_CABECERA) // tamano * tamano
+        vista = bruto[TAMANO_CABECERA:fin].cast(codigo_tipo)
+        self._vistas.extend((bruto, vista))
+        return vista
+
+    def leer_resumen(self):
+        """Devuelve el punto de control de agregados o None si no existe"""
+        return _leer_punto_control(self.ruta)
+
+    def cerrar(self):
+        """
+        Libera las vistas y cierra las proyecciones en memoria.
+        Si otras vistas (p. ej. columnas de un almacén) siguen en uso, la
+        proyección se cierra cuando el recolector las libere.
+        """
+        for vista in reversed(self._vistas):
+            vista.release()
+        for mapa in self._mapas:
+            try:
+                mapa.close()
+            except BufferError:
+                pass
+        self._vistas = []
+        self._mapas = []
+
+
+def _restaurar_resumen(estado, valores):
+    """
+    Restaura agregados desde el punto de control e incorpora solo las lecturas posteriores.
+    Si el punto de control no corresponde a los datos, recalcula desde cero.
+    """
+    if estado is not None and estado["cantidad"] <= len(valores):
+        resumen = EstadisticasIncrementales.restaurar_estado(estado)
+        inicio = estado["cantidad"]
+    else:
+        resumen = EstadisticasIncrementales()
+        inicio = 0
+    for valor in valores[inicio:]:
+        resumen.agregar(valor)
+    return resumen
+
+
+def cargar_almacen(lector: LectorRegistro, cantidades=None):
+    """
+    Construye un AlmacenColumnar cuyas columnas son vistas sin copia del registro.
+    Las columnas se copian a memoria solo cuando se les agrega una lectura nueva.
+
+    Args:
+        lector (LectorRegistro): Registro proyectado en memoria
+        cantidades (list): Lecturas por código de tipo ya conciliadas (p. ej. las
+                           de EscritorRegistro tras reparar); si faltan se verifican
+                           con el punto de control o se concilian recorriendo la secuencia
+    """
+    punto_control = lector.leer_resumen()
+    secuencia = None
+    if cantidades is None:
+        cantidades = _cantidades_verificadas(lector.ruta, lector.tipos, punto_control)
+    if cantidades is None:
+        # Tras una escritura interrumpida la secuencia y las columnas pueden no coincidir
+        secuencia, cantidades = _conciliar(lector.secuencia, [len(lector.valores[tipo]) for tipo in lector.tipos])
+    punto_control = punto_control or {"tipos": {}}
+    almacen = AlmacenColumnar()
+    for tipo, cantidad in zip(lector.tipos, cantidades):
+        columna = almacen.columna(tipo, crear=True)
+        columna.valores = lector.valores[tipo][:cantidad]
+        columna.tiempos = lector.tiempos[tipo][:cantidad]
+        columna.resumen = _restaurar_resumen(punto_control["tipos"].get(tipo), columna.valores)
+        columna.version = len(columna.valores)
+    almacen.secuencia = lector.secuencia if secuencia is None else secuencia
+
+    if punto_control.get("total") == len(almacen) and "global" in punto_control:
+        almacen.resumen = EstadisticasIncrementales.restaurar_estado(punto_control["global"])
+    else:
+        almacen.resumen = EstadisticasIncrementales()
+        for valor, _, _ in almacen.lecturas_crudas():
+            almacen.resumen.agregar(valor)
+    return almacen
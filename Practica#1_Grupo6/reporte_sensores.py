@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+"""
+REPORTE AGRUPADO DE SENSORES
+Construye el reporte completo recorriendo cada grupo de lecturas una sola vez
+(el almacén ya particiona las lecturas por tipo) y lo imprime por separado
+"""
+
+import math
+from array import array
+
+from motor_atipicos import (MINIMO_LECTURAS, UMBRALES_METODO, ResultadoAtipicos,
+                            cuartiles, mediana_ordenada)
+
+# Umbrales seguros según el tipo de sensor
+UMBRALES_SEGUROS = {
+    "temperatura": {"min": 18.0, "max": 30.0},
+    "humedad": {"min": 30.0, "max": 80.0},
+    "presion": {"min": 1000.0, "max": 1020.0},
+    "calidad_aire": {"min": 0.0, "max": 100.0}
+}
+
+
+class ReporteTipo:
+    """Resultados del reporte para un tipo de sensor"""
+
+    __slots__ = ("tipo", "estadisticas", "atipicos", "fuera_umbral", "umbral")
+
+    def __init__(self, tipo, estadisticas, atipicos, fuera_umbral, umbral):
+        self.tipo = tipo
+        self.estadisticas = estadisticas  # Diccionario con las claves de calcular_estadisticas
+        self.atipicos = atipicos          # ResultadoAtipicos o None si hay pocos datos
+        self.fuera_umbral = fuera_umbral  # array('q') de posiciones fuera del umbral seguro
+        self.umbral = umbral              # {"min", "max"} o None si el tipo no tiene umbral
+
+
+class ReporteSensores:
+    """Reporte completo: un ReporteTipo por cada tipo de sensor"""
+
+    def __init__(self, tipos: dict):
+        self.tipos = tipos  # tipo -> ReporteTipo
+
+    def __iter__(self):
+        return iter(self.tipos.values())
+
+    def __getitem__(self, tipo):
+        return self.tipos[tipo]
+
+    @property
+    def total_lecturas(self):
+        return sum(r.estadisticas["cantidad"] for r in self.tipos.values())
+
+
+def analizar_grupo(tipo: str, valores, umbral: dict = None):
+    """
+    Calcula estadísticas, atípicos (IQR) y valores fuera de umbral de un grupo de lecturas
+
+    Args:
+        tipo (str): Tipo de sensor del grupo
+        valores: Secuencia de valores del grupo (no vacía)
+        umbral (dict): Umbral seguro {"min", "max"} (opcional)
+    """
+    n = len(valores)
+    ordenados = sorted(valores)  # Una sola ordenación: extremos, mediana y cuartiles
+    media = math.fsum(valores) / n
+    desviacion = math.sqrt(math.fsum((v - media) ** 2 for v in valores) / (n - 1)) if n > 1 else 0
+
+    estadisticas = {
+        "maximo": ordenados[-1],
+        "minimo": ordenados[0],
+        "promedio": media,
+        "mediana": mediana_ordenada(ordenados),
+        "desviacion_estandar": desviacion,
+        "rango": ordenados[-1] - ordenados[0],
+        "cantidad": n
+    }
+
+    # Límites de atípicos (inalcanzables si hay pocos datos)
+    if n >= MINIMO_LECTURAS:
+        q1, q3 = cuartiles(ordenados)
+        iqr = q3 - q1
+        limite_inferior = q1 - UMBRALES_METODO["iqr"] * iqr
+        limite_superior = q3 + UMBRALES_METODO["iqr"] * iqr
+    else:
+        limite_inferior, limite_superior = -math.inf, math.inf
+
+    min_seguro = umbral["min"] if umbral else -math.inf
+    max_seguro = umbral["max"] if umbral else math.inf
+
+    # Única pasada para atípicos y umbrales
+    atipicos = array('q')
+    fuera_umbral = array('q')
+    for i, v in enumerate(valores):
+        if v < limite_inferior or v > limite_superior:
+            atipicos.append(i)
+        if v < min_seguro or v > max_seguro:
+            fuera_umbral.append(i)
+
+    resultado_atipicos = None
+    if n >= MINIMO_LECTURAS:
+        resultado_atipicos = ResultadoAtipicos(tipo, "iqr", atipicos, limite_inferior, limite_superior, media)
+
+    return ReporteTipo(tipo, estadisticas, resultado_atipicos, fuera_umbral, umbral)
+
+
+def construir_reporte(almacen, umbrales: dict = None):
+    """
+    Construye el reporte completo recorriendo cada columna del almacén una vez
+
+    Args:
+        almacen (AlmacenColumnar): Almacén con las lecturas agrupadas por tipo
+        umbrales (dict): Umbrales seguros por tipo (por defecto UMBRALES_SEGUROS)
+    """
+    if umbrales is None:
+        umbrales = UMBRALES_SEGUROS
+
+    tipos = {}
+    for tipo in almacen.tipos_registrados():
+        valores = almacen.columna(tipo).valores
+        tipos[tipo] = analizar_grupo(tipo, valores, umbrales.get(tipo))
+    return ReporteSensores(tipos)
+
+
+def renderizar_reporte(reporte: ReporteSensores, almacen, colores: dict,
+                       tipos_con_umbral=("temperatura", "humedad")):
+    """
+    Imprime un reporte ya construido
+
+    Args:
+        reporte (ReporteSensores): Reporte a imprimir
+        almacen (AlmacenColumnar): Almacén del que se obtienen los valores atípicos
+        colores (dict): Paleta de colores ANSI del analizador
+        tipos_con_umbral: Tipos para los que se muestran los valores fuera de umbral
+    """
+    print(f"\n{colores['titulo']}{'='*80}")
+    print("                     REPORTE COMPLETO DE SENSORES")
+    print(f"{'='*80}{colores['normal']}")
+
+    for reporte_tipo in reporte:
+        tipo = reporte_tipo.tipo
+        stats = reporte_tipo.estadisticas
+        print(f"\n{colores['estadistica']}📊 {tipo.upper()}:{colores['normal']}")
+        print(f"   • Lecturas: {stats['cantidad']}")
+        print(f"   • Rango: {stats['minimo']:.2f} - {stats['maximo']:.2f}")
+        print(f"   • Promedio: {stats['promedio']:.2f}")
+        print(f"   • Desviación estándar: {stats['desviacion_estandar']:.2f}")
+
+        atipicos = reporte_tipo.atipicos
+        if atipicos:
+            valores = almacen.columna(tipo).valores
+            print(f"   {colores['atipico']}• Valores atípicos: {len(atipicos)}{colores['normal']}")
+            for indice in atipicos.indices[:3]:  # Mostrar solo los 3 primeros
+                valor = valores[indice]
+                print(f"     ◦ {valor:.2f} (desviación: {abs(valor - atipicos.media):.2f})")
+
+        if tipo in tipos_con_umbral and reporte_tipo.fuera_umbral:
+            print(f"   {colores['advertencia']}• Valores fuera de umbral seguro: {len(reporte_tipo.fuera_umbral)}{colores['normal']}")
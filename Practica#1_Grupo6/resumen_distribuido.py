@@ -0,0 +1,462 @@
+# -*- coding: utf-8 -*-
+"""
+RESÚMENES COMBINABLES PARA ANÁLISIS DISTRIBUIDO
+Cada nodo (un AnalizadorSensores) exporta por tipo de sensor un resumen pequeño y
+serializable: cantidad, suma, momentos de Welford, mínimo/máximo y un bosquejo de
+cuantiles con error relativo acotado (estilo DDSketch). Los resúmenes se combinan
+de forma asociativa, así que un agregador central obtiene estadísticas globales y
+límites IQR aproximados sin recibir las lecturas. Mientras un tipo no pasa de
+LIMITE_EXACTO lecturas el resumen las conserva y la mediana y los límites son exactos.
+Cada resumen lleva el id estable de su nodo y una marca (época, número de
+exportación): el agregador guarda el último resumen de cada nodo aunque este se
+reinicie.
+"""
+
+import heapq
+import json
+import math
+from functools import reduce
+
+from estadisticas_flujo import LIMITE_EXACTO, combinar_momentos
+from motor_atipicos import cuartiles
+
+VERSION_FORMATO = 1
+ALFA_POR_DEFECTO = 0.0005  # Error relativo máximo de los cuantiles (±0.5 en 1000 hPa)
+UMBRAL_IQR = 1.5
+# Cubetas máximas por signo; con ALFA_POR_DEFECTO cubren ~1.8 órdenes de magnitud
+# sin pérdida. Al superarlas se funden las de menor magnitud (como en DDSketch),
+# así que los cuantiles bajos de datos de rango muy amplio pierden precisión
+MAX_CUBETAS = 4096
+
+
+def _colapsar(cubetas: dict, max_cubetas: int):
+    """
+    Funde las cubetas de menor índice en una sola para no pasar de max_cubetas
+
+    Returns:
+        El índice de la cubeta fundida (los valores menores se cuentan en ella)
+    """
+    sobrantes = heapq.nsmallest(len(cubetas) - max_cubetas + 1, cubetas)
+    suelo = sobrantes[-1]
+    cubetas[suelo] += sum(cubetas.pop(indice) for indice in sobrantes[:-1])
+    return suelo
+
+
+def _sumar_cubeta(cubetas: dict, indice: int, cantidad: int, suelo, max_cubetas: int):
+    """Suma en una cubeta respetando el suelo de colapso; devuelve el suelo (None si no hay)"""
+    if suelo is not None and indice < suelo:
+        indice = suelo
+    cubetas[indice] = cubetas.get(indice, 0) + cantidad
+    if len(cubetas) > max_cubetas:
+        suelo = _colapsar(cubetas, max_cubetas)
+    return suelo
+
+
+class BosquejoCuantiles:
+    """
+    Histograma con cubetas de ancho logarítmico: el valor v cae en la cubeta
+    ceil(log_gamma(|v|)) con gamma = (1 + alfa) / (1 - alfa). Cualquier cuantil se
+    estima con error relativo <= alfa y dos bosquejos con el mismo alfa se
+    combinan sumando sus cubetas. Cada signo guarda como mucho max_cubetas: al
+    superarlas se funden las de menor magnitud y sus cuantiles pierden precisión.
+    """
+
+    __slots__ = ("alfa", "gamma", "_log_gamma", "max_cubetas", "positivas", "negativas", "ceros",
+                 "suelo_positivas", "suelo_negativas")
+
+    def __init__(self, alfa: float = ALFA_POR_DEFECTO, max_cubetas: int = MAX_CUBETAS):
+        self.alfa = alfa
+        self.gamma = (1 + alfa) / (1 - alfa)
+        self._log_gamma = math.log(self.gamma)
+        self.max_cubetas = max_cubetas
+        self.positivas = {}  # índice de cubeta -> cantidad
+        self.negativas = {}  # índice de cubeta de |v| -> cantidad
+        self.ceros = 0
+        self.suelo_positivas = None  # Índice de la cubeta fundida (None si nunca se colapsó)
+        self.suelo_negativas = None
+
+    def __len__(self):
+        return sum(self.positivas.values()) + sum(self.negativas.values()) + self.ceros
+
+    def agregar(self, valor: float):
+        """Incorpora un valor"""
+        if valor > 0:
+            indice = math.ceil(math.log(valor) / self._log_gamma)
+            if indice in self.positivas:
+                self.positivas[indice] += 1
+            else:
+                self.suelo_positivas = _sumar_cubeta(self.positivas, indice, 1, self.suelo_positivas,
+                                                     self.max_cubetas)
+        elif valor < 0:
+            indice = math.ceil(math.log(-valor) / self._log_gamma)
+            if indice in self.negativas:
+                self.negativas[indice] += 1
+            else:
+                self.suelo_negativas = _sumar_cubeta(self.negativas, indice, 1, self.suelo_negativas,
+                                                     self.max_cubetas)
+        else:
+            self.ceros += 1
+
+    def _valor_cubeta(self, indice: int):
+        """Valor representativo de una cubeta (error relativo <= alfa)"""
+        return 2 * self.gamma ** indice / (self.gamma + 1)
+
+    def cuantil(self, q: float):
+        """
+        Estima el cuantil q (0-1); None si el bosquejo está vacío
+
+        Args:
+            q (float): Cuantil buscado (0.25 = primer cuartil)
+        """
+        total = len(self)
+        if total == 0:
+            return None
+        rango = q * (total - 1)
+        acumulado = 0
+        # Orden creciente: negativos de mayor a menor magnitud, ceros y positivos
+        for indice in sorted(self.negativas, reverse=True):
+            acumulado += self.negativas[indice]
+            if acumulado > rango:
+                return -self._valor_cubeta(indice)
+        acumulado += self.ceros
+        if acumulado > rango:
+            return 0.0
+        for indice in sorted(self.positivas):
+            acumulado += self.positivas[indice]
+            if acumulado > rango:
+                return self._valor_cubeta(indice)
+        return self._valor_cubeta(max(self.positivas)) if self.positivas else 0.0
+
+    def combinar(self, otro: "BosquejoCuantiles"):
+        """Devuelve un bosquejo nuevo con las cubetas de ambos"""
+        if otro.alfa != self.alfa:
+            raise ValueError("Solo se pueden combinar bosquejos con el mismo alfa")
+        combinado = BosquejoCuantiles(self.alfa, self.max_cubetas)
+        # El suelo combinado es el mayor de los dos: lo que queda por debajo se funde en él
+        suelos = [s for s in (self.suelo_positivas, otro.suelo_positivas) if s is not None]
+        combinado.suelo_positivas = max(suelos) if suelos else None
+        suelos = [s for s in (self.suelo_negativas, otro.suelo_negativas) if s is not None]
+        combinado.suelo_negativas = max(suelos) if suelos else None
+        for cubetas in (self.positivas, otro.positivas):
+            for indice, cantidad in cubetas.items():
+                combinado.suelo_positivas = _sumar_cubeta(combinado.positivas, indice, cantidad,
+                                                          combinado.suelo_positivas, combinado.max_cubetas)
+        for cubetas in (self.negativas, otro.negativas):
+            for indice, cantidad in cubetas.items():
+                combinado.suelo_negativas = _sumar_cubeta(combinado.negativas, indice, cantidad,
+                                                          combinado.suelo_negativas, combinado.max_cubetas)
+        combinado.ceros = self.ceros + otro.ceros
+        return combinado
+
+    def exportar_estado(self):
+        """Devuelve el estado como diccionario serializable en JSON"""
+        return {"alfa": self.alfa,
+                "max_cubetas": self.max_cubetas,
+                "positivas": {str(i): c for i, c in self.positivas.items()},
+                "negativas": {str(i): c for i, c in self.negativas.items()},
+                "ceros": self.ceros,
+                "suelo_positivas": self.suelo_positivas,
+                "suelo_negativas": self.suelo_negativas}
+
+    @classmethod
+    def restaurar_estado(cls, estado: dict):
+        """Reconstruye un bosquejo a partir de exportar_estado()"""
+        bosquejo = cls(estado["alfa"], estado.get("max_cubetas", MAX_CUBETAS))
+        bosquejo.positivas = {int(i): c for i, c in estado["positivas"].items()}
+        bosquejo.negativas = {int(i): c for i, c in estado["negativas"].items()}
+        bosquejo.ceros = estado["ceros"]
+        bosquejo.suelo_positivas = estado.get("suelo_positivas")
+        bosquejo.suelo_negativas = estado.get("suelo_negativas")
+        # Estados de versiones sin límite de cubetas
+        if len(bosquejo.positivas) > bosquejo.max_cubetas:
+            bosquejo.suelo_positivas = _colapsar(bosquejo.positivas, bosquejo.max_cubetas)
+        if len(bosquejo.negativas) > bosquejo.max_cubetas:
+            bosquejo.suelo_negativas = _colapsar(bosquejo.negativas, bosquejo.max_cubetas)
+        return bosquejo
+
+
+class ResumenTipo:
+    """Resumen combinable de las lecturas de un tipo de sensor"""
+
+    __slots__ = ("cantidad", "suma", "media", "m2", "minimo", "maximo", "bosquejo", "exactos")
+
+    def __init__(self, alfa: float = ALFA_POR_DEFECTO):
+        self.cantidad = 0
+        self.suma = 0.0
+        self.media = 0.0
+        self.m2 = 0.0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+        self.bosquejo = BosquejoCuantiles(alfa)
+        self.exactos = []  # Valores ordenados hasta LIMITE_EXACTO lecturas (luego None)
+
+    def agregar_valores(self, valores):
+        """
+        Incorpora un bloque de valores: momentos del bloque en dos pasadas y
+        combinación con los acumulados (fórmula de Chan)
+
+        Args:
+            valores: Secuencia de valores (list, array o memoryview)
+        """
+        cantidad = len(valores)
+        if cantidad == 0:
+            return
+        suma = math.fsum(valores)
+        media = suma / cantidad
+        m2 = math.fsum((v - media) ** 2 for v in valores)
+        (self.cantidad, self.media, self.m2, self.minimo, self.maximo) = combinar_momentos(
+            (self.cantidad, self.media, self.m2, self.minimo, self.maximo),
+            (cantidad, media, m2, min(valores), max(valores)))
+        self.suma += suma
+        if self.exactos is not None:
+            self.exactos = sorted([*self.exactos, *valores]) if self.cantidad <= LIMITE_EXACTO else None
+        agregar = self.bosquejo.agregar
+        for valor in valores:
+            agregar(valor)
+
+    def combinar(self, otro: "ResumenTipo"):
+        """Devuelve un resumen nuevo equivalente a haber visto las lecturas de ambos"""
+        combinado = ResumenTipo(self.bosquejo.alfa)
+        (combinado.cantidad, combinado.media, combinado.m2, combinado.minimo, combinado.maximo) = combinar_momentos(
+            (self.cantidad, self.media, self.m2, self.minimo, self.maximo),
+            (otro.cantidad, otro.media, otro.m2, otro.minimo, otro.maximo))
+        combinado.suma = self.suma + otro.suma
+        combinado.bosquejo = self.bosquejo.combinar(otro.bosquejo)
+        if self.exactos is not None and otro.exactos is not None and combinado.cantidad <= LIMITE_EXACTO:
+            combinado.exactos = sorted(self.exactos + otro.exactos)
+        else:
+            combinado.exactos = None
+        return combinado
+
+    def cuantil(self, q: float):
+        """Cuantil (exacto con pocas lecturas; si no, aproximado y acotado al mínimo y máximo exactos)"""
+        ordenados = self.exactos
+        if ordenados:
+            posicion = q * (len(ordenados) - 1)
+            inferior = int(posicion)
+            if inferior == len(ordenados) - 1:
+                return ordenados[inferior]
+            return ordenados[inferior] + (posicion - inferior) * (ordenados[inferior + 1] - ordenados[inferior])
+        valor = self.bosquejo.cuantil(q)
+        if valor is None:
+            return None
+        return min(max(valor, self.minimo), self.maximo)
+
+    def limites_iqr(self, umbral: float = UMBRAL_IQR):
+        """
+        Límites de atípicos por rango intercuartílico (aproximados salvo con pocas
+        lecturas, donde coinciden con motor_atipicos.calcular_limites)
+
+        Returns:
+            (limite_inferior, limite_superior) o None si no hay lecturas
+        """
+        if self.cantidad == 0:
+            return None
+        if self.exactos is not None and len(self.exactos) >= 2:
+            q1, q3 = cuartiles(self.exactos)
+        else:
+            q1, q3 = self.cuantil(0.25), self.cuantil(0.75)
+        iqr = q3 - q1
+        return q1 - umbral * iqr, q3 + umbral * iqr
+
+    def como_diccionario(self):
+        """
+        Estadísticas con las mismas claves que calcular_estadisticas: la mediana va en
+        'mediana' mientras es exacta y en 'mediana_aprox' cuando sale del bosquejo
+        """
+        if self.cantidad == 0:
+            return {}
+        return {
+            "maximo": self.maximo,
+            "minimo": self.minimo,
+            "promedio": self.media,
+            "mediana" if self.exactos is not None else "mediana_aprox": self.cuantil(0.5),
+            "desviacion_estandar": math.sqrt(self.m2 / (self.cantidad - 1)) if self.cantidad > 1 else 0,
+            "rango": self.maximo - self.minimo,
+            "cantidad": self.cantidad
+        }
+
+    def exportar_estado(self):
+        """Devuelve el estado como diccionario serializable en JSON"""
+        return {"cantidad": self.cantidad, "suma": self.suma, "media": self.media, "m2": self.m2,
+                "minimo": self.minimo, "maximo": self.maximo,
+                "bosquejo": self.bosquejo.exportar_estado(), "exactos": self.exactos}
+
+    def copia(self):
+        """Instantánea independiente del resumen"""
+        return ResumenTipo.restaurar_estado(self.exportar_estado())
+
+    @classmethod
+    def restaurar_estado(cls, estado: dict):
+        """Reconstruye un resumen a partir de exportar_estado()"""
+        resumen = cls()
+        resumen.cantidad = estado["cantidad"]
+        resumen.suma = estado["suma"]
+        resumen.media = estado["media"]
+        resumen.m2 = estado["m2"]
+        resumen.minimo = estado["minimo"]
+        resumen.maximo = estado["maximo"]
+        resumen.bosquejo = BosquejoCuantiles.restaurar_estado(estado["bosquejo"])
+        resumen.exactos = estado.get("exactos")
+        return resumen
+
+
+class ResumenAnalizador:
+    def __init__(self, tipos: dict = None, nodos=(), marcas: dict = None):
+        """
+        Resúmenes por tipo de sensor de uno o varios analizadores
+
+        Args:
+            tipos (dict): tipo -> ResumenTipo
+            nodos: Ids de los nodos incluidos
+            marcas (dict): nodo -> (época, número de exportación) de su resumen
+        """
+        self.tipos = tipos or {}
+        self.nodos = tuple(nodos)
+        self.marcas = {nodo: tuple(marca) for nodo, marca in (marcas or {}).items()}
+
+    def combinar(self, otro: "ResumenAnalizador"):
+        """
+        Devuelve un resumen nuevo con los tipos de ambos (operación asociativa).
+        No comparte ningún ResumenTipo con los originales.
+        """
+        tipos = {}
+        for tipo, resumen in self.tipos.items():
+            del_otro = otro.tipos.get(tipo)
+            tipos[tipo] = resumen.combinar(del_otro) if del_otro is not None else resumen.copia()
+        for tipo, resumen in otro.tipos.items():
+            if tipo not in tipos:
+                tipos[tipo] = resumen.copia()
+        return ResumenAnalizador(tipos, self.nodos + otro.nodos, {**self.marcas, **otro.marcas})
+
+    def estadisticas(self, tipo_sensor: str):
+        resumen = self.tipos.get(tipo_sensor)
+        return resumen.como_diccionario() if resumen is not None else {}
+
+    def limites_atipicos(self, tipo_sensor: str, umbral: float = UMBRAL_IQR):
+        resumen = self.tipos.get(tipo_sensor)
+        return resumen.limites_iqr(umbral) if resumen is not None else None
+
+    def exportar_estado(self):
+        """Devuelve el resumen como diccionario serializable en JSON"""
+        return {"version": VERSION_FORMATO, "nodos": list(self.nodos),
+                "marcas": {nodo: list(marca) for nodo, marca in self.marcas.items()},
+                "tipos": {tipo: resumen.exportar_estado() for tipo, resumen in self.tipos.items()}}
+
+    @classmethod
+    def restaurar_estado(cls, estado: dict):
+        """Reconstruye un resumen a partir de exportar_estado()"""
+        if estado.get("version") != VERSION_FORMATO:
+            raise ValueError(f"Versión de resumen no soportada: {estado.get('version')}")
+        return cls({tipo: ResumenTipo.restaurar_estado(datos) for tipo, datos in estado["tipos"].items()},
+                   estado["nodos"], estado.get("marcas"))
+
+    def a_json(self):
+        return json.dumps(self.exportar_estado())
+
+    @classmethod
+    def desde_json(cls, texto: str):
+        return cls.restaurar_estado(json.loads(texto))
+
+
+def combinar_resumenes(resumenes):
+    """Combina una secuencia de ResumenAnalizador (el orden y la agrupación no importan)"""
+    return reduce(ResumenAnalizador.combinar, resumenes, ResumenAnalizador())
+
+
+class AgregadorCentral:
+    """
+    Recibe resúmenes acumulados de los nodos y ofrece la vista global.
+    Cada nodo envía su resumen completo con un id estable: el resumen con la marca
+    más reciente de cada nodo reemplaza al anterior, también si el nodo se reinició
+    (época nueva), y los resúmenes atrasados se descartan.
+    """
+
+    def __init__(self):
+        self.por_nodo = {}  # id de nodo -> ResumenAnalizador
+        self._global = None
+
+    def recibir(self, resumen):
+        """
+        Args:
+            resumen: ResumenAnalizador o su JSON (exportado por AnalizadorSensores.exportar_resumen)
+
+        Returns:
+            bool: False si se descartó por ser más antiguo que el último recibido del nodo
+        """
+        if isinstance(resumen, str):
+            resumen = ResumenAnalizador.desde_json(resumen)
+        if len(resumen.nodos) != 1:
+            raise ValueError("El agregador recibe el resumen de un único nodo")
+        nodo = resumen.nodos[0]
+        anterior = self.por_nodo.get(nodo)
+        if anterior is not None and anterior.marcas.get(nodo, ()) > resumen.marcas.get(nodo, ()):
+            return False
+        self.por_nodo[nodo] = resumen
+        self._global = None
+        return True
+
+    def resumen_global(self):
+        if self._global is None:
+            self._global = combinar_resumenes(self.por_nodo.values())
+        return self._global
+
+    def estadisticas(self, tipo_sensor: str):
+        return self.resumen_global().estadisticas(tipo_sensor)
+
+    def limites_atipicos(self, tipo_sensor: str, umbral: float = UMBRAL_IQR):
+        return self.resumen_global().limites_atipicos(tipo_sensor, umbral)
+
+
+def _nodo_simulado(nombre: str, semilla: int, lecturas: int):
+    """Proceso de un nodo: genera sus lecturas, las analiza y devuelve solo el resumen en JSON"""
+    from benchmark_iot import generar_lecturas
+    from programa5_analizador import AnalizadorSensores
+    from salida_eventos import SalidaSilenciosa
+
+    analizador = AnalizadorSensores(SalidaSilenciosa())
+    analizador.agregar_lote(generar_lecturas(lecturas, semilla))
+    return analizador.exportar_resumen(nombre).a_json()
+
+
+def ejecutar_demo_distribuido(nodos: int = 4, lecturas_por_nodo: int = 50000):
+    """
+    Ejemplo local: varios procesos hacen de nodos de borde y el proceso principal
+    combina sus resúmenes; se compara con un único analizador con todas las lecturas
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    from benchmark_iot import generar_lecturas
+    from motor_atipicos import calcular_limites
+    from programa5_analizador import AnalizadorSensores
+    from salida_eventos import SalidaSilenciosa
+
+    print(f"\033[95m🌐 ANÁLISIS DISTRIBUIDO: {nodos} nodos x {lecturas_por_nodo} lecturas\033[0m")
+    central = AgregadorCentral()
+    with ProcessPoolExecutor(max_workers=nodos) as pool:
+        futuros = [pool.submit(_nodo_simulado, f"nodo-{i}", 1000 + i, lecturas_por_nodo) for i in range(nodos)]
+        for futuro in futuros:
+            texto = futuro.result()
+            central.recibir(texto)
+            print(f"   • Resumen recibido: {len(texto)} bytes")
+
+    referencia = AnalizadorSensores(SalidaSilenciosa())
+    for i in range(nodos):
+        referencia.agregar_lote(generar_lecturas(lecturas_por_nodo, 1000 + i))
+
+    for tipo in referencia.almacen.tipos_registrados():
+        exactas = referencia.calcular_estadisticas(tipo, exacto=True)
+        aproximadas = central.estadisticas(tipo)
+        inferior, superior = central.limites_atipicos(tipo)
+        inferior_exacto, superior_exacto, _ = calcular_limites(referencia.almacen.valores(tipo))
+        print(f"\n\033[94m📈 {tipo.upper()}:\033[0m")
+        print(f"   • Lecturas: {aproximadas['cantidad']} (exactas: {exactas['cantidad']})")
+        print(f"   • Promedio: {aproximadas['promedio']:.2f} (exacto: {exactas['promedio']:.2f})")
+        mediana = aproximadas.get("mediana_aprox", aproximadas.get("mediana"))
+        print(f"   • Mediana: {mediana:.2f} (exacta: {exactas['mediana']:.2f})")
+        print(f"   • Límites IQR aproximados: {inferior:.2f} - {superior:.2f} "
+              f"(exactos: {inferior_exacto:.2f} - {superior_exacto:.2f})")
+
+
+if __name__ == "__main__":
+    ejecutar_demo_distribuido()
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+SALIDAS DE EVENTOS
+Destinos intercambiables para los mensajes de las operaciones frecuentes:
+consola con colores, silencio, búfer en memoria o módulo logging.
+Los mensajes usan plantillas estilo '%' que solo se formatean si alguien escucha.
+"""
+
+import logging
+from collections import deque
+
+# Nivel de logging según la clase de color del mensaje
+NIVEL_POR_CLASE = {
+    "inactivo": logging.ERROR,     # Errores del registro de dispositivos
+    "atipico": logging.WARNING,
+    "advertencia": logging.WARNING
+}
+
+
+def _formatear(plantilla: str, args: tuple):
+    """Aplica los argumentos a la plantilla solo si los hay"""
+    return plantilla % args if args else plantilla
+
+
+class SalidaConsola:
+    """Imprime cada evento con su color (comportamiento original)"""
+
+    activo = True
+
+    def __init__(self, colores: dict):
+        self.colores = colores
+
+    def emitir(self, clase: str, plantilla: str, *args):
+        """
+        Imprime un evento
+
+        Args:
+            clase (str): Clave del color en la paleta (exito, dato, inactivo, ...)
+            plantilla (str): Mensaje con marcadores estilo '%'
+            *args: Valores de los marcadores
+        """
+        print(f"{self.colores[clase]}{_formatear(plantilla, args)}{self.colores['normal']}")
+
+
+class SalidaSilenciosa:
+    """Descarta todos los eventos sin formatearlos"""
+
+    activo = False
+
+    def emitir(self, clase: str, plantilla: str, *args):
+        pass
+
+
+class SalidaBuffer:
+    """Guarda los eventos sin formatear en un búfer acotado para volcarlos después"""
+
+    activo = True
+
+    def __init__(self, capacidad: int = 10000):
+        self.eventos = deque(maxlen=capacidad)  # (clase, plantilla, args)
+
+    def emitir(self, clase: str, plantilla: str, *args):
+        self.eventos.append((clase, plantilla, args))
+
+    def mensajes(self):
+        """Devuelve los mensajes formateados del búfer"""
+        return [_formatear(plantilla, args) for _, plantilla, args in self.eventos]
+
+    def volcar(self, salida=None):
+        """
+        Reenvía los eventos guardados a otra salida (o los imprime) y vacía el búfer
+
+        Args:
+            salida: Salida destino (opcional, por defecto print sin colores)
+        """
+        while self.eventos:
+            clase, plantilla, args = self.eventos.popleft()
+            if salida is None:
+                print(_formatear(plantilla, args))
+            else:
+                salida.emitir(clase, plantilla, *args)
+
+
+class SalidaLogging:
+    """Envía los eventos al módulo logging con formateo diferido"""
+
+    def __init__(self, logger=None, nivel: int = logging.INFO):
+        """
+        Args:
+            logger: Logger o nombre del logger (por defecto 'iot')
+            nivel (int): Nivel para las clases que no están en NIVEL_POR_CLASE
+        """
+        if logger is None or isinstance(logger, str):
+            logger = logging.getLogger(logger or "iot")
+        self.logger = logger
+        self.nivel = nivel
+
+    @property
+    def activo(self):
+        """
+        Hay que emitir si el logger acepta el evento más grave posible (los errores);
+        los eventos de menor nivel los filtra logging dentro de emitir
+        """
+        return self.logger.isEnabledFor(max(self.nivel, *NIVEL_POR_CLASE.values()))
+
+    def emitir(self, clase: str, plantilla: str, *args):
+        # logging solo aplica plantilla % args si el registro se emite
+        self.logger.log(NIVEL_POR_CLASE.get(clase, self.nivel), plantilla, *args)
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+"""
+SERVICIO IoT EN SEGUNDO PLANO
+Mantiene un AnalizadorSensores y un RegistroDispositivosIoT cargados en un proceso
+de larga duración y atiende llamadas por TCP local, para que las invocaciones
+repetidas de la línea de comandos no paguen el arranque de cada proceso.
+Protocolo: una línea JSON por petición {"metodo", "args", "kwargs"} y una línea
+JSON por respuesta {"ok": true, "resultado"} o {"ok": false, "error"}.
+"""
+
+import json
+import signal
+import socket
+import socketserver
+import threading
+from collections.abc import Mapping
+
+PUERTO_SERVICIO = 9109
+
+# Métodos que se pueden invocar desde un cliente
+METODOS_ANALIZADOR = (
+    "agregar_lectura",
+    "agregar_lote",
+    "calcular_estadisticas",
+    "detectar_valores_atipicos",
+    "verificar_umbrales_seguros",
+    "exportar_resumen"
+)
+METODOS_REGISTRO = (
+    "agregar_dispositivo",
+    "obtener_dispositivo",
+    "buscar_por_ubicacion",
+    "buscar_por_tipo",
+    "buscar_por_estado",
+    "buscar_mantenimiento_anterior",
+    "actualizar_estado",
+    "actualizar_mantenimiento",
+    "eliminar_dispositivo",
+    "contar_por_estado"
+)
+
+
+def _a_json(objeto):
+    """Convierte los resultados que json no conoce (registros compactos, resúmenes)"""
+    if isinstance(objeto, Mapping):
+        return dict(objeto)
+    if hasattr(objeto, "exportar_estado"):
+        return objeto.exportar_estado()
+    raise TypeError(f"Tipo no serializable: {type(objeto).__name__}")
+
+
+class ServicioIoT:
+    def __init__(self, analizador=None, registro=None):
+        """
+        Despachador de llamadas sobre un analizador y un registro compartidos
+
+        Args:
+            analizador (AnalizadorSensores): Analizador a mantener (por defecto uno silencioso)
+            registro (RegistroDispositivosIoT): Registro a mantener (por defecto uno silencioso en memoria)
+        """
+        if analizador is None or registro is None:
+            from salida_eventos import SalidaSilenciosa
+        if analizador is None:
+            from programa5_analizador import AnalizadorSensores
+            analizador = AnalizadorSensores(SalidaSilenciosa())
+        if registro is None:
+            from programa4_registro import RegistroDispositivosIoT
+            registro = RegistroDispositivosIoT(SalidaSilenciosa())
+        self.analizador = analizador
+        self.registro = registro
+        # Los métodos se buscan en cada llamada: así se usan los envoltorios de
+        # habilitar_metricas() aunque las métricas se activen con el servicio en marcha
+        self.objetivos = {nombre: analizador for nombre in METODOS_ANALIZADOR}
+        self.objetivos.update({nombre: registro for nombre in METODOS_REGISTRO})
+        self.metodos = {"ping": lambda: "pong"}  # Funciones propias del servicio
+        self._cerrojo = threading.Lock()  # El analizador y el registro no son seguros entre hilos
+        self.cerrado = False
+
+    def llamar(self, metodo: str, args=(), kwargs=None):
+        """
+        Ejecuta un método permitido y devuelve la respuesta del protocolo
+
+        Args:
+            metodo (str): Nombre del método
+            args (list): Argumentos posicionales
+            kwargs (dict): Argumentos por nombre
+
+        Returns:
+            Diccionario {"ok": True, "resultado": ...} o {"ok": False, "error": ...}
+        """
+        objetivo = self.objetivos.get(metodo)
+        funcion = getattr(objetivo, metodo) if objetivo is not None else self.metodos.get(metodo)
+        if funcion is None:
+            return {"ok": False, "error": f"Método desconocido: {metodo}"}
+        try:
+            with self._cerrojo:
+                if self.cerrado:
+                    return {"ok": False, "error": "El servicio se está deteniendo"}
+                resultado = funcion(*args, **(kwargs or {}))
+        except Exception as error:
+            return {"ok": False, "error": f"{type(error).__name__}: {error}"}
+        return {"ok": True, "resultado": resultado}
+
+    def cerrar(self):
+        """
+        Espera a la llamada en curso, guarda el punto de control del registro de
+        lecturas y confirma y cierra el registro de dispositivos
+        """
+        with self._cerrojo:
+            if self.cerrado:
+                return
+            self.cerrado = True
+            self.analizador.cerrar_registro()
+            self.registro.cerrar()
+
+    def responder(self, linea: bytes):
+        """Atiende una línea de petición y devuelve la línea de respuesta codificada"""
+        try:
+            peticion = json.loads(linea)
+            respuesta = self.llamar(peticion["metodo"], peticion.get("args", ()), peticion.get("kwargs"))
+        except (ValueError, KeyError, TypeError) as error:
+            respuesta = {"ok": False, "error": f"Petición inválida: {error}"}
+        try:
+            texto = json.dumps(respuesta, default=_a_json, ensure_ascii=False)
+        except (TypeError, ValueError) as error:
+            texto = json.dumps({"ok": False, "error": f"Resultado no serializable: {error}"})
+        return texto.encode("utf-8") + b"\n"
+
+
+class ServidorIoT:
+    def __init__(self, servicio: ServicioIoT = None, host: str = "127.0.0.1", puerto: int = PUERTO_SERVICIO):
+        """
+        Servidor TCP local del servicio; cada conexión puede enviar varias peticiones
+
+        Args:
+            servicio (ServicioIoT): Servicio a publicar (por defecto uno nuevo)
+            host (str): Dirección de escucha (por defecto solo local)
+            puerto (int): Puerto TCP (0 elige uno libre)
+        """
+        self.servicio = servicio or ServicioIoT()
+        servidor_iot = self
+
+        class Manejador(socketserver.StreamRequestHandler):
+            def handle(self):
+                for linea in self.rfile:
+                    if linea.strip():
+                        self.wfile.write(servidor_iot.servicio.responder(linea))
+
+        self._servidor = socketserver.ThreadingTCPServer((host, puerto), Manejador, bind_and_activate=False)
+        self._servidor.allow_reuse_address = True
+        self._servidor.daemon_threads = True
+        self._servidor.server_bind()
+        self._servidor.server_activate()
+        self._hilo = None
+        self.servicio.metodos["detener"] = self.solicitar_detencion
+
+    @property
+    def direccion(self):
+        """(host, puerto) en el que escucha el servidor"""
+        return self._servidor.server_address[:2]
+
+    def solicitar_detencion(self):
+        """
+        Pide que atender() termine sin esperar; sirve desde un manejador o una señal
+        (shutdown() espera a serve_forever, así que se llama desde otro hilo)
+        """
+        threading.Thread(target=self._servidor.shutdown, daemon=True).start()
+
+    def atender(self):
+        """Atiende peticiones en el hilo actual hasta recibir 'detener'"""
+        try:
+            self._servidor.serve_forever()
+        finally:
+            self._servidor.server_close()
+
+    def iniciar(self):
+        """Empieza a atender peticiones en un hilo demonio"""
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=self._servidor.serve_forever, name="servicio-iot", daemon=True)
+            self._hilo.start()
+        return self
+
+    def detener(self):
+        """Detiene el servidor y libera el puerto"""
+        if self._hilo is not None:
+            self._servidor.shutdown()
+            self._hilo.join()
+            self._hilo = None
+        self._servidor.server_close()
+
+
+class ClienteIoT:
+    def __init__(self, host: str = "127.0.0.1", puerto: int = PUERTO_SERVICIO, tiempo_espera: float = 30.0):
+        """
+        Cliente del servicio; reutiliza una conexión para todas sus llamadas
+
+        Args:
+            host (str): Dirección del servicio
+            puerto (int): Puerto TCP del servicio
+            tiempo_espera (float): Segundos máximos de espera por respuesta
+        """
+        self._conexion = socket.create_connection((host, puerto), timeout=tiempo_espera)
+        self._lector = self._conexion.makefile("rb")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def _enviar(self, peticion: dict):
+        self._conexion.sendall(json.dumps(peticion, ensure_ascii=False).encode("utf-8") + b"\n")
+        linea = self._lector.readline()
+        if not linea:
+            raise ConnectionError("El servicio cerró la conexión")
+        return json.loads(linea)
+
+    def llamar(self, metodo: str, *args, **kwargs):
+        """
+        Invoca un método del servicio
+
+        Args:
+            metodo (str): Nombre del método del analizador o del registro
+            *args: Argumentos posicionales (serializables en JSON)
+            **kwargs: Argumentos por nombre (serializables en JSON)
+
+        Returns:
+            El resultado de la llamada; lanza RuntimeError si el servicio informa un error
+        """
+        respuesta = self._enviar({"metodo": metodo, "args": list(args), "kwargs": kwargs})
+        if not respuesta["ok"]:
+            raise RuntimeError(respuesta["error"])
+        return respuesta["resultado"]
+
+    def detener_servicio(self):
+        """Pide al servicio que termine"""
+        self.llamar("detener")
+
+    def cerrar(self):
+        self._lector.close()
+        self._conexion.close()
+
+
+def ejecutar_servicio(host: str = "127.0.0.1", puerto: int = PUERTO_SERVICIO,
+                      registro_sqlite: str = None, registro_lecturas: str = None):
+    """
+    Arranca el servicio con el analizador y el registro cargados y lo atiende hasta
+    'detener', Ctrl+C o SIGTERM; al terminar guarda y cierra ambos registros
+
+    Args:
+        host (str): Dirección de escucha
+        puerto (int): Puerto TCP
+        registro_sqlite (str): Base SQLite del registro de dispositivos (por defecto en memoria)
+        registro_lecturas (str): Registro binario de lecturas del analizador (por defecto sin persistir)
+    """
+    from programa4_registro import RegistroDispositivosIoT
+    from programa5_analizador import AnalizadorSensores
+    from salida_eventos import SalidaSilenciosa
+
+    if registro_lecturas:
+        analizador = AnalizadorSensores.desde_registro(registro_lecturas, SalidaSilenciosa())
+    else:
+        analizador = AnalizadorSensores(SalidaSilenciosa())
+    if registro_sqlite:
+        registro = RegistroDispositivosIoT.abrir_sqlite(registro_sqlite, SalidaSilenciosa())
+    else:
+        registro = RegistroDispositivosIoT(SalidaSilenciosa())
+
+    servicio = ServicioIoT(analizador, registro)
+    servidor = ServidorIoT(servicio, host, puerto)
+    host, puerto = servidor.direccion
+    # kill (SIGTERM) detiene el servicio igual que 'detener' y pasa por el cierre ordenado
+    senal_anterior = signal.signal(signal.SIGTERM, lambda *_: servidor.solicitar_detencion())
+    print(f"\033[95m🛰️  Servicio IoT escuchando en {host}:{puerto}\033[0m", flush=True)
+    try:
+        servidor.atender()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        signal.signal(signal.SIGTERM, senal_anterior)
+        servicio.cerrar()
+    print("\033[95m🛑 Servicio IoT detenido\033[0m")
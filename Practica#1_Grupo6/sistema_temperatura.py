@@ -1,10 +1,21 @@
 import random 
 
-temp = round (random.uniform(10,40),2);
+from motor_reglas import Rango
 
-print(f"Lectura de temperatura: {temp} °C");
 
-if 18<= temp <=30: 
-    print ("La temperatura esta en rango seguro.")
-else: 
-    print ("Alerta: Temperatura esta fuera de rango.")
\ No newline at end of file
+def main():
+    """Simula una lectura de temperatura y comprueba si está en rango seguro"""
+    temp = round (random.uniform(10,40),2);
+
+    print(f"Lectura de temperatura: {temp} °C");
+
+    rango_seguro = Rango("temperatura", 18, 30).compilar()
+
+    if rango_seguro({"temperatura": [temp]})[0]: 
+        print ("La temperatura esta en rango seguro.")
+    else: 
+        print ("Alerta: Temperatura esta fuera de rango.")
+
+
+if __name__ == "__main__":
+    main()
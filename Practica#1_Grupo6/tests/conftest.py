@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""Los módulos de la práctica son scripts planos: se importan desde la carpeta padre"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+
+from adquisicion_async import FuenteSimulada, PipelineAdquisicion
+from programa5_analizador import AnalizadorSensores
+from salida_eventos import SalidaBuffer, SalidaSilenciosa
+
+
+class FuenteInvalida:
+    """Devuelve lecturas sin valor"""
+
+    async def leer(self):
+        return None, "temperatura"
+
+
+class AnalizadorQueFalla(AnalizadorSensores):
+    """Rechaza el primer lote que recibe"""
+
+    def __init__(self, salida):
+        super().__init__(salida)
+        self.fallos_pendientes = 1
+
+    def agregar_lote(self, lecturas):
+        if self.fallos_pendientes:
+            self.fallos_pendientes -= 1
+            raise ValueError("lote inválido")
+        return super().agregar_lote(lecturas)
+
+
+def _ejecutar(pipeline, **kwargs):
+    return asyncio.run(asyncio.wait_for(pipeline.ejecutar(**kwargs), timeout=10))
+
+
+def test_lecturas_invalidas_cuentan_como_errores():
+    analizador = AnalizadorSensores(SalidaSilenciosa())
+    fuentes = [FuenteInvalida(), FuenteSimulada("temperatura", 18, 32)]
+    resultado = _ejecutar(PipelineAdquisicion(analizador, fuentes, periodo=0), muestras=20)
+    assert resultado["errores"] == 20
+    assert resultado["ingresadas"] == 20
+
+
+def test_lote_rechazado_no_bloquea_la_cola():
+    salida = SalidaBuffer()
+    analizador = AnalizadorQueFalla(salida)
+    fuentes = [FuenteSimulada("temperatura", 18, 32) for _ in range(4)]
+    pipeline = PipelineAdquisicion(analizador, fuentes, capacidad_cola=5, tamano_lote=5, periodo=0)
+    resultado = _ejecutar(pipeline, muestras=50)
+    assert resultado["lotes_fallidos"] == 1
+    assert resultado["ingresadas"] == 200 - 5
+    assert any("rechazado" in mensaje for mensaje in salida.mensajes())
+
+
+def test_consumidor_caido_no_cuelga_la_ejecucion():
+    class AnalizadorRoto(AnalizadorSensores):
+        @property
+        def salida(self):
+            raise RuntimeError("sin salida")
+
+        @salida.setter
+        def salida(self, valor):
+            pass
+
+        def agregar_lote(self, lecturas):
+            raise ValueError("lote inválido")
+
+    fuentes = [FuenteSimulada("temperatura", 18, 32) for _ in range(4)]
+    pipeline = PipelineAdquisicion(AnalizadorRoto(), fuentes, capacidad_cola=5, tamano_lote=5, periodo=0)
+    with pytest.raises(RuntimeError):
+        _ejecutar(pipeline, muestras=50)
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from programa4_registro import RegistroDispositivosIoT
+from salida_eventos import SalidaSilenciosa
+
+CARPETA_MODULOS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _ejecutar_sin_cerrar(codigo):
+    """Ejecuta operaciones sobre el registro en otro proceso que termina sin cerrarlo"""
+    encabezado = "import os\nfrom programa4_registro import RegistroDispositivosIoT\n"
+    subprocess.run([sys.executable, "-c", encabezado + textwrap.dedent(codigo) + "\nos._exit(0)\n"],
+                   cwd=CARPETA_MODULOS, check=True, stdout=subprocess.DEVNULL)
+
+
+def _abrir(ruta):
+    return RegistroDispositivosIoT.abrir_sqlite(str(ruta), SalidaSilenciosa())
+
+
+def test_escrituras_individuales_sobreviven_sin_cerrar(tmp_path):
+    ruta = tmp_path / "registro.db"
+    _ejecutar_sin_cerrar(f"""
+        registro = RegistroDispositivosIoT.abrir_sqlite({str(ruta)!r})
+        registro.agregar_dispositivo("s1", "sensor_temperatura", "Cocina", "activo", "2024-01-01")
+        registro.agregar_dispositivo("v1", "ventilador", "Cocina", "activo", "N/A")
+        registro.actualizar_estado("s1", "inactivo")
+        registro.actualizar_mantenimiento("v1", "2024-06-01")
+    """)
+    registro = _abrir(ruta)
+    assert [d["ID"] for d in registro.dispositivos] == ["s1", "v1"]
+    assert registro.obtener_dispositivo("s1")["estado"] == "inactivo"
+    assert registro.obtener_dispositivo("v1")["último_mantenimiento"] == "2024-06-01"
+    registro.cerrar()
+
+
+def test_importacion_confirmada_al_terminar(tmp_path):
+    ruta = tmp_path / "registro.db"
+    _ejecutar_sin_cerrar(f"""
+        registro = RegistroDispositivosIoT.abrir_sqlite({str(ruta)!r}, tamano_transaccion=1000)
+        filas = [{{"ID": f"d{{i}}", "tipo": "sensor", "ubicación": "sala", "estado": "activo",
+                   "último_mantenimiento": "N/A"}} for i in range(2500)]
+        registro.importar_lote(filas, tamano_lote=300)
+    """)
+    registro = _abrir(ruta)
+    assert registro.contar_por_estado() == {"activo": 2500, "inactivo": 0}
+    registro.cerrar()
+
+
+def test_sqlite_y_memoria_coinciden(tmp_path):
+    memoria = RegistroDispositivosIoT(SalidaSilenciosa())
+    sqlite = _abrir(tmp_path / "registro.db")
+    for registro in (memoria, sqlite):
+        registro.agregar_dispositivo("a", "sensor", "Sala", "activo", "2023-05-01")
+        registro.agregar_dispositivo("b", "ventilador", "sala", "inactivo", "N/A")
+        registro.agregar_dispositivo("a", "sensor", "Sala", "activo", "2023-05-01")
+    for consulta in (lambda r: r.buscar_por_ubicacion("SALA"),
+                     lambda r: r.buscar_por_estado("inactivo"),
+                     lambda r: r.buscar_mantenimiento_anterior("2024-01-01")):
+        assert [dict(d) for d in consulta(memoria)] == [dict(d) for d in consulta(sqlite)]
+    sqlite.cerrar()
+
+
+def _comprobar_indices(almacen):
+    """Los índices del almacén en memoria coinciden con un recorrido completo de la lista"""
+    dispositivos = almacen.dispositivos
+    assert len({d.id for d in dispositivos}) == len(dispositivos)
+    assert almacen._por_id == {d.id: d for d in dispositivos}
+    for indice, clave in ((almacen._por_ubicacion, lambda d: d.ubicacion.casefold()),
+                          (almacen._por_tipo, lambda d: d.tipo),
+                          (almacen._por_estado, lambda d: d.estado)):
+        esperado = {}
+        for dispositivo in dispositivos:
+            esperado.setdefault(clave(dispositivo), {})[dispositivo.id] = dispositivo
+        assert indice == esperado  # Sin grupos vacíos ni entradas obsoletas
+        for grupo in indice.values():
+            for id, dispositivo in grupo.items():
+                assert almacen._por_id[id] is dispositivo
+    conteo = {"activo": 0, "inactivo": 0}
+    for dispositivo in dispositivos:
+        conteo[dispositivo.estado] = conteo.get(dispositivo.estado, 0) + 1
+    assert almacen.contar_por_estado() == conteo
+
+
+def test_indices_en_memoria_consistentes():
+    registro = RegistroDispositivosIoT(SalidaSilenciosa())
+    almacen = registro.almacen
+    registro.agregar_dispositivo("a", "sensor", "Sala", "activo", "2023-05-01")
+    registro.agregar_dispositivo("b", "ventilador", "sala", "inactivo", "N/A")
+    registro.agregar_dispositivo("c", "sensor", "Cocina", "activo", "N/A")
+    registro.importar_lote([{"ID": "d", "tipo": "luz", "ubicación": "Cocina", "estado": "inactivo"}])
+    _comprobar_indices(almacen)
+
+    assert registro.actualizar_estado("a", "inactivo")
+    assert registro.actualizar_estado("b", "ACTIVO")
+    assert registro.actualizar_estado("b", "activo")  # Mismo estado: no duplica la entrada
+    _comprobar_indices(almacen)
+
+    assert registro.eliminar_dispositivo("c")
+    assert not registro.eliminar_dispositivo("c")
+    _comprobar_indices(almacen)
+    assert "cocina" in almacen._por_ubicacion  # Queda "d"
+    assert registro.eliminar_dispositivo("d")
+    _comprobar_indices(almacen)
+    assert "cocina" not in almacen._por_ubicacion and "luz" not in almacen._por_tipo
+
+    # Volver a dar de alta un ID eliminado, con otros datos
+    assert registro.agregar_dispositivo("c", "cámara", "Garaje", "inactivo", "N/A")
+    _comprobar_indices(almacen)
+    assert [d["ID"] for d in registro.dispositivos] == ["a", "b", "c"]
+    assert registro.buscar_por_tipo("sensor") == [registro.obtener_dispositivo("a")]
+    assert [d["ID"] for d in registro.buscar_por_ubicacion("GARAJE")] == ["c"]
+    assert registro.buscar_por_ubicacion("cocina") == []
+
+
+def test_eliminar_en_sqlite_coincide_con_memoria(tmp_path):
+    memoria = RegistroDispositivosIoT(SalidaSilenciosa())
+    sqlite = _abrir(tmp_path / "registro.db")
+    for registro in (memoria, sqlite):
+        registro.agregar_dispositivo("a", "sensor", "Sala", "activo", "2023-05-01")
+        registro.agregar_dispositivo("b", "ventilador", "sala", "inactivo", "N/A")
+        assert registro.eliminar_dispositivo("a")
+        assert not registro.eliminar_dispositivo("x")
+        registro.agregar_dispositivo("a", "sensor", "Cocina", "inactivo", "2024-02-01")
+    assert [dict(d) for d in memoria.dispositivos] == [dict(d) for d in sqlite.dispositivos]
+    assert memoria.contar_por_estado() == sqlite.contar_por_estado() == {"activo": 0, "inactivo": 2}
+    sqlite.cerrar()
+
+
+def test_estados_fuera_de_activo_inactivo(tmp_path):
+    memoria = RegistroDispositivosIoT(SalidaSilenciosa())
+    sqlite = _abrir(tmp_path / "registro.db")
+    for registro in (memoria, sqlite):
+        assert registro.agregar_dispositivo("a", "sensor", "Sala", "ACTIVO")
+        assert registro.agregar_dispositivo("m", "ventilador", "Sala", "mantenimiento")
+        assert registro.agregar_dispositivo("f", "luz", "Sala", "Fuera de servicio")
+        dispositivo = registro.obtener_dispositivo("m")
+        assert dispositivo["estado"] == "mantenimiento" and not dispositivo.activo
+        assert registro.obtener_dispositivo("a")["estado"] == "activo"  # Los conocidos se normalizan
+        assert registro.obtener_dispositivo("f")["estado"] == "Fuera de servicio"  # Los demás, tal cual
+        assert [d["ID"] for d in registro.buscar_por_estado("mantenimiento")] == ["m"]
+        assert [d["ID"] for d in registro.buscar_por_estado("Activo")] == ["a"]
+        assert registro.contar_por_estado() == {"activo": 1, "inactivo": 0, "mantenimiento": 1,
+                                                "Fuera de servicio": 1}
+        # actualizar_estado sigue admitiendo solo activo/inactivo y saca al dispositivo del otro estado
+        assert not registro.actualizar_estado("m", "averiado")
+        assert registro.actualizar_estado("m", "activo")
+        assert registro.contar_por_estado() == {"activo": 2, "inactivo": 0, "Fuera de servicio": 1}
+    assert [dict(d) for d in memoria.dispositivos] == [dict(d) for d in sqlite.dispositivos]
+    _comprobar_indices(memoria.almacen)
+    sqlite.cerrar()
+
+
+def test_asignar_campos_falla_con_indicacion():
+    registro = RegistroDispositivosIoT(SalidaSilenciosa())
+    registro.agregar_dispositivo("a", "sensor", "Sala", "activo")
+    dispositivo = registro.obtener_dispositivo("a")
+    with pytest.raises(TypeError, match="actualizar_estado"):
+        dispositivo["estado"] = "inactivo"
+    assert registro.actualizar_estado("a", "inactivo")
+    assert registro.buscar_por_estado("inactivo") == [dispositivo]
+
+
+@pytest.mark.parametrize("motor", ["memoria", "sqlite"])
+def test_fechas_de_mantenimiento_se_normalizan_a_iso(tmp_path, motor):
+    registro = RegistroDispositivosIoT(SalidaSilenciosa()) if motor == "memoria" else _abrir(tmp_path / "r.db")
+    assert registro.agregar_dispositivo("a", "sensor", "Sala", "activo", "2023-05-01")
+    assert registro.agregar_dispositivo("b", "sensor", "Sala", "activo", "20231201")
+    assert registro.agregar_dispositivo("c", "sensor", "Sala", "activo", "N/A")
+    for fecha in ("5/3/2024", "", "2024-13-01", "ayer"):
+        assert not registro.agregar_dispositivo("x", "sensor", "Sala", "activo", fecha)
+    assert not registro.almacen.contiene("x")
+    assert registro.obtener_dispositivo("b")["último_mantenimiento"] == "2023-12-01"
+
+    assert not registro.actualizar_mantenimiento("c", "01/06/2024")
+    assert registro.obtener_dispositivo("c")["último_mantenimiento"] == "N/A"
+    assert registro.actualizar_mantenimiento("c", "2022-01-15")
+    assert sorted(d["ID"] for d in registro.buscar_mantenimiento_anterior("2023-06-01")) == ["a", "c"]
+    with pytest.raises(ValueError):
+        registro.buscar_mantenimiento_anterior("1/6/2023")
+
+    # Un alta masiva con una fecha inválida no agrega ningún dispositivo
+    filas = [{"ID": "d", "tipo": "luz", "ubicación": "Sala", "estado": "activo", "último_mantenimiento": "2024-01-01"},
+             {"ID": "e", "tipo": "luz", "ubicación": "Sala", "estado": "activo", "último_mantenimiento": "1-1-24"}]
+    with pytest.raises(ValueError):
+        registro.almacen.agregar_varios(filas)
+    registro.almacen.sincronizar()
+    assert [d["ID"] for d in registro.dispositivos] == ["a", "b", "c"]
+    registro.cerrar()
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from array import array
+
+import pytest
+
+from analisis_paralelo import analizar_en_paralelo
+from benchmark_iot import generar_lecturas
+from programa5_analizador import AnalizadorSensores
+from reporte_sensores import construir_reporte
+from salida_eventos import SalidaSilenciosa
+
+
+def _comparar(obtenido, esperado, ruta="reporte"):
+    """Compara resultados anidados (objetos con __slots__, dict, array) con tolerancia en floats"""
+    if hasattr(esperado, "__slots__"):
+        for campo in esperado.__slots__:
+            _comparar(getattr(obtenido, campo), getattr(esperado, campo), f"{ruta}.{campo}")
+    elif isinstance(esperado, dict):
+        assert obtenido.keys() == esperado.keys(), ruta
+        for clave, valor in esperado.items():
+            _comparar(obtenido[clave], valor, f"{ruta}[{clave!r}]")
+    elif isinstance(esperado, array):
+        assert list(obtenido) == list(esperado), ruta
+    elif isinstance(esperado, float):
+        assert obtenido == pytest.approx(esperado), ruta
+    else:
+        assert obtenido == esperado, ruta
+
+
+@pytest.mark.parametrize("tamano_fragmento", [None, 997])
+def test_paralelo_coincide_con_secuencial(tamano_fragmento):
+    analizador = AnalizadorSensores(SalidaSilenciosa())
+    analizador.agregar_lote(generar_lecturas(20000, 3))
+    secuencial = construir_reporte(analizador.almacen)
+    paralelo = analizar_en_paralelo(analizador.almacen, procesos=2, tamano_fragmento=tamano_fragmento)
+    _comparar(paralelo.tipos, secuencial.tipos)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from programa5_analizador import AnalizadorSensores
+from salida_eventos import SalidaSilenciosa
+
+
+def _analizador():
+    analizador = AnalizadorSensores(SalidaSilenciosa())
+    analizador.agregar_lote([(20.0 + i % 5, "temperatura", None) for i in range(50)])
+    analizador.agregar_lote([(90.0, "temperatura", None), (-5.0, "temperatura", None)])
+    return analizador
+
+
+def test_resultados_en_cache_son_de_solo_lectura():
+    analizador = _analizador()
+    atipicos = analizador.detectar_valores_atipicos("temperatura")
+    assert len(atipicos) == 2
+    with pytest.raises(AttributeError):
+        atipicos.clear()
+    with pytest.raises(TypeError):
+        atipicos[0]["valor"] = 0
+
+    estadisticas = analizador.calcular_estadisticas("temperatura", exacto=True)
+    with pytest.raises(TypeError):
+        estadisticas["maximo"] = -1
+    assert estadisticas["maximo"] == 90.0
+
+
+def test_acierto_devuelve_el_mismo_objeto_sin_copiar():
+    analizador = _analizador()
+    primera = analizador.detectar_valores_atipicos("temperatura")
+    assert analizador.detectar_valores_atipicos("temperatura") is primera
+    assert analizador.verificar_umbrales_seguros("temperatura") is analizador.verificar_umbrales_seguros("temperatura")
+    assert analizador.cache.aciertos >= 2
+
+
+def test_sin_cache_los_resultados_son_listas():
+    analizador = _analizador()
+    analizador.cache = None
+    atipicos = analizador.detectar_valores_atipicos("temperatura")
+    assert isinstance(atipicos, list) and isinstance(atipicos[0], dict)
+
+
+def test_lectura_nueva_invalida_el_resultado():
+    analizador = _analizador()
+    assert len(analizador.verificar_umbrales_seguros("temperatura")) == 2
+    analizador.agregar_lectura(100.0, "temperatura")
+    assert len(analizador.verificar_umbrales_seguros("temperatura")) == 3
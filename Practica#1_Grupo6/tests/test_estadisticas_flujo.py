@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import random
+import statistics
+
+import pytest
+
+from estadisticas_flujo import LIMITE_EXACTO, CuantilP2, EstadisticasIncrementales
+from programa5_analizador import AnalizadorSensores
+from salida_eventos import SalidaSilenciosa
+
+_AZAR = random.Random(7)
+CASOS = {
+    "ascendente": [float(i) for i in range(200)],
+    "descendente": [float(i) for i in range(199, -1, -1)],
+    "duplicados": [float(_AZAR.choice((1, 2, 2, 3, 3, 3))) for _ in range(201)],
+    "gaussiana": [_AZAR.gauss(50, 10) for _ in range(LIMITE_EXACTO)],
+    "pocos_pares": [5.0, 1.0, 9.0, 3.0, 7.0, 2.0],
+    "pocos_impares": [4.0, 8.0, 1.0],
+    "uno": [42.0]
+}
+
+
+def _estadisticas(valores):
+    analizador = AnalizadorSensores(SalidaSilenciosa())
+    analizador.agregar_lote((valor, "temperatura", None) for valor in valores)
+    return analizador.calcular_estadisticas("temperatura")
+
+
+@pytest.mark.parametrize("caso", CASOS)
+def test_mediana_exacta_hasta_el_limite(caso):
+    valores = CASOS[caso]
+    estadisticas = _estadisticas(valores)
+    assert estadisticas["mediana"] == statistics.median(valores)
+    assert "mediana_aprox" not in estadisticas
+
+
+def test_ejemplo_pequeno():
+    assert _estadisticas([5, 1, 9, 3, 7, 2])["mediana"] == 4.0
+
+
+@pytest.mark.parametrize("caso", ["ascendente", "descendente", "duplicados", "gaussiana"])
+def test_mediana_aproximada_se_indica(caso):
+    azar = random.Random(11)
+    n = 4 * LIMITE_EXACTO
+    valores = {
+        "ascendente": [float(i) for i in range(n)],
+        "descendente": [float(i) for i in range(n, 0, -1)],
+        "duplicados": [float(azar.choice((1, 2, 2, 3, 3, 3))) for _ in range(n)],
+        "gaussiana": [azar.gauss(50, 10) for _ in range(n)]
+    }[caso]
+    estadisticas = _estadisticas(valores)
+    assert "mediana" not in estadisticas
+    # Error de rango: la estimación deja a cada lado aproximadamente la mitad de las lecturas
+    estimada = estadisticas["mediana_aprox"]
+    assert sum(valor < estimada for valor in valores) / n <= 0.52
+    assert sum(valor <= estimada for valor in valores) / n >= 0.48
+    exactas = AnalizadorSensores(SalidaSilenciosa())
+    exactas.agregar_lote((valor, "temperatura", None) for valor in valores)
+    assert exactas.calcular_estadisticas("temperatura", exacto=True)["mediana"] == statistics.median(valores)
+
+
+def test_estado_exportado_conserva_el_modo():
+    resumen = EstadisticasIncrementales()
+    for valor in CASOS["gaussiana"][:100]:
+        resumen.agregar(valor)
+    restaurado = EstadisticasIncrementales.restaurar_estado(resumen.exportar_estado())
+    assert restaurado.como_diccionario() == resumen.como_diccionario()
+    for valor in range(LIMITE_EXACTO):
+        resumen.agregar(float(valor))
+        restaurado.agregar(float(valor))
+    assert not restaurado.mediana.exacto
+    assert restaurado.mediana.valor() == resumen.mediana.valor()
+
+
+def test_estado_anterior_sin_bufer_exacto():
+    anterior = {"p": 0.5, "alturas": [3.0, 1.0], "posiciones": [0, 1, 2, 3, 4],
+                "deseadas": [0.0, 1.0, 2.0, 3.0, 4.0]}
+    cuantil = CuantilP2.restaurar_estado(anterior)
+    assert cuantil.exacto and cuantil.valor() == 2.0
+    anterior = {"p": 0.5, "alturas": [1.0, 2.0, 3.0, 4.0, 5.0], "posiciones": [0, 1, 2, 3, 4],
+                "deseadas": [0.0, 1.0, 2.0, 3.0, 4.0]}
+    cuantil = CuantilP2.restaurar_estado(anterior)
+    assert not cuantil.exacto and cuantil.valor() == 3.0
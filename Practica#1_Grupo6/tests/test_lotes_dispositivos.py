@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+
+import pytest
+
+from lotes_dispositivos import FilaInvalida, leer_filas
+from programa4_registro import RegistroDispositivosIoT
+from salida_eventos import SalidaSilenciosa
+
+CSV_MIXTO = (
+    "id,tipo,ubicacion,estado,mantenimiento\n"
+    "s1,sensor,Sala,activo,2024-01-10\n"
+    "s2,,Cocina,activo,\n"                           # Falta el tipo
+    "s3,camara,Garaje,INACTIVO,2023-12-01\n"
+    "s1,sensor,Sala,activo,\n"                       # ID duplicado
+    "s4,termostato,\"Pasillo, norte\",activo,\n"
+    "s5,sensor,Baño,activo,2024-02-01\n"
+    "s6,sensor,Baño,activo,2/1/2024\n"               # Fecha no ISO
+)
+
+
+def _registro():
+    return RegistroDispositivosIoT(SalidaSilenciosa())
+
+
+@pytest.mark.parametrize("formato", ["csv", "jsonl"])
+def test_importar_y_exportar_ida_y_vuelta(formato):
+    origen = _registro()
+    origen.agregar_dispositivo("s1", "sensor", "Sala", "activo", "2024-01-10")
+    origen.agregar_dispositivo("c1", "cámara", "Garaje, exterior", "inactivo", "N/A")
+    origen.agregar_dispositivo("t1", "termostato", 'Pasillo "norte"', "activo", "2023-12-01")
+    origen.agregar_dispositivo("m1", "sensor", "Sótano", "mantenimiento", "N/A")
+    archivo = io.StringIO()
+    assert origen.exportar(archivo, formato) == 4
+
+    destino = _registro()
+    resumen = destino.importar_lote(io.StringIO(archivo.getvalue()), formato)
+    assert (resumen["importados"], resumen["rechazados"]) == (4, 0)
+    assert [dict(d) for d in destino.dispositivos] == [dict(d) for d in origen.dispositivos]
+
+    copia = io.StringIO()
+    destino.exportar(copia, formato)
+    assert copia.getvalue() == archivo.getvalue()
+
+
+def test_filas_validas_e_invalidas():
+    registro = _registro()
+    resumen = registro.importar_lote(io.StringIO(CSV_MIXTO), "csv", tamano_lote=2)
+    assert resumen["importados"] == 4
+    assert resumen["rechazados"] == 3
+    assert resumen["motivos"] == {"Falta el campo obligatorio 'tipo'": 1, "ID duplicado": 1,
+                                  "Fecha de mantenimiento inválida": 1}
+    assert [error["fila"] for error in resumen["errores"]] == [2, 4, 7]
+    assert registro.obtener_dispositivo("s3")["estado"] == "inactivo"
+    assert registro.obtener_dispositivo("s4")["ubicación"] == "Pasillo, norte"
+
+
+def test_error_de_csv_se_cuenta_y_la_carga_continua():
+    lineas = ["ID,tipo,ubicación\n", "a1,sensor,Sala\n", "a2,sensor,\"" + "x" * 200_000 + "\"\n",
+              "a3,sensor,Cocina\n", "a4,sensor,Sala\r\nresto\n", "a5,sensor,Baño\n"]
+    registro = _registro()
+    resumen = registro.importar_lote(lineas, "csv")
+    assert resumen["importados"] == 3
+    assert resumen["motivos"] == {"CSV inválido": 2}
+    assert resumen["errores"] == [{"fila": 2, "motivo": "CSV inválido", "linea": 3},
+                                  {"fila": 4, "motivo": "CSV inválido", "linea": 5}]
+    assert [d["ID"] for d in registro.dispositivos] == ["a1", "a3", "a5"]
+
+
+def test_json_invalido_informa_la_linea():
+    lineas = [json.dumps({"id": "j1", "tipo": "sensor", "ubicacion": "Sala"}) + "\n", "\n", "{roto\n",
+              json.dumps({"id": "j2", "tipo": "sensor", "ubicacion": "Sala", "estado": "apagado"}) + "\n"]
+    filas = list(leer_filas(lineas, "jsonl"))
+    assert isinstance(filas[1], FilaInvalida) and filas[1].linea == 3
+    registro = _registro()
+    resumen = registro.importar_lote(lineas, "jsonl")
+    assert resumen["importados"] == 2
+    assert resumen["motivos"] == {"JSON inválido": 1}
+    assert resumen["errores"] == [{"fila": 2, "motivo": "JSON inválido", "linea": 3}]
+    assert registro.obtener_dispositivo("j2")["estado"] == "apagado"  # Otros estados se conservan
+
+
+def test_muestra_de_errores_limitada():
+    lineas = ["ID,tipo,ubicación\n"] + [f"x{i},,Sala\n" for i in range(30)]
+    resumen = _registro().importar_lote(lineas, "csv", max_errores=5)
+    assert resumen["rechazados"] == 30
+    assert len(resumen["errores"]) == 5
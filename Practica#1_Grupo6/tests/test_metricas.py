@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from metricas import (METODOS_INSTRUMENTADOS, HistogramaLatencia, MetricasAnalizador, ServidorMetricas,
+                      desinstrumentar, instrumentar)
+from programa5_analizador import AnalizadorSensores
+from salida_eventos import SalidaSilenciosa
+
+
+def _analizador():
+    return AnalizadorSensores(SalidaSilenciosa())
+
+
+def test_instrumentar_y_desinstrumentar_restauran_los_metodos():
+    analizador = _analizador()
+    metricas = instrumentar(analizador)
+    for nombre in METODOS_INSTRUMENTADOS:
+        assert nombre in analizador.__dict__
+    analizador.agregar_lectura(20.0, "temperatura")
+    analizador.agregar_lote([(21.0, "temperatura", None), (50.0, "humedad", None)])
+    assert metricas.lecturas_ingresadas == 3
+    assert metricas.metodos["agregar_lote"].cantidad == 1
+
+    desinstrumentar(analizador)
+    for nombre in METODOS_INSTRUMENTADOS:
+        assert nombre not in analizador.__dict__
+        assert getattr(analizador, nombre).__func__ is getattr(AnalizadorSensores, nombre)
+    analizador.agregar_lectura(22.0, "temperatura")
+    assert metricas.lecturas_ingresadas == 3
+
+
+def test_instrumentar_dos_veces_no_anida_envoltorios():
+    analizador = _analizador()
+    instrumentar(analizador)
+    metricas = instrumentar(analizador)
+    analizador.agregar_lectura(20.0, "temperatura")
+    assert metricas.metodos["agregar_lectura"].cantidad == 1
+
+
+def test_errores_se_cuentan_y_se_propagan():
+    analizador = _analizador()
+    metricas = instrumentar(analizador)
+    with pytest.raises(ValueError):
+        analizador.agregar_lectura("no es un número", "temperatura")
+    histograma = metricas.metodos["agregar_lectura"]
+    assert (histograma.errores, histograma.cantidad) == (1, 1)
+    assert metricas.lecturas_ingresadas == 0
+
+
+def test_histograma_limites_de_cubetas():
+    histograma = HistogramaLatencia((0.001, 0.01))
+    assert histograma.limites_ns == [1_000_000, 10_000_000]
+    for duracion_ns in (0, 1_000_000, 1_000_001, 10_000_000, 10_000_001):
+        histograma.observar(duracion_ns)
+    # Cada cubeta incluye su límite superior (le), la última es +Inf
+    assert histograma.cubetas == [2, 2, 1]
+    assert histograma.cantidad == 5
+    assert histograma.suma_ns == 22_000_002
+    assert histograma.percentil(40) == 0.001
+    assert histograma.percentil(80) == 0.01
+    assert histograma.percentil(100) == float("inf")
+    assert HistogramaLatencia().percentil(50) is None
+
+
+def test_exportar_prometheus():
+    metricas = MetricasAnalizador(limites=(0.001, 0.01))
+    histograma = metricas.metodos["calcular_estadisticas"]
+    for duracion_ns in (500_000, 2_000_000, 20_000_000):
+        histograma.observar(duracion_ns)
+    histograma.errores = 1
+    lineas = metricas.exportar_prometheus().splitlines()
+
+    assert "# TYPE analizador_latencia_segundos histogram" in lineas
+    etiqueta = 'metodo="calcular_estadisticas"'
+    assert f"analizador_llamadas_total{{{etiqueta}}} 3" in lineas
+    assert f"analizador_errores_total{{{etiqueta}}} 1" in lineas
+    # Las cubetas son acumuladas y +Inf coincide con _count
+    assert f'analizador_latencia_segundos_bucket{{{etiqueta},le="0.001"}} 1' in lineas
+    assert f'analizador_latencia_segundos_bucket{{{etiqueta},le="0.01"}} 2' in lineas
+    assert f'analizador_latencia_segundos_bucket{{{etiqueta},le="+Inf"}} 3' in lineas
+    assert f"analizador_latencia_segundos_sum{{{etiqueta}}} 0.0225" in lineas
+    assert f"analizador_latencia_segundos_count{{{etiqueta}}} 3" in lineas
+    assert f'analizador_latencia_segundos_bucket{{metodo="agregar_lote",le="+Inf"}} 0' in lineas
+    assert "analizador_lecturas_ingresadas_total 0" in lineas
+
+
+def test_exportar_prometheus_escapa_tipos():
+    analizador = _analizador()
+    metricas = instrumentar(analizador)
+    analizador.agregar_lectura(1.0, 'sensor "A"\\1')
+    assert 'analizador_lecturas_por_tipo{tipo="sensor \\"A\\"\\\\1"} 1' in metricas.exportar_prometheus()
+
+
+def test_servidor_metricas_por_socket():
+    analizador = _analizador()
+    metricas = instrumentar(analizador)
+    analizador.agregar_lote([(20.0, "temperatura", None), (55.0, "humedad", None)])
+    servidor = ServidorMetricas(metricas, puerto=0).iniciar()
+    try:
+        base = "http://%s:%d" % servidor.direccion
+        with urllib.request.urlopen(base + "/metrics", timeout=5) as respuesta:
+            assert respuesta.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            texto = respuesta.read().decode("utf-8")
+        assert 'analizador_llamadas_total{metodo="agregar_lote"} 1' in texto
+        assert 'analizador_lecturas_por_tipo{tipo="humedad"} 1' in texto
+
+        with urllib.request.urlopen(base + "/instantanea", timeout=5) as respuesta:
+            instantanea = json.loads(respuesta.read())
+        assert instantanea["lecturas_ingresadas"] == 2
+        assert instantanea["lecturas_por_tipo"] == {"temperatura": 1, "humedad": 1}
+        assert instantanea["metodos"]["agregar_lote"]["llamadas"] == 1
+
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(base + "/otra", timeout=5)
+        assert error.value.code == 404
+    finally:
+        servidor.detener()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import random
+import statistics
+
+import pytest
+
+from motor_atipicos import calcular_limites, cuartiles
+from programa5_analizador import AnalizadorSensores
+from salida_eventos import SalidaSilenciosa
+
+
+def _valores(n, semilla=3):
+    azar = random.Random(semilla)
+    valores = [azar.gauss(22, 2) for _ in range(n)]
+    valores[::17] = [azar.choice((-10.0, 60.0)) for _ in valores[::17]]
+    return valores
+
+
+def _analizador(valores):
+    analizador = AnalizadorSensores(SalidaSilenciosa())
+    analizador.cache = None
+    analizador.agregar_lote((valor, "temperatura", None) for valor in valores)
+    return analizador
+
+
+def _atipicos_base(valores):
+    """Detección IQR como la hacía el analizador original"""
+    q1 = statistics.quantiles(valores, n=4)[0]
+    q3 = statistics.quantiles(valores, n=4)[2]
+    iqr = q3 - q1
+    limite_inferior = q1 - 1.5 * iqr
+    limite_superior = q3 + 1.5 * iqr
+    return [(valor, abs(valor - statistics.mean(valores))) for valor in valores
+            if valor < limite_inferior or valor > limite_superior]
+
+
+@pytest.mark.parametrize("n", [2, 3, 4, 5, 6, 7, 8, 11, 50, 101])
+def test_cuartiles_como_statistics(n):
+    ordenados = sorted(_valores(n, semilla=n))
+    q1, _, q3 = statistics.quantiles(ordenados, n=4, method="exclusive")
+    assert cuartiles(ordenados) == pytest.approx((q1, q3))
+
+
+@pytest.mark.parametrize("n", [3, 10, 200])
+def test_iqr_igual_al_analizador_original(n):
+    valores = _valores(n)
+    atipicos = _analizador(valores).detectar_valores_atipicos("temperatura")
+    obtenidos = [(atipico["valor"], atipico["desviacion"]) for atipico in atipicos]
+    esperados = _atipicos_base(valores)
+    assert [valor for valor, _ in obtenidos] == [valor for valor, _ in esperados]
+    assert [desviacion for _, desviacion in obtenidos] == pytest.approx([d for _, d in esperados])
+
+
+def test_zscore_y_mad_como_referencia():
+    valores = _valores(300)
+    media = statistics.mean(valores)
+    desviacion = statistics.stdev(valores)
+    inferior, superior, _ = calcular_limites(valores, "zscore")
+    assert (inferior, superior) == pytest.approx((media - 3 * desviacion, media + 3 * desviacion))
+
+    mediana = statistics.median(valores)
+    mad = statistics.median(abs(v - mediana) for v in valores)
+    inferior, superior, _ = calcular_limites(valores, "mad")
+    assert (inferior, superior) == pytest.approx((mediana - 3.5 * 1.4826 * mad, mediana + 3.5 * 1.4826 * mad))
+
+    atipicos = _analizador(valores).detectar_valores_atipicos("temperatura", metodo="mad")
+    assert [a["valor"] for a in atipicos] == [v for v in valores if abs(v - mediana) / (1.4826 * mad) > 3.5]
+
+
+def test_mad_cero_no_marca_todo():
+    valores = [10.0] * 20 + [10.5, 50.0]
+    atipicos = _analizador(valores).detectar_valores_atipicos("temperatura", metodo="mad")
+    assert [a["valor"] for a in atipicos] == [50.0]
+    assert _analizador([7.0] * 10).detectar_valores_atipicos("temperatura", metodo="mad") == []
+
+
+def test_metodo_desconocido():
+    with pytest.raises(ValueError):
+        calcular_limites([1.0, 2.0, 3.0], "percentil")
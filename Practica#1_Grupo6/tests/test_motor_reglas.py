@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+from motor_reglas import REGLAS_CONTROL_HOGAR, Histeresis, Horario, MotorReglas, Rango, Umbral
+
+
+def test_umbral_con_lecturas_ausentes():
+    condicion = Umbral("temperatura", ">", 28).compilar()
+    assert condicion({"temperatura": [30, 20, None, 28]}) == [True, False, False, False]
+
+
+def test_umbral_y_rango_rechazan_texto_por_igual():
+    lote = {"temperatura": ["caliente"]}
+    with pytest.raises(TypeError):
+        Umbral("temperatura", "<", 28).compilar()(lote)
+    with pytest.raises(TypeError):
+        Rango("temperatura", 18, 30).compilar()(lote)
+
+
+def test_rango_y_horario_con_lecturas_ausentes():
+    assert Rango("temperatura", 18, 30).compilar()({"temperatura": [20, None, 35]}) == [True, False, False]
+    assert Horario(18, 24).compilar()({"hora": [19, None, 3]}) == [True, False, False]
+
+
+def test_histeresis_mantiene_estado_sin_lectura():
+    condicion = Histeresis("temperatura", 30, 25).compilar()
+    assert condicion({"dispositivo": ["a"], "temperatura": [31]}) == [True]
+    assert condicion({"dispositivo": ["a"], "temperatura": [None]}) == [True]
+    assert condicion({"dispositivo": ["a"], "temperatura": [24]}) == [False]
+
+
+def test_control_hogar_no_enciende_actuadores_sin_lecturas():
+    decisiones = MotorReglas(REGLAS_CONTROL_HOGAR).evaluar({
+        "dispositivo": ["hogar"],
+        "temperatura": [None],
+        "humedad": [None],
+        "hora": [None]
+    })
+    assert decisiones == {"ventilador": [False], "humidificador": [False], "luz_inteligente": [False]}
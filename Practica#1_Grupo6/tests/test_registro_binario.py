@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+import textwrap
+
+from programa5_analizador import AnalizadorSensores
+import registro_binario
+from registro_binario import EscritorRegistro, LectorRegistro, cargar_almacen
+from salida_eventos import SalidaSilenciosa
+
+CARPETA_MODULOS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _escribir_y_caer(ruta, cantidad=9000):
+    """Escribe lecturas en otro proceso y termina sin volcar los búferes"""
+    codigo = textwrap.dedent(f"""
+        import os
+        from registro_binario import EscritorRegistro
+        escritor = EscritorRegistro({str(ruta)!r})
+        for i in range({cantidad}):
+            tipo = "humedad" if i % 10 == 0 else "temperatura"
+            escritor.agregar(float(i), tipo, i)
+        os._exit(0)
+    """)
+    subprocess.run([sys.executable, "-c", codigo], cwd=CARPETA_MODULOS, check=True)
+
+
+def _lecturas_alineadas(almacen):
+    """Cada lectura guarda su índice como valor y tiempo: deben coincidir"""
+    lecturas = list(almacen.lecturas_crudas())
+    assert all(valor == tiempo for valor, _, tiempo in lecturas)
+    return lecturas
+
+
+def test_carga_tras_caida_sin_reparar(tmp_path):
+    _escribir_y_caer(tmp_path)
+    lector = LectorRegistro(str(tmp_path))
+    almacen = cargar_almacen(lector)
+    lecturas = _lecturas_alineadas(almacen)
+    assert len(lecturas) == len(almacen) > 0
+    assert sum(len(almacen.columna(t)) for t in almacen.tipos_registrados()) == len(almacen)
+    del almacen, lecturas
+    lector.cerrar()
+
+
+def test_reabrir_tras_caida_y_anexar(tmp_path):
+    _escribir_y_caer(tmp_path)
+    ruta = str(tmp_path)
+
+    analizador = AnalizadorSensores.desde_registro(ruta, SalidaSilenciosa())
+    recuperadas = len(analizador.almacen)
+    _lecturas_alineadas(analizador.almacen)
+    for i in range(recuperadas, recuperadas + 50):
+        analizador.agregar_lote([(float(i), "humedad" if i % 2 else "temperatura", i)])
+    analizador.cerrar_registro()
+
+    reabierto = AnalizadorSensores.desde_registro(ruta, SalidaSilenciosa(), persistir=False)
+    lecturas = _lecturas_alineadas(reabierto.almacen)
+    assert len(lecturas) == recuperadas + 50
+    assert [valor for valor, _, _ in lecturas[-50:]] == [float(i) for i in range(recuperadas, recuperadas + 50)]
+
+
+def test_sincronizar_y_reabrir(tmp_path):
+    escritor = EscritorRegistro(str(tmp_path))
+    for i in range(100):
+        escritor.agregar(float(i), "presion", i)
+    escritor.cerrar()
+    analizador = AnalizadorSensores.desde_registro(str(tmp_path), SalidaSilenciosa(), persistir=False)
+    assert len(analizador.almacen) == 100
+    assert analizador.calcular_estadisticas("presion")["maximo"] == 99.0
+
+
+def test_reabrir_tras_cierre_limpio_no_lee_la_secuencia(tmp_path, monkeypatch):
+    ruta = str(tmp_path)
+    analizador = AnalizadorSensores(SalidaSilenciosa())
+    analizador.persistir_en(ruta)
+    analizador.agregar_lote((float(i), "humedad" if i % 3 else "temperatura", i) for i in range(3000))
+    analizador.cerrar_registro()
+
+    def _sin_conciliar(*_):
+        raise AssertionError("la reapertura tras un cierre limpio no debe recorrer la secuencia")
+
+    monkeypatch.setattr(registro_binario, "_conciliar", _sin_conciliar)
+    for persistir in (True, False):
+        reabierto = AnalizadorSensores.desde_registro(ruta, SalidaSilenciosa(), persistir=persistir)
+        assert len(_lecturas_alineadas(reabierto.almacen)) == 3000
+        assert len(reabierto.almacen.columna("temperatura")) == 1000
+        reabierto.cerrar_registro()
+
+
+def test_punto_control_desactualizado_se_concilia(tmp_path):
+    ruta = str(tmp_path)
+    analizador = AnalizadorSensores(SalidaSilenciosa())
+    analizador.persistir_en(ruta)
+    analizador.agregar_lote((float(i), "presion", i) for i in range(100))
+    analizador.cerrar_registro()
+    # Lecturas anexadas después del punto de control y una columna a medio escribir
+    escritor = EscritorRegistro(ruta)
+    for i in range(100, 150):
+        escritor.agregar(float(i), "presion", i)
+    escritor.cerrar()
+    with open(os.path.join(ruta, "c0.val"), "ab") as archivo:
+        archivo.write(b"\0" * 12)
+
+    reabierto = AnalizadorSensores.desde_registro(ruta, SalidaSilenciosa())
+    assert len(_lecturas_alineadas(reabierto.almacen)) == 150
+    assert os.path.getsize(os.path.join(ruta, "c0.val")) == 16 + 150 * 8
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+import statistics
+
+from programa5_analizador import AnalizadorSensores
+from reporte_sensores import UMBRALES_SEGUROS, construir_reporte, renderizar_reporte
+from salida_eventos import SalidaSilenciosa
+
+# Incluye atípicos, lecturas fuera de UMBRALES_SEGUROS (bajas y altas), un tipo
+# con umbral que no se muestra (presion) y tipos con menos de 3 lecturas
+LECTURAS = (
+    [(v, "temperatura") for v in (20.1, 21.4, 19.8, 22.0, 20.6, 21.1, 35.5, 12.3, 17.9, 30.2, 20.9, 21.7)]
+    + [(v, "humedad") for v in (45.0, 52.5, 49.1, 85.7, 25.2, 60.3, 55.5, 47.8, 80.1, 29.9)]
+    + [(v, "presion") for v in (1008.2, 1011.4, 1025.0, 1009.9, 995.5, 1010.1)]
+    + [(42.0, "calidad_aire"), (140.0, "calidad_aire")]
+    + [(3.3, "voltaje")]
+)
+
+SIN_COLORES = dict.fromkeys(("titulo", "normal", "estadistica", "atipico", "advertencia"), "")
+
+REPORTE_ESPERADO = """
+================================================================================
+                     REPORTE COMPLETO DE SENSORES
+================================================================================
+
+📊 TEMPERATURA:
+   • Lecturas: 12
+   • Rango: 12.30 - 35.50
+   • Promedio: 21.96
+   • Desviación estándar: 5.83
+   • Valores atípicos: 3
+     ◦ 35.50 (desviación: 13.54)
+     ◦ 12.30 (desviación: 9.66)
+     ◦ 30.20 (desviación: 8.24)
+   • Valores fuera de umbral seguro: 4
+
+📊 HUMEDAD:
+   • Lecturas: 10
+   • Rango: 25.20 - 85.70
+   • Promedio: 53.11
+   • Desviación estándar: 19.08
+   • Valores fuera de umbral seguro: 4
+
+📊 PRESION:
+   • Lecturas: 6
+   • Rango: 995.50 - 1025.00
+   • Promedio: 1010.02
+   • Desviación estándar: 9.39
+
+📊 CALIDAD_AIRE:
+   • Lecturas: 2
+   • Rango: 42.00 - 140.00
+   • Promedio: 91.00
+   • Desviación estándar: 69.30
+
+📊 VOLTAJE:
+   • Lecturas: 1
+   • Rango: 3.30 - 3.30
+   • Promedio: 3.30
+   • Desviación estándar: 0.00
+"""
+
+
+def _analizador():
+    analizador = AnalizadorSensores(SalidaSilenciosa())
+    analizador.agregar_lote((valor, tipo, "2023-10-15 10:00") for valor, tipo in LECTURAS)
+    return analizador
+
+
+def _bloques(texto):
+    """Separa el reporte en cabecera y bloques por tipo (el original los ordenaba con un set)"""
+    cabecera, *bloques = texto.split("\n\n")
+    return cabecera, sorted(bloque.rstrip("\n") for bloque in bloques)
+
+
+def _reporte_original(lecturas, colores):
+    """generar_reporte_completo del analizador original, sobre listas de tuplas"""
+    print(f"\n{colores['titulo']}{'='*80}")
+    print("                     REPORTE COMPLETO DE SENSORES")
+    print(f"{'='*80}{colores['normal']}")
+    for tipo in set(t for _, t in lecturas):
+        valores = [v for v, t in lecturas if t == tipo]
+        print(f"\n{colores['estadistica']}📊 {tipo.upper()}:{colores['normal']}")
+        print(f"   • Lecturas: {len(valores)}")
+        print(f"   • Rango: {min(valores):.2f} - {max(valores):.2f}")
+        print(f"   • Promedio: {statistics.mean(valores):.2f}")
+        print(f"   • Desviación estándar: {statistics.stdev(valores) if len(valores) > 1 else 0:.2f}")
+        if len(valores) >= 3:
+            q1, _, q3 = statistics.quantiles(valores, n=4)
+            iqr = q3 - q1
+            atipicos = [v for v in valores if v < q1 - 1.5 * iqr or v > q3 + 1.5 * iqr]
+            if atipicos:
+                print(f"   {colores['atipico']}• Valores atípicos: {len(atipicos)}{colores['normal']}")
+                for valor in atipicos[:3]:
+                    print(f"     ◦ {valor:.2f} (desviación: {abs(valor - statistics.mean(valores)):.2f})")
+        if tipo in ["temperatura", "humedad"]:
+            umbral = UMBRALES_SEGUROS[tipo]
+            fuera = [v for v in valores if v < umbral["min"] or v > umbral["max"]]
+            if fuera:
+                print(f"   {colores['advertencia']}• Valores fuera de umbral seguro: {len(fuera)}"
+                      f"{colores['normal']}")
+
+
+def test_reporte_dorado(capsys):
+    analizador = _analizador()
+    renderizar_reporte(construir_reporte(analizador.almacen), analizador.almacen, SIN_COLORES)
+    assert capsys.readouterr().out == REPORTE_ESPERADO
+
+
+def test_reporte_igual_al_original(capsys):
+    analizador = _analizador()
+    analizador.generar_reporte_completo()
+    obtenido = capsys.readouterr().out
+    _reporte_original(LECTURAS, analizador.colores)
+    assert _bloques(obtenido) == _bloques(capsys.readouterr().out)
+
+
+def test_reporte_paralelo_imprime_lo_mismo(capsys):
+    analizador = _analizador()
+    analizador.generar_reporte_completo()
+    secuencial = capsys.readouterr().out
+    analizador.generar_reporte_completo(procesos=2)
+    assert capsys.readouterr().out == secuencial
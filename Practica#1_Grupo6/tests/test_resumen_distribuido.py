@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+import random
+import statistics
+
+import pytest
+
+from estadisticas_flujo import LIMITE_EXACTO
+from motor_atipicos import calcular_limites
+from programa5_analizador import AnalizadorSensores
+from resumen_distribuido import (AgregadorCentral, BosquejoCuantiles, ResumenAnalizador, ResumenTipo,
+                                 combinar_resumenes)
+from salida_eventos import SalidaSilenciosa
+
+
+def _resumen(valores):
+    resumen = ResumenTipo()
+    resumen.agregar_valores(valores)
+    return resumen
+
+
+def test_combinar_no_comparte_resumenes():
+    a = ResumenAnalizador({"temperatura": _resumen([20.0, 21.0])}, ["a"])
+    b = ResumenAnalizador({"humedad": _resumen([50.0])}, ["b"])
+    combinado = combinar_resumenes([a, b])
+    combinado.tipos["humedad"].agregar_valores([60.0, 70.0])
+    combinado.tipos["temperatura"].agregar_valores([30.0])
+    assert b.tipos["humedad"].cantidad == 1
+    assert a.tipos["temperatura"].cantidad == 2
+
+
+def test_cubetas_acotadas_con_rango_amplio():
+    generador = random.Random(7)
+    valores = [10 ** generador.uniform(-3, 6) for _ in range(20000)]
+    resumen = _resumen(valores)
+    bosquejo = resumen.bosquejo
+    assert len(bosquejo.positivas) <= bosquejo.max_cubetas
+    assert len(bosquejo) == len(valores)
+    ordenados = sorted(valores)
+    exacto = ordenados[int(0.99 * (len(ordenados) - 1))]
+    assert abs(resumen.cuantil(0.99) - exacto) <= exacto * 0.01
+
+
+def test_combinar_y_restaurar_respetan_el_limite():
+    a, b = BosquejoCuantiles(max_cubetas=64), BosquejoCuantiles(max_cubetas=64)
+    for i in range(1, 5000):
+        a.agregar(float(i))
+        b.agregar(-float(i) * 3)
+    combinado = a.combinar(b)
+    assert len(combinado.positivas) <= 64 and len(combinado.negativas) <= 64
+    assert len(combinado) == 2 * 4999
+    restaurado = BosquejoCuantiles.restaurar_estado(combinado.exportar_estado())
+    assert restaurado.exportar_estado() == combinado.exportar_estado()
+    assert restaurado.cuantil(0.999) == combinado.cuantil(0.999)
+
+
+def _analizador(valores):
+    analizador = AnalizadorSensores(SalidaSilenciosa())
+    analizador.agregar_lote((valor, "temperatura", i) for i, valor in enumerate(valores))
+    return analizador
+
+
+def test_nodo_reiniciado_reemplaza_su_resumen(tmp_path):
+    ruta = str(tmp_path / "lecturas")
+    analizador = _analizador([20.0, 21.0, 22.0])
+    analizador.persistir_en(ruta)
+    central = AgregadorCentral()
+    central.recibir(analizador.exportar_resumen("nodo-a").a_json())
+    central.recibir(_analizador([30.0]).exportar_resumen("nodo-b"))
+    anterior = analizador.exportar_resumen("nodo-a")
+    analizador.cerrar_registro()
+
+    # El nodo se reinicia desde su registro y vuelve a enviar el resumen completo
+    reiniciado = AnalizadorSensores.desde_registro(ruta, SalidaSilenciosa())
+    reiniciado.agregar_lectura(23.0, "temperatura")
+    assert central.recibir(reiniciado.exportar_resumen("nodo-a").a_json())
+    assert central.estadisticas("temperatura")["cantidad"] == 5
+    # Un resumen atrasado de la ejecución anterior no reemplaza al nuevo
+    assert not central.recibir(anterior)
+    assert central.estadisticas("temperatura")["cantidad"] == 5
+    reiniciado.cerrar_registro()
+
+
+def test_exportar_resumen_exige_id_de_nodo():
+    with pytest.raises(TypeError):
+        _analizador([1.0]).exportar_resumen()
+    with pytest.raises(ValueError):
+        _analizador([1.0]).exportar_resumen("")
+    combinado = combinar_resumenes([_analizador([1.0]).exportar_resumen("a"),
+                                    _analizador([2.0]).exportar_resumen("b")])
+    with pytest.raises(ValueError):
+        AgregadorCentral().recibir(combinado)
+
+
+@pytest.mark.parametrize("cantidad", [7, LIMITE_EXACTO, 3 * LIMITE_EXACTO])
+def test_mismas_claves_que_calcular_estadisticas(cantidad):
+    generador = random.Random(cantidad)
+    valores = [generador.gauss(22, 3) for _ in range(cantidad)]
+    mitad = cantidad // 2
+    central = AgregadorCentral()
+    central.recibir(_analizador(valores[:mitad]).exportar_resumen("a").a_json())
+    central.recibir(_analizador(valores[mitad:]).exportar_resumen("b").a_json())
+    local = _analizador(valores)
+    distribuidas = central.estadisticas("temperatura")
+    assert distribuidas.keys() == local.calcular_estadisticas("temperatura").keys()
+    if cantidad <= LIMITE_EXACTO:
+        # Con pocas lecturas la mediana y los límites IQR son exactos
+        assert distribuidas["mediana"] == pytest.approx(statistics.median(valores))
+        inferior, superior, _ = calcular_limites(valores)
+        assert central.limites_atipicos("temperatura") == pytest.approx((inferior, superior))
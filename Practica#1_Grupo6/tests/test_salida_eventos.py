@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+import logging
+
+from programa4_registro import RegistroDispositivosIoT
+from salida_eventos import SalidaLogging
+
+
+def test_logging_en_warning_no_pierde_errores(caplog):
+    logger = logging.getLogger("iot.prueba")
+    logger.setLevel(logging.WARNING)
+    salida = SalidaLogging(logger)
+    assert salida.activo
+
+    registro = RegistroDispositivosIoT(salida)
+    with caplog.at_level(logging.WARNING, logger="iot.prueba"):
+        registro.agregar_dispositivo("s1", "sensor", "Cocina", "activo", "2024-01-01")
+        registro.agregar_dispositivo("s1", "sensor", "Cocina", "activo", "2024-01-01")
+        registro.actualizar_estado("no-existe", "activo")
+
+    niveles = [r.levelno for r in caplog.records]
+    assert niveles == [logging.ERROR, logging.ERROR]
+
+
+def test_logging_en_critical_esta_inactivo():
+    logger = logging.getLogger("iot.prueba.critico")
+    logger.setLevel(logging.CRITICAL)
+    assert not SalidaLogging(logger).activo
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+import os
+import re
+import signal
+import subprocess
+import sys
+
+import pytest
+
+from programa4_registro import RegistroDispositivosIoT
+from programa5_analizador import AnalizadorSensores
+from salida_eventos import SalidaSilenciosa
+from servicio_iot import ClienteIoT, ServicioIoT, ServidorIoT
+
+CARPETA_MODULOS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_llamadas_y_errores():
+    servidor = ServidorIoT(puerto=0).iniciar()
+    try:
+        with ClienteIoT(*servidor.direccion) as cliente:
+            assert cliente.llamar("ping") == "pong"
+            cliente.llamar("agregar_lote", [[21.5, "temperatura", None], [22.5, "temperatura", None]])
+            assert cliente.llamar("calcular_estadisticas", "temperatura")["cantidad"] == 2
+            assert cliente.llamar("agregar_dispositivo", "s1", "sensor", "Sala", "activo", "N/A")
+            assert cliente.llamar("obtener_dispositivo", "s1")["ubicación"] == "Sala"
+            with pytest.raises(RuntimeError, match="desconocido"):
+                cliente.llamar("cerrar")
+    finally:
+        servidor.detener()
+
+
+def test_sigterm_guarda_ambos_registros(tmp_path):
+    base = str(tmp_path / "dispositivos.db")
+    lecturas = str(tmp_path / "lecturas")
+    proceso = subprocess.Popen(
+        [sys.executable, "iot_cli.py", "daemon", "--puerto", "0",
+         "--registro-sqlite", base, "--registro-lecturas", lecturas],
+        cwd=CARPETA_MODULOS, stdout=subprocess.PIPE, text=True)
+    try:
+        puerto = int(re.search(r":(\d+)", proceso.stdout.readline()).group(1))
+        with ClienteIoT("127.0.0.1", puerto) as cliente:
+            assert cliente.llamar("agregar_dispositivo", "s1", "sensor", "Sala", "activo", "N/A")
+            assert cliente.llamar("actualizar_estado", "s1", "inactivo")
+            cliente.llamar("agregar_lectura", 25.0, "temperatura")
+        proceso.send_signal(signal.SIGTERM)
+        assert proceso.wait(timeout=10) == 0
+    finally:
+        proceso.kill()
+        proceso.stdout.close()
+
+    registro = RegistroDispositivosIoT.abrir_sqlite(base, SalidaSilenciosa())
+    assert registro.obtener_dispositivo("s1")["estado"] == "inactivo"
+    registro.cerrar()
+    assert os.path.exists(os.path.join(lecturas, "resumen.json"))
+    analizador = AnalizadorSensores.desde_registro(lecturas, SalidaSilenciosa(), persistir=False)
+    assert analizador.calcular_estadisticas("temperatura")["cantidad"] == 1
+
+
+def test_metricas_habilitadas_con_el_servicio_en_marcha():
+    analizador = AnalizadorSensores(SalidaSilenciosa())
+    servidor = ServidorIoT(ServicioIoT(analizador), puerto=0).iniciar()
+    try:
+        with ClienteIoT(*servidor.direccion) as cliente:
+            cliente.llamar("agregar_lectura", 20.0, "temperatura")
+            metricas = analizador.habilitar_metricas()
+            cliente.llamar("agregar_lectura", 21.0, "temperatura")
+            cliente.llamar("calcular_estadisticas", "temperatura")
+    finally:
+        servidor.detener()
+    assert metricas.lecturas_ingresadas == 1
+    assert metricas.metodos["calcular_estadisticas"].cantidad == 1
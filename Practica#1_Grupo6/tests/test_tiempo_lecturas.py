@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime, timezone
+
+import pytest
+
+from programa5_analizador import AnalizadorSensores
+from salida_eventos import SalidaSilenciosa
+from tiempo_lecturas import NS_POR_SEGUNDO, convertir_timestamp, formatear_timestamp
+
+
+def test_formatos_de_los_programas():
+    ns = convertir_timestamp("2024-01-01 08:30:15")
+    assert formatear_timestamp(ns) == "2024-01-01 08:30:15"
+    assert convertir_timestamp("2024-01-01 08:30") == ns - 15 * NS_POR_SEGUNDO
+
+
+def test_iso_8601_y_datetime():
+    local = convertir_timestamp("2024-01-01 08:30:15")
+    assert convertir_timestamp("2024-01-01T08:30:15") == local
+    assert convertir_timestamp("2024-01-01T08:30:15.250000") == local + 250_000_000
+    assert convertir_timestamp(datetime(2024, 1, 1, 8, 30, 15)) == local
+    utc = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    assert convertir_timestamp("2024-01-01T00:00:00+00:00") == convertir_timestamp(utc) == 1704067200 * NS_POR_SEGUNDO
+
+
+def test_texto_invalido():
+    with pytest.raises(ValueError):
+        convertir_timestamp("ayer por la tarde")
+
+
+def test_analizador_acepta_datetime_e_iso():
+    analizador = AnalizadorSensores(SalidaSilenciosa())
+    analizador.agregar_lectura(21.0, "temperatura", datetime(2024, 5, 1, 12, 0))
+    analizador.agregar_lote([(22.0, "temperatura", "2024-05-01T12:05:00")])
+    assert [t for _, _, t in analizador.almacen.lecturas()] == ["2024-05-01 12:00:00", "2024-05-01 12:05:00"]
+
+
+def test_datos_sensores_es_de_solo_lectura():
+    analizador = AnalizadorSensores(SalidaSilenciosa())
+    analizador.agregar_lectura(21.0, "temperatura", "2024-05-01 10:00")
+    analizador.agregar_lectura(55.0, "humedad", "2024-05-01 10:00:30")
+    datos = analizador.datos_sensores
+    assert datos == ((21.0, "temperatura", "2024-05-01 10:00:00"), (55.0, "humedad", "2024-05-01 10:00:30"))
+    # Modificarla falla en lugar de perder el cambio en silencio
+    with pytest.raises(AttributeError):
+        datos.append((22.0, "temperatura", None))
+    with pytest.raises(TypeError):
+        datos[0] = (0.0, "temperatura", None)
+    analizador.agregar_lectura(22.0, "temperatura", "2024-05-01 10:01")
+    assert len(analizador.datos_sensores) == 3 and len(datos) == 2
@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+import statistics
+
+from ventanas_tiempo import VentanaDeslizante, VentanaFija
+
+
+def test_desviacion_deslizante_con_valores_grandes():
+    ventana = VentanaDeslizante(100)
+    valores = [1.7e9 + (i % 7) * 0.001 for i in range(1000)]
+    for tiempo, valor in enumerate(valores):
+        ventana.agregar(tiempo, valor)
+    esperada = statistics.stdev(valores[-100:])
+    obtenida = ventana.estadisticas()["desviacion_estandar"]
+    assert abs(obtenida - esperada) < esperada * 1e-3
+
+
+def test_deslizante_vacia_tras_expulsar():
+    ventana = VentanaDeslizante(10)
+    ventana.agregar(0, 1013.2)
+    ventana.agregar(1, 1013.4)
+    ventana.expulsar(100)
+    assert ventana.estadisticas() == {"cantidad": 0, "atipicos": 0}
+
+
+def test_fija_descarta_lecturas_de_ventanas_cerradas():
+    ventana = VentanaFija(10)
+    assert ventana.agregar(5, 1.0)
+    assert ventana.agregar(15, 2.0)
+    assert not ventana.agregar(3, 9.0)
+    assert ventana.tardias == 1
+    assert ventana.estadisticas()["cantidad"] == 1
+    assert ventana.cerradas[0][1]["maximo"] == 1.0
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+MARCAS DE TIEMPO DE LECTURAS
+Representación nativa en nanosegundos epoch (int64, la de time.time_ns()) y
+análisis de textos con detección de formato en caché.
+El formateo a texto solo ocurre al mostrar los datos.
+"""
+
+from datetime import datetime
+from functools import lru_cache
+
+NS_POR_SEGUNDO = 1_000_000_000
+FORMATO_SALIDA = "%Y-%m-%d %H:%M:%S"
+
+# Formatos de texto aceptados (los de los programas de ejemplo); cualquier otro
+# texto ISO 8601 (con 'T', fracciones de segundo o zona horaria) se acepta con fromisoformat
+FORMATOS_TIMESTAMP = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M")
+
+# Convierte cada dígito en '0' para obtener la "forma" de un texto
+_FORMA = str.maketrans("0123456789", "0000000000")
+
+
+def _fecha_hora_segundos(texto):
+    """Forma 0000-00-00 00:00:00"""
+    return datetime(int(texto[0:4]), int(texto[5:7]), int(texto[8:10]),
+                    int(texto[11:13]), int(texto[14:16]), int(texto[17:19]))
+
+
+def _fecha_hora_minutos(texto):
+    """Formas 0000-00-00 00:00 y 0000-00-00 0:00 (hora de un dígito)"""
+    fecha, hora = texto.split(" ")
+    horas, minutos = hora.split(":")
+    return datetime(int(fecha[0:4]), int(fecha[5:7]), int(fecha[8:10]), int(horas), int(minutos))
+
+
+# Analizadores rápidos por forma; las formas desconocidas se resuelven con strptime
+_ANALIZADORES = {
+    "0000-00-00 00:00:00": _fecha_hora_segundos,
+    "0000-00-00 00:00": _fecha_hora_minutos,
+    "0000-00-00 0:00": _fecha_hora_minutos
+}
+
+
+def _detectar_analizador(forma: str, texto: str):
+    """Busca el formato de un texto de forma nueva y lo guarda en la caché de formas"""
+    for formato in FORMATOS_TIMESTAMP:
+        try:
+            datetime.strptime(texto, formato)
+        except ValueError:
+            continue
+        def analizador(texto, formato=formato):
+            return datetime.strptime(texto, formato)
+        _ANALIZADORES[forma] = analizador
+        return analizador
+    try:
+        datetime.fromisoformat(texto)
+    except ValueError:
+        pass
+    else:
+        _ANALIZADORES[forma] = datetime.fromisoformat
+        return datetime.fromisoformat
+    raise ValueError(f"Formato de timestamp no reconocido: {texto}")
+
+
+@lru_cache(maxsize=4096)
+def parsear_timestamp(texto: str) -> int:
+    """
+    Convierte un texto de marca de tiempo (hora local) a nanosegundos epoch.
+    Muchas lecturas comparten la misma marca, por eso el resultado se guarda en caché.
+
+    Args:
+        texto (str): Texto en alguno de los FORMATOS_TIMESTAMP o en ISO 8601
+    """
+    forma = texto.translate(_FORMA)
+    analizador = _ANALIZADORES.get(forma)
+    if analizador is None:
+        analizador = _detectar_analizador(forma, texto)
+    try:
+        fecha = analizador(texto)
+    except ValueError:
+        raise ValueError(f"Formato de timestamp no reconocido: {texto}") from None
+    return _datetime_a_ns(fecha)
+
+
+def _datetime_a_ns(fecha: datetime) -> int:
+    """Nanosegundos epoch de un datetime (sin zona horaria se toma como hora local)"""
+    return int(fecha.replace(microsecond=0).timestamp()) * NS_POR_SEGUNDO + fecha.microsecond * 1000
+
+
+def convertir_timestamp(timestamp) -> int:
+    """
+    Convierte una marca de tiempo a nanosegundos epoch
+
+    Args:
+        timestamp: Texto (ver FORMATOS_TIMESTAMP o ISO 8601), datetime, float con
+                   segundos epoch (como time.time()) o int con nanosegundos epoch
+    """
+    if isinstance(timestamp, int):
+        return timestamp
+    if isinstance(timestamp, float):
+        return int(timestamp * NS_POR_SEGUNDO)
+    if isinstance(timestamp, datetime):
+        return _datetime_a_ns(timestamp)
+    return parsear_timestamp(timestamp)
+
+
+def formatear_timestamp(tiempo_ns: int, formato: str = FORMATO_SALIDA) -> str:
+    """
+    Convierte nanosegundos epoch a texto (solo al mostrar los datos)
+
+    Args:
+        tiempo_ns (int): Nanosegundos epoch
+        formato (str): Formato de salida de strftime
+    """
+    return datetime.fromtimestamp(tiempo_ns // NS_POR_SEGUNDO).strftime(formato)
+
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+AGREGACIÓN POR VENTANAS DE TIEMPO
+Ventanas deslizantes y fijas (tumbling) por tipo de sensor actualizadas en O(1)
+amortizado por lectura: búfer circular de lecturas, colas monótonas para
+mínimo/máximo y media/varianza de Welford que se actualizan al agregar y
+al expulsar lecturas vencidas (sin sumas de cuadrados, que pierden precisión
+con valores grandes como presiones o marcas de tiempo)
+"""
+
+import math
+from collections import deque
+
+UMBRAL_Z_VENTANA = 3.0  # Desviaciones estándar para contar una lectura como atípica
+MINIMO_PARA_ATIPICOS = 3
+
+
+def _resumen(cantidad, media, m2, minimo, maximo, atipicos):
+    """Arma el diccionario de estadísticas de una ventana"""
+    if cantidad == 0:
+        return {"cantidad": 0, "atipicos": 0}
+    varianza = m2 / (cantidad - 1) if cantidad > 1 else 0.0
+    return {
+        "cantidad": cantidad,
+        "promedio": media,
+        "minimo": minimo,
+        "maximo": maximo,
+        "desviacion_estandar": math.sqrt(max(varianza, 0.0)),
+        "atipicos": atipicos
+    }
+
+
+def _es_atipico(valor, cantidad, media, m2, umbral_z):
+    """Indica si el valor se aleja más de umbral_z desviaciones de la media acumulada"""
+    if cantidad < MINIMO_PARA_ATIPICOS:
+        return False
+    varianza = m2 / (cantidad - 1)
+    if varianza <= 0:
+        return False
+    return abs(valor - media) > umbral_z * math.sqrt(varianza)
+
+
+class VentanaDeslizante:
+    """Estadísticas de las lecturas de los últimos `duracion` segundos"""
+
+    __slots__ = ("duracion", "umbral_z", "lecturas", "minimos", "maximos",
+                 "media", "m2", "atipicos", "ultimo_tiempo")
+
+    def __init__(self, duracion: float, umbral_z: float = UMBRAL_Z_VENTANA):
+        self.duracion = duracion
+        self.umbral_z = umbral_z
+        self.lecturas = deque()  # (tiempo, valor, es_atipico) en orden de llegada
+        self.minimos = deque()   # (tiempo, valor) con valores crecientes
+        self.maximos = deque()   # (tiempo, valor) con valores decrecientes
+        self.media = 0.0
+        self.m2 = 0.0            # Suma de cuadrados de las desviaciones respecto a la media
+        self.atipicos = 0
+        self.ultimo_tiempo = -math.inf
+
+    def agregar(self, tiempo: float, valor: float):
+        """
+        Agrega una lectura y expulsa las que salieron de la ventana
+
+        Args:
+            tiempo (float): Marca de tiempo de la lectura (las lecturas atrasadas
+                            se tratan como llegadas en el último tiempo visto)
+            valor (float): Valor de la lectura
+        """
+        if tiempo < self.ultimo_tiempo:
+            tiempo = self.ultimo_tiempo
+        self.ultimo_tiempo = tiempo
+        self.expulsar(tiempo)
+
+        atipico = _es_atipico(valor, len(self.lecturas), self.media, self.m2, self.umbral_z)
+        self.lecturas.append((tiempo, valor, atipico))
+        delta = valor - self.media
+        self.media += delta / len(self.lecturas)
+        self.m2 += delta * (valor - self.media)
+        self.atipicos += atipico
+
+        minimos = self.minimos
+        while minimos and minimos[-1][1] >= valor:
+            minimos.pop()
+        minimos.append((tiempo, valor))
+
+        maximos = self.maximos
+        while maximos and maximos[-1][1] <= valor:
+            maximos.pop()
+        maximos.append((tiempo, valor))
+
+    def expulsar(self, ahora: float):
+        """
+        Descarta las lecturas con tiempo <= ahora - duracion
+
+        Args:
+            ahora (float): Tiempo de referencia
+        """
+        limite = ahora - self.duracion
+        lecturas = self.lecturas
+        while lecturas and lecturas[0][0] <= limite:
+            _, valor, atipico = lecturas.popleft()
+            self.atipicos -= atipico
+            if lecturas:
+                # Welford inverso: quitar la lectura de la media y de m2
+                delta = valor - self.media
+                self.media -= delta / len(lecturas)
+                self.m2 = max(self.m2 - delta * (valor - self.media), 0.0)
+            else:
+                # Evitar que se acumule error de redondeo entre ventanas
+                self.media = 0.0
+                self.m2 = 0.0
+        while self.minimos and self.minimos[0][0] <= limite:
+            self.minimos.popleft()
+        while self.maximos and self.maximos[0][0] <= limite:
+            self.maximos.popleft()
+
+    def estadisticas(self):
+        """Devuelve cantidad, promedio, mínimo, máximo, desviación estándar y atípicos"""
+        if not self.lecturas:
+            return _resumen(0, 0.0, 0.0, None, None, 0)
+        return _resumen(len(self.lecturas), self.media, self.m2,
+                        self.minimos[0][1], self.maximos[0][1], self.atipicos)
+
+
+class VentanaFija:
+    """
+    Ventanas consecutivas sin solapamiento de `duracion` segundos (tumbling).
+    Las lecturas atrasadas de una ventana ya cerrada se descartan y se cuentan en `tardias`.
+    """
+
+    __slots__ = ("duracion", "umbral_z", "inicio", "cantidad", "media", "m2",
+                 "minimo", "maximo", "atipicos", "cerradas", "tardias")
+
+    def __init__(self, duracion: float, historial: int = 60, umbral_z: float = UMBRAL_Z_VENTANA):
+        self.duracion = duracion
+        self.umbral_z = umbral_z
+        self.inicio = None
+        self.cerradas = deque(maxlen=historial)  # (inicio, estadisticas) de ventanas ya cerradas
+        self.tardias = 0
+        self._reiniciar()
+
+    def _reiniciar(self):
+        """Vacía los acumuladores de la ventana en curso"""
+        self.cantidad = 0
+        self.media = 0.0
+        self.m2 = 0.0
+        self.minimo = math.inf
+        self.maximo = -math.inf
+        self.atipicos = 0
+
+    def agregar(self, tiempo: float, valor: float):
+        """
+        Agrega una lectura; si pertenece a una ventana nueva, cierra la actual
+
+        Args:
+            tiempo (float): Marca de tiempo de la lectura
+            valor (float): Valor de la lectura
+
+        Returns:
+            bool: False si la lectura es de una ventana ya cerrada y se descartó
+        """
+        inicio = tiempo - tiempo % self.duracion
+        if self.inicio is None:
+            self.inicio = inicio
+        elif inicio > self.inicio:
+            self.cerradas.append((self.inicio, self.estadisticas()))
+            self.inicio = inicio
+            self._reiniciar()
+        elif inicio < self.inicio:
+            self.tardias += 1
+            return False
+
+        self.atipicos += _es_atipico(valor, self.cantidad, self.media, self.m2, self.umbral_z)
+        self.cantidad += 1
+        delta = valor - self.media
+        self.media += delta / self.cantidad
+        self.m2 += delta * (valor - self.media)
+        if valor < self.minimo:
+            self.minimo = valor
+        if valor > self.maximo:
+            self.maximo = valor
+        return True
+
+    def estadisticas(self):
+        """Estadísticas de la ventana en curso"""
+        if self.cantidad == 0:
+            return _resumen(0, 0.0, 0.0, None, None, 0)
+        return _resumen(self.cantidad, self.media, self.m2,
+                        self.minimo, self.maximo, self.atipicos)
+
+
+class AgregadorVentanas:
+    def __init__(self, deslizantes=(60, 300, 3600), fijas=(), historial: int = 60):
+        """
+        Inicializa el agregador de ventanas por tipo de sensor
+
+        Args:
+            deslizantes: Duraciones (segundos) de las ventanas deslizantes
+            fijas: Duraciones (segundos) de las ventanas fijas
+            historial (int): Ventanas fijas cerradas que se conservan por duración
+        """
+        self.deslizantes = tuple(deslizantes)
+        self.fijas = tuple(fijas)
+        self.historial = historial
+        self.por_tipo = {}  # tipo -> (lista de VentanaDeslizante, lista de VentanaFija)
+
+    def _ventanas(self, tipo_sensor: str):
+        """Obtiene (o crea) las ventanas de un tipo de sensor"""
+        ventanas = self.por_tipo.get(tipo_sensor)
+        if ventanas is None:
+            ventanas = ([VentanaDeslizante(d) for d in self.deslizantes],
+                        [VentanaFija(d, self.historial) for d in self.fijas])
+            self.por_tipo[tipo_sensor] = ventanas
+        return ventanas
+
+    def agregar(self, tipo_sensor: str, tiempo: float, valor: float):
+        """
+        Actualiza todas las ventanas del tipo de sensor con una lectura
+
+        Args:
+            tipo_sensor (str): Tipo de sensor
+            tiempo (float): Marca de tiempo de la lectura
+            valor (float): Valor de la lectura
+        """
+        deslizantes, fijas = self._ventanas(tipo_sensor)
+        for ventana in deslizantes:
+            ventana.agregar(tiempo, valor)
+        for ventana in fijas:
+            ventana.agregar(tiempo, valor)
+
+    def estadisticas(self, tipo_sensor: str, ahora: float = None):
+        """
+        Devuelve las estadísticas de cada ventana del tipo de sensor
+
+        Args:
+            tipo_sensor (str): Tipo de sensor
+            ahora (float): Tiempo actual para expulsar lecturas vencidas (opcional)
+
+        Returns:
+            {"deslizantes": {duracion: stats}, "fijas": {duracion: stats de la ventana en curso}}
+        """
+        ventanas = self.por_tipo.get(tipo_sensor)
+        if ventanas is None:
+            return {"deslizantes": {}, "fijas": {}}
+        deslizantes, fijas = ventanas
+        if ahora is not None:
+            for ventana in deslizantes:
+                ventana.expulsar(ahora)
+        return {
+            "deslizantes": {v.duracion: v.estadisticas() for v in deslizantes},
+            "fijas": {v.duracion: v.estadisticas() for v in fijas}
+        }
+
+    def ventanas_cerradas(self, tipo_sensor: str, duracion: float):
+        """
+        Devuelve el historial de ventanas fijas cerradas como lista de (inicio, stats)
+
+        Args:
+            tipo_sensor (str): Tipo de sensor
+            duracion (float): Duración de la ventana fija
+        """
+        ventanas = self.por_tipo.get(tipo_sensor)
+        if ventanas is None:
+            return []
+        for ventana in ventanas[1]:
+            if ventana.duracion == duracion:
+                return list(ventana.cerradas)
+        return []